@@ -0,0 +1,337 @@
+# app/batch.py
+
+import sys
+from pathlib import Path
+
+# Ensure project root is in sys.path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import os
+import glob
+import json
+import time
+import argparse
+import traceback
+import concurrent.futures
+from collections import deque
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from app import config
+from ocr_modules.base_modules.initialization import initialize_models
+from ocr_modules.pipeline_utils.pipeline import run_pipeline
+from ocr_modules.pipeline_utils.process_pool import ProcessOCRPool
+from ocr_modules.pdf_source import PDFSource, iter_pdf_results
+from shared.json_utils import sanitize_for_json
+from shared.log_utils import configure_logging
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+PDF_EXTS = (".pdf",)
+DEFAULT_MANIFEST = PROJECT_ROOT / "testing" / "test_results" / "batch_manifest.jsonl"
+
+
+# ------------------------------------------------------------
+# Input discovery
+# ------------------------------------------------------------
+
+def collect_inputs(specs, recursive=False):
+    """
+    Expand directories and glob patterns into a sorted, de-duplicated
+    list of image and PDF paths.
+    """
+    found = []
+    for spec in specs:
+        if os.path.isdir(spec):
+            pattern = os.path.join(spec, "**", "*") if recursive else os.path.join(spec, "*")
+            candidates = glob.glob(pattern, recursive=recursive)
+        elif glob.has_magic(spec):
+            candidates = glob.glob(spec, recursive=True)
+        else:
+            candidates = [spec]
+
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTS + PDF_EXTS):
+                found.append(os.path.normpath(path))
+
+    return sorted(set(found))
+
+
+# ------------------------------------------------------------
+# Manifest (JSONL, one record per image)
+# ------------------------------------------------------------
+
+def load_manifest(path):
+    """
+    Return the set of paths already recorded in a manifest. Records that
+    carry an "error" are not counted, so a rerun retries those paths.
+    A torn final line (crash mid-write) is cut off so appends stay valid.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+
+    valid_bytes = 0
+    with open(path, "rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            if "error" not in record:
+                done.add(record.get("path"))
+            valid_bytes += len(raw)
+
+    if valid_bytes < os.path.getsize(path):
+        print(f"⚠️ Truncating partial manifest tail at byte {valid_bytes}")
+        with open(path, "r+b") as f:
+            f.truncate(valid_bytes)
+
+    return done
+
+
+# ------------------------------------------------------------
+# Decode + OCR
+# ------------------------------------------------------------
+
+def decode_image(path):
+    """Decode the file once and derive the PIL image from the decoded array."""
+    data = np.fromfile(path, dtype=np.uint8)
+    cv_img = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+    if cv_img is None:
+        raise RuntimeError("cv2.imdecode returned None (failed to read image)")
+    pil_img = Image.fromarray(cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB))
+    return cv_img, pil_img
+
+
+def to_record(path, result, decode_time):
+    final = result.get("final_result") or {}
+    record = {
+        "path": path,
+        "text": final.get("text", ""),
+        "confidence": final.get("confidence", 0.0),
+        "reliable": final.get("reliable", False),
+        "case_triggered": result.get("case_triggered"),
+        "runtime": result.get("total_runtime", 0.0),
+        "decode_time": round(decode_time, 3),
+        "mode": result.get("mode"),
+    }
+    if final.get("error"):
+        record["error"] = final["error"]
+    return record
+
+
+def build_runner(mode, concurrency, processes=0):
+    """
+    Load models once and return (run_fn, close_fn).
+    run_fn(cv_img, pil_img) runs the full pipeline on one image, either
+    on the shared thread pools or in a worker process.
+    """
+    if processes:
+        pool = ProcessOCRPool(processes=processes)
+
+        def run_fn(cv_img, pil_img):
+            return pool.run(cv_img, mode=mode, pad_interval=False)
+
+        return run_fn, lambda: pool.shutdown(wait=False)
+
+    models = initialize_models()
+    # Each pipeline fans out to EAST + Tesseract + EasyOCR threads
+    engine_executor = concurrent.futures.ThreadPoolExecutor(max_workers=3 * concurrency)
+
+    def run_fn(cv_img, pil_img):
+        return run_pipeline(cv_img, pil_img, models, engine_executor,
+                            mode=mode, pad_interval=False)
+
+    return run_fn, lambda: engine_executor.shutdown(wait=False)
+
+
+def run_batch(paths, manifest, run_fn, concurrency=2, decode_workers=4, prefetch=8):
+    """
+    Decode on a prefetching thread pool, keep `concurrency` pipelines busy,
+    and append each result to the open manifest as soon as it completes.
+    Returns the number of images written.
+    """
+    decode_pool = concurrent.futures.ThreadPoolExecutor(max_workers=decode_workers)
+    ocr_pool = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+    path_iter = iter(paths)
+    decoding = deque()   # (path, decode future) in input order
+    running = {}         # ocr future -> (path, decode_time)
+    done_count = 0
+
+    def fill_prefetch():
+        while len(decoding) < prefetch:
+            path = next(path_iter, None)
+            if path is None:
+                return
+            decoding.append((path, decode_pool.submit(_timed_decode, path)))
+
+    try:
+        fill_prefetch()
+        while decoding or running:
+            # Feed the OCR side until it is saturated
+            while decoding and len(running) < concurrency:
+                path, dfut = decoding.popleft()
+                fill_prefetch()
+                try:
+                    (cv_img, pil_img), decode_time = dfut.result()
+                except Exception as e:
+                    _write(manifest, {"path": path, "text": "", "confidence": 0.0,
+                                      "reliable": False, "error": str(e)})
+                    done_count += 1
+                    continue
+
+                fut = ocr_pool.submit(run_fn, cv_img, pil_img)
+                running[fut] = (path, decode_time)
+
+            if not running:
+                continue
+
+            finished, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for fut in finished:
+                path, decode_time = running.pop(fut)
+                try:
+                    record = to_record(path, fut.result(), decode_time)
+                except Exception as e:
+                    traceback.print_exc()
+                    record = {"path": path, "text": "", "confidence": 0.0,
+                              "reliable": False, "error": str(e)}
+                _write(manifest, record)
+                done_count += 1
+                print(f"📝 [{done_count}/{len(paths)}] {os.path.basename(path)}: "
+                      f"{record.get('text', '')[:60]!r}")
+    finally:
+        decode_pool.shutdown(wait=False)
+        ocr_pool.shutdown(wait=False)
+
+    return done_count
+
+
+def run_pdf_batch(pdf_paths, manifest, run_fn, mode, concurrency=2, done=()):
+    """
+    Stream every PDF page through iter_pdf_results. Each page is one
+    manifest record keyed "<path>#page<N>" (1-based) so resume works per page.
+    A PDF that cannot be opened (corrupt, encrypted) gets one error record
+    keyed by its path and the batch moves on.
+    """
+    done_count = 0
+    for path in pdf_paths:
+        try:
+            probe = PDFSource(path)
+            page_count = len(probe)
+            probe.close()
+
+            skip = {i for i in range(page_count) if pdf_page_key(path, i) in done}
+            for result in iter_pdf_results(path, run_fn, mode=mode,
+                                           max_in_flight=concurrency, skip_pages=skip):
+                key = pdf_page_key(path, result["page"])
+                record = to_record(key, result, 0.0)
+                _write(manifest, record)
+                done_count += 1
+                print(f"📄 {os.path.basename(key)} ({record['case_triggered']}): "
+                      f"{record.get('text', '')[:60]!r}")
+        except Exception as e:
+            traceback.print_exc()
+            _write(manifest, {"path": path, "text": "", "confidence": 0.0,
+                              "reliable": False, "error": str(e)})
+            done_count += 1
+            print(f"❌ {os.path.basename(path)}: {e}")
+    return done_count
+
+
+def pdf_page_key(path, page_index):
+    return f"{path}#page{page_index + 1}"
+
+
+def _timed_decode(path):
+    start = time.perf_counter()
+    images = decode_image(path)
+    return images, time.perf_counter() - start
+
+
+def _write(manifest, record):
+    manifest.write(json.dumps(sanitize_for_json(record), ensure_ascii=False) + "\n")
+    manifest.flush()
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Batch OCR over directories and glob patterns, streaming JSONL results."
+    )
+    parser.add_argument("inputs", nargs="+", help="image/PDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_MANIFEST), help="JSONL manifest path")
+    parser.add_argument("--mode", default=config.OCR_MODE, choices=["fast", "steady", "extended"])
+    parser.add_argument("--resume", action="store_true",
+                        help="skip images already in the manifest and append to it")
+    parser.add_argument("-r", "--recursive", action="store_true", help="recurse into directories")
+    parser.add_argument("--concurrency", type=int, default=2, help="pipelines running at once")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="use N OCR worker processes instead of threads")
+    parser.add_argument("--decode-workers", type=int, default=4)
+    parser.add_argument("--prefetch", type=int, default=8, help="decoded images kept ready")
+    args = parser.parse_args(argv)
+
+    print("\n=== APP: BATCH OCR ===\n")
+
+    paths = collect_inputs(args.inputs, recursive=args.recursive)
+    if not paths:
+        print("❌ No images matched the given inputs.")
+        return 1
+
+    done = set()
+    if args.resume:
+        done = load_manifest(args.output)
+        print(f"⏩ Resuming: {len(done)} records already in manifest")
+    elif os.path.exists(args.output):
+        os.remove(args.output)
+
+    pdfs = [p for p in paths if p.lower().endswith(PDF_EXTS)]
+    images = [p for p in paths if p not in done and not p.lower().endswith(PDF_EXTS)]
+
+    if not images and not pdfs:
+        print("✅ Nothing left to do.")
+        return 0
+
+    print(f"Found {len(images)} images and {len(pdfs)} PDFs. "
+          f"Writing results to: {args.output}\n")
+
+    concurrency = max(1, args.processes or args.concurrency)
+    run_fn, close_runner = build_runner(args.mode, concurrency, processes=max(0, args.processes))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    start = time.perf_counter()
+    try:
+        with open(args.output, "a", encoding="utf-8") as manifest:
+            count = run_batch(
+                images,
+                manifest,
+                run_fn,
+                concurrency=concurrency,
+                decode_workers=max(1, args.decode_workers),
+                prefetch=max(1, args.prefetch),
+            )
+            count += run_pdf_batch(pdfs, manifest, run_fn, args.mode,
+                                   concurrency=concurrency, done=done)
+    finally:
+        close_runner()
+    seconds = time.perf_counter() - start
+
+    rate = count / seconds if seconds > 0 else 0.0
+    print(f"\n🏁 {count} images/pages in {seconds:.2f}s ({rate:.2f} images/s)")
+    print(f"💾 Manifest: {args.output}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    configure_logging(config.LOG_LEVEL, config.LOG_MODULE_LEVELS, json_output=config.LOG_JSON)
+    sys.exit(main())
@@ -9,11 +9,19 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 import cv2
 import time
+import concurrent.futures
 
 from app import config
 from ocr_modules.camera_source import CameraSource
 from ocr_modules.async_ocr_engine import AsyncOCREngine
+from ocr_modules.base_modules.initialization import initialize_models
+from ocr_modules.stream_mux import StreamMultiplexer
+from ocr_modules.pipeline_utils.result_cache import FrameResultCache
+from ocr_modules.pipeline_utils.frame_gate import FrameGate
+from ocr_modules.pipeline_utils.temporal_fusion import TemporalFusion
+from ocr_modules.base_modules.corpus_score import OOV_TRACKER
 from graphics.overlay import OverlayEngine
+from shared.log_utils import configure_logging
 
 if config.ENABLE_VOICE:
     from voice.async_voice_engine import AsyncVoiceEngine
@@ -33,7 +41,36 @@ def main():
     # 2. Initialize OCR (async) + overlay
     # --------------------------------------------------------
     print("🔧 Initializing OCR engine...")
-    ocr = AsyncOCREngine(mode=config.OCR_MODE, max_workers=config.OCR_MAX_WORKERS)
+    cache = None
+    if config.OCR_CACHE_ENABLED:
+        cache = FrameResultCache(
+            max_entries=config.OCR_CACHE_MAX_ENTRIES,
+            ttl=config.OCR_CACHE_TTL,
+            max_distance=config.OCR_CACHE_MAX_DISTANCE,
+            hash_size=config.OCR_CACHE_HASH_SIZE,
+        )
+    gate = None
+    if config.OCR_GATE_ENABLED:
+        gate = FrameGate(
+            min_change=config.GATE_MIN_CHANGE,
+            min_sharpness=config.GATE_MIN_SHARPNESS,
+            min_brightness=config.GATE_MIN_BRIGHTNESS,
+            max_brightness=config.GATE_MAX_BRIGHTNESS,
+        )
+    fusion = None
+    if config.OCR_FUSION_ENABLED:
+        fusion = TemporalFusion(
+            consensus=config.FUSION_CONSENSUS,
+            min_frames=config.FUSION_MIN_FRAMES,
+        )
+    ocr = AsyncOCREngine(
+        mode=config.OCR_MODE,
+        max_workers=config.OCR_MAX_WORKERS,
+        use_processes=config.OCR_USE_PROCESSES,
+        cache=cache,
+        gate=gate,
+        fusion=fusion,
+    )
     overlay = OverlayEngine()
 
     # --------------------------------------------------------
@@ -59,6 +96,21 @@ def main():
         text = final.get("text", "")
         overlay.update_ocr(text)
 
+    # Partial results: show text as soon as any engine or region produces it
+    partial_regions = {}
+
+    def ocr_event(event):
+        if event["type"] == "detection":
+            partial_regions.clear()
+        elif event["type"] == "region_text":
+            partial_regions[event["index"]] = event["text"]
+            overlay.update_ocr(" ".join(partial_regions[i] for i in sorted(partial_regions)))
+        elif event["type"] == "engine_result" and event.get("text") and not partial_regions:
+            overlay.update_ocr(event["text"])
+
+    # Fusion exists to stop per-frame flicker, so do not show raw partials with it
+    on_event = ocr_event if fusion is None else None
+
     print("\nPress 'q' to quit.\n")
 
     fps_timer = time.time()
@@ -75,7 +127,7 @@ def main():
         raw = frame.copy()
 
         # Kick off async OCR on raw frame
-        ocr.process(raw, callback=ocr_callback)
+        ocr.process(raw, callback=ocr_callback, on_event=on_event)
 
         # Update voice subtitle
         if voice is not None:
@@ -97,6 +149,15 @@ def main():
     # 6. Cleanup
     # --------------------------------------------------------
     camera.release()
+    if cache is not None:
+        print(f"🗃️ OCR cache: {ocr.cache_stats()}")
+    if gate is not None:
+        print(f"🚦 Frame gate: {ocr.gate_stats()}")
+    if fusion is not None:
+        print(f"🧬 Temporal fusion: {ocr.fusion_stats()}")
+    candidates = OOV_TRACKER.export(config.OOV_EXPORT_PATH, min_count=config.OOV_EXPORT_MIN_COUNT)
+    print(f"🔤 OOV tokens: {OOV_TRACKER.stats()}, {len(candidates)} promotion candidates "
+          f"→ {config.OOV_EXPORT_PATH}")
     ocr.shutdown()
     if voice is not None:
         voice.stop()
@@ -105,5 +166,59 @@ def main():
     print("\n👋 Live OCR overlay ended.\n")
 
 
+def main_multi():
+    print("\n=== APP: LIVE OCR OVERLAY (MULTI-CAMERA) ===\n")
+
+    print("🔧 Initializing OCR models (shared by all streams)...")
+    models = initialize_models()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=config.OCR_MAX_WORKERS)
+
+    overlays = {s["id"]: OverlayEngine() for s in config.CAMERA_STREAMS}
+
+    def ocr_callback(stream_id, result):
+        final = result.get("final_result", {})
+        overlays[stream_id].update_ocr(final.get("text", ""))
+
+    mux = StreamMultiplexer(models, executor,
+                            max_concurrent=config.MUX_MAX_CONCURRENT,
+                            callback=ocr_callback)
+    for stream in config.CAMERA_STREAMS:
+        print(f"📷 Opening {stream['id']}: {stream['source']}")
+        mux.add_stream(stream["id"], stream["source"],
+                       mode=stream.get("mode", config.OCR_MODE),
+                       weight=stream.get("weight", 1),
+                       min_interval=stream.get("min_interval"))
+    mux.start()
+
+    print("\nPress 'q' to quit.\n")
+
+    stats_timer = time.time()
+    while True:
+        for stream_id, overlay in overlays.items():
+            frame = mux.latest_frame(stream_id)
+            if frame is None:
+                continue
+            overlay.render(frame)
+            cv2.imshow(f"{config.WINDOW_TITLE} [{stream_id}]", frame)
+
+        if time.time() - stats_timer >= 10.0:
+            for stream_id, st in mux.stats().items():
+                print(f"📈 {stream_id}: captured={st['captured']} "
+                      f"processed={st['processed']} dropped={st['dropped']}")
+            stats_timer = time.time()
+
+        if cv2.waitKey(1) & 0xFF == ord("q"):
+            break
+
+    mux.stop()
+    executor.shutdown(wait=False)
+    cv2.destroyAllWindows()
+    print("\n👋 Live OCR overlay ended.\n")
+
+
 if __name__ == "__main__":
-    main()
+    configure_logging(config.LOG_LEVEL, config.LOG_MODULE_LEVELS, json_output=config.LOG_JSON)
+    if len(config.CAMERA_STREAMS) > 1:
+        main_multi()
+    else:
+        main()
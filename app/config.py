@@ -8,14 +8,81 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 # OCR settings
 OCR_MODE = "steady"  # "fast", "steady", "extended"
 OCR_MAX_WORKERS = 3
+OCR_USE_PROCESSES = False  # True: OCR_MAX_WORKERS = number of OCR processes
+
+# Frame result cache (perceptual hash of the frame + mode). Off by default:
+# a small text change on a sign ("EXIT 12" -> "EXIT 13") moves a whole-frame
+# hash by only 0-1 bits, so a live camera could keep showing stale text.
+# Meant for repeated identical frames (screen capture, replayed images).
+OCR_CACHE_ENABLED = False
+OCR_CACHE_MAX_ENTRIES = 32
+OCR_CACHE_TTL = 30.0          # seconds a cached result stays valid
+OCR_CACHE_HASH_SIZE = 16      # dHash grid (16 -> 256-bit key)
+OCR_CACHE_MAX_DISTANCE = 1    # max dHash Hamming distance counted as a hit
+
+# Frame gate (skip/defer OCR on unchanged, blurred or badly exposed frames)
+OCR_GATE_ENABLED = True
+GATE_MIN_CHANGE = 3.0         # mean abs gray diff of the most-changed tile vs last OCR'd frame
+GATE_MIN_SHARPNESS = 50.0     # Laplacian variance
+GATE_MIN_BRIGHTNESS = 35.0
+GATE_MAX_BRIGHTNESS = 225.0
+
+# Temporal fusion (vote across frames; in "fast" mode only Tesseract runs per frame)
+OCR_FUSION_ENABLED = False
+FUSION_CONSENSUS = 0.6        # vote share a word needs to be stable
+FUSION_MIN_FRAMES = 3
+
+# Out-of-vocabulary telemetry: frequent OOV words exported on exit, for
+# `python -m ocr_modules.base_modules.lexicon --promote <file>`
+OOV_EXPORT_PATH = PROJECT_ROOT / "testing" / "test_results" / "oov_candidates.json"
+OOV_EXPORT_MIN_COUNT = 20
+
+# Logging (shared/log_utils.py). Per-frame pipeline logs are INFO/DEBUG,
+# so the WARNING default keeps them off; raise single modules as needed,
+# e.g. {"ocr_modules.pipeline_utils.phase2": "INFO"}
+LOG_LEVEL = "WARNING"
+LOG_MODULE_LEVELS = {
+    "server_utils.http_server": "INFO",  # startup banner + URLs
+}
+LOG_JSON = False              # one JSON object per record instead of plain lines
 
 # Camera settings
 CAMERA_SOURCE = 0  # webcam index or URL string
 
+# Multi-camera: more than one entry switches the runners to the stream
+# multiplexer, which shares one model set across all sources.
+CAMERA_STREAMS = [
+    {"id": "cam0", "source": CAMERA_SOURCE, "mode": OCR_MODE, "weight": 1},
+]
+MUX_MAX_CONCURRENT = 1  # pipelines running at once across all streams
+
+# HTTP server (app/server_runner.py). The port opens immediately; models
+# load in the background and /readyz turns 200 once they are warm.
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8080
+SERVER_EVENTS_PORT = 8081     # WebSocket push of OCR results / subtitles (None = off)
+# Tried in order, first one that opens wins,
+# e.g. ["http://<phone-ip>:8080/video", 0] for a phone MJPEG stream with webcam fallback
+SERVER_CAMERA_SOURCES = [CAMERA_SOURCE]
+# MJPEG output: re-encoded only when the picture changes, at most STREAM_FPS.
+# Viewers can pick /stream?quality=10..95&scale=0.1..1.0
+STREAM_FPS = 15.0
+STREAM_JPEG_QUALITY = 80
+
+# POST /ocr: concurrent requests within OCR_API_BATCH_WINDOW seconds share
+# one batched EAST pass. Timeout = mode budget + slack, capped.
+OCR_API_BATCH_WINDOW = 0.005
+OCR_API_MAX_BATCH = 8
+OCR_API_WORKERS = 4           # pipelines running at once
+OCR_API_TIMEOUT_SLACK = 1.0
+OCR_API_MAX_TIMEOUT = 60.0
+OCR_API_MAX_BYTES = 20 * 1024 * 1024
+
 # Voice settings
 ENABLE_VOICE = True
 VOSK_MODEL_PATH = PROJECT_ROOT / "resources" / "vosk_model_small"
 VOICE_SAMPLERATE = 16000
+VOICE_DEVICE = None  # sounddevice input index (None = system default)
 VOICE_SILENCE_THRESHOLD = 1.0
 VOICE_MIN_OUTPUT_INTERVAL = 0.4
 
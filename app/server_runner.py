@@ -2,10 +2,35 @@
 import sys
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from server_utils.http_server import run_server
+from app import config
+from shared.log_utils import configure_logging
+from server_utils.http_server import create_app
+
+
+def build_mux(models, executor):
+    """Called by the server once the models are warm."""
+    # Imports the OCR pipeline, so only after warmup (keeps startup fast)
+    from ocr_modules.stream_mux import StreamMultiplexer
+
+    mux = StreamMultiplexer(
+        models,
+        executor,
+        max_concurrent=config.MUX_MAX_CONCURRENT,
+    )
+    for stream in config.CAMERA_STREAMS:
+        mux.add_stream(stream["id"], stream["source"],
+                       mode=stream.get("mode", config.OCR_MODE),
+                       weight=stream.get("weight", 1),
+                       min_interval=stream.get("min_interval"))
+    mux.start()
+    print(f"🎥 Multiplexing {len(config.CAMERA_STREAMS)} camera streams")
+    return mux
+
 
 if __name__ == "__main__":
-    run_server()
+    configure_logging(config.LOG_LEVEL, config.LOG_MODULE_LEVELS, json_output=config.LOG_JSON)
+    mux_factory = build_mux if len(config.CAMERA_STREAMS) >= 2 else None
+    create_app(config, mux_factory=mux_factory).serve_forever()
@@ -8,7 +8,9 @@ import concurrent.futures
 
 from ocr_modules.base_modules.initialization import initialize_models
 from ocr_modules.pipeline_utils.async_pipeline import AsyncPipeline
+from ocr_modules.pipeline_utils.process_pool import ProcessOCRPool, ProcessPipeline
 from ocr_modules.pipeline_utils.modes import MODES
+from ocr_modules.pipeline_utils.frame_gate import DEFER_REASONS
 
 
 class AsyncOCREngine:
@@ -19,19 +21,36 @@ class AsyncOCREngine:
       - async pipeline
       - cv2→PIL conversion
       - mode timing (fast/steady/extended)
+      - optional frame gating (change / blur / exposure)
+      - optional temporal fusion across frames
       - callback dispatch
     """
 
-    def __init__(self, mode="steady", max_workers=3):
+    def __init__(self, mode="steady", max_workers=3, use_processes=False, cache=None, gate=None,
+                 fusion=None):
         self.mode = mode
-        self.models = initialize_models()
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-
-        self.pipeline = AsyncPipeline(
-            models=self.models,
-            executor=self.executor,
-            mode=self.mode
-        )
+        self.cache = cache
+        self.gate = gate
+        self.fusion = fusion
+        self.pool = None
+        self.executor = None
+
+        if use_processes:
+            # max_workers = number of OCR processes, one frame in flight each
+            self.pool = ProcessOCRPool(processes=max_workers)
+            self.models = self.pool.models
+            self.pipeline = ProcessPipeline(self.pool, mode=self.mode, cache=self.cache)
+        else:
+            self.models = initialize_models()
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+            self.pipeline = AsyncPipeline(
+                models=self.models,
+                executor=self.executor,
+                mode=self.mode,
+                cache=self.cache,
+                fusion=self.fusion
+            )
 
         self.last_ocr_time = 0.0
 
@@ -57,10 +76,12 @@ class AsyncOCREngine:
     # Public API
     # ------------------------------------------------------------
 
-    def process(self, frame, callback):
+    def process(self, frame, callback, on_event=None):
         """
         Process a frame asynchronously.
         callback(result_dict) is called when OCR completes.
+        on_event(event_dict) receives partial results (detection, region
+        text, engine results) as they happen; thread mode only.
         """
 
         if frame is None:
@@ -74,20 +95,51 @@ class AsyncOCREngine:
         if not self.pipeline.is_pipeline_ready():
             return
 
+        # Skip frames that cannot produce a new reading. Blur/exposure
+        # failures leave the timer alone so the next frame is tried at once.
+        if self.gate is not None:
+            ok, reason, _ = self.gate.check(frame)
+            if not ok:
+                if reason not in DEFER_REASONS:
+                    self.last_ocr_time = time.time()
+                return
+
         self.last_ocr_time = time.time()
 
         pil_img = self._cv2_to_pil(frame)
 
+        if self.pool is not None and self.fusion is not None:
+            # Worker processes return full pipeline results; fuse them here
+            user_callback = callback
+            callback = lambda result: user_callback(self.fusion.apply(result, update=not result.get("cache_hit")))
+
         # AsyncPipeline handles threading internally
-        self.pipeline.process_frame_async(
-            frame,
-            pil_img,
-            callback=callback
-        )
+        if self.pool is not None:
+            # Events cannot cross the process boundary; only the final callback fires
+            self.pipeline.process_frame_async(frame, pil_img, callback=callback)
+        else:
+            self.pipeline.process_frame_async(
+                frame,
+                pil_img,
+                callback=callback,
+                on_event=on_event
+            )
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache is not None else None
+
+    def gate_stats(self):
+        return self.gate.stats() if self.gate is not None else None
+
+    def fusion_stats(self):
+        return self.fusion.stats() if self.fusion is not None else None
 
     def set_mode(self, mode):
         self.mode = mode
         self.pipeline.mode = mode
 
     def shutdown(self):
-        self.executor.shutdown(wait=False)
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+        else:
+            self.executor.shutdown(wait=False)
@@ -1,50 +1,133 @@
 # ocr_modules/base_modules/corpus_score.py
-import json
-import os
 import re
-from shared.path_utils import project_path
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 
-CORPUS_PATH = project_path("resources", "corpus_freqs.json")
+import numpy as np
 
-with open(CORPUS_PATH, "r", encoding="utf-8") as f:
-    raw_freqs = json.load(f)
+from ocr_modules.base_modules.lexicon import load_lexicon, TokenRankIndex
+from ocr_modules.base_modules.oov_tracker import OOVTracker
+from shared.log_utils import get_logger
 
-# Normalize keys to lowercase
-CORPUS_FREQS = {
-    word.lower(): float(freq) if isinstance(freq, (int, float)) else 0.0
-    for word, freq in raw_freqs.items()
-}
+logger = get_logger(__name__)
 
-# Build percentile rank map
-sorted_words = sorted(CORPUS_FREQS.items(), key=lambda x: x[1], reverse=True)
-RANK_PERCENTILE = {
-    word: round(1 - (i / len(sorted_words)), 4)
-    for i, (word, _) in enumerate(sorted_words)
-}
-for word, score in RANK_PERCENTILE.items():
-    if not isinstance(score, (int, float)):
-        print(f"⚠️ Non-numeric score in RANK_PERCENTILE: {word} → {score}")
+# Memory-mapped word → percentile rank table (built from corpus_freqs.json)
+LEXICON = load_lexicon()
 
-UNKNOWN_TOKENS = set()
+# Bounded, thread-safe counts of out-of-vocabulary tokens
+OOV_TRACKER = OOVTracker()
+
+_TOKEN_RE = re.compile(r"\b[a-zA-Z]+\b")
+_REPEATED_EQUALS = re.compile(r"[=]{2,}")
+_ALTERNATING_CASE = re.compile(r"[A-Z][a-z][A-Z][a-z]")
+
+_RANK_INDEX = None
+_SCORE_MEMO = OrderedDict()  # text -> (result dict, unknown tokens)
+_SCORE_MEMO_SIZE = 4096
+_LOCK = threading.Lock()
 
 def tokenize(text):
     # Lowercase and extract alphabetic words only
-    return re.findall(r"\b[a-zA-Z]+\b", text.lower())
+    return _TOKEN_RE.findall(text.lower())
+
+@lru_cache(maxsize=65536)
+def _lookup(word):
+    return LEXICON.get(word)
 
 def score_word(word):
-    score = RANK_PERCENTILE.get(word)
+    score = _lookup(word)
     if score is None:
-        UNKNOWN_TOKENS.add(word)
+        OOV_TRACKER.add(word)
         return 0.0
     return score
 
+def alpha_ratio(text):
+    return sum(map(str.isalpha, text)) / max(len(text), 1)
+
+def passes_cipher_filter(text, ratio=None):
+    if not text:
+        return False
+    ratio = alpha_ratio(text) if ratio is None else ratio
+    if ratio < 0.5:
+        return False
+    if _REPEATED_EQUALS.search(text):  # repeated '='
+        return False
+    if _ALTERNATING_CASE.search(text):  # alternating case pattern
+        return False
+    if len(text) < 3:
+        return False
+    return True
+
+def get_rank_index():
+    """Vectorized hashed view of LEXICON (built on first use, ~0.15 s)."""
+    global _RANK_INDEX
+    if _RANK_INDEX is None:
+        with _LOCK:
+            if _RANK_INDEX is None:
+                _RANK_INDEX = TokenRankIndex(LEXICON)
+    return _RANK_INDEX
+
+def _score_uncached(texts):
+    token_lists = [tokenize(text) for text in texts]
+    flat = [token for tokens in token_lists for token in tokens]
+    ranks, known = get_rank_index().lookup(flat)
+
+    # Per-text rank sums in one pass: segment id of every flat token
+    counts = np.array([len(tokens) for tokens in token_lists])
+    segments = np.repeat(np.arange(len(texts)), counts)
+    sums = np.bincount(segments, weights=ranks, minlength=len(texts))
+
+    scored, start = [], 0
+    for text, tokens, total in zip(texts, token_lists, sums):
+        n = len(tokens)
+        unknown = tuple(t for t, k in zip(tokens, known[start:start + n]) if not k)
+        start += n
+        ratio = alpha_ratio(text)
+        scored.append(({
+            "corpus_score": round(float(total) / n, 2) if n else 0.0,
+            "alpha_ratio": round(ratio, 3),
+            "passes_filter": passes_cipher_filter(text, ratio),
+        }, unknown))
+    return scored
+
+def score_texts(texts):
+    """
+    Score many candidate texts with one vectorized rank lookup.
+    Returns [{"corpus_score", "alpha_ratio", "passes_filter"}] aligned with
+    texts. Repeated texts (live frames, phase2 cases) are memoized, and
+    every OOV occurrence is still counted.
+    """
+    texts = [text or "" for text in texts]
+    with _LOCK:
+        memo = {text: _SCORE_MEMO[text] for text in set(texts) if text in _SCORE_MEMO}
+        for text in memo:
+            _SCORE_MEMO.move_to_end(text)
+
+    missing = [text for text in dict.fromkeys(texts) if text not in memo]
+    if missing:
+        fresh = dict(zip(missing, _score_uncached(missing)))
+        memo.update(fresh)
+        with _LOCK:
+            _SCORE_MEMO.update(fresh)
+            while len(_SCORE_MEMO) > _SCORE_MEMO_SIZE:
+                _SCORE_MEMO.popitem(last=False)
+
+    results = []
+    for text in texts:
+        result, unknown = memo[text]
+        OOV_TRACKER.add_many(unknown)
+        results.append(dict(result))
+    return results
+
 def corpus_score(text, verbose=False):
+    if not verbose:
+        return score_texts([text])[0]["corpus_score"]
     tokens = tokenize(text)
     if not tokens:
         return 0.0
     scores = [score_word(token) for token in tokens]
-    if verbose:
-        print(f"\n🔍 Corpus Scoring: {text}")
-        for token, score in zip(tokens, scores):
-            print(f"  {token}: {score}")
+    logger.info("\n🔍 Corpus Scoring: %s", text)
+    for token, score in zip(tokens, scores):
+        logger.info("  %s: %s", token, score)
     return round(sum(scores) / len(scores), 2)
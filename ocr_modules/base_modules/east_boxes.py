@@ -4,6 +4,9 @@ import cv2
 import numpy as np
 
 from shared.helper import normalize_conf
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 def decode_predictions(scores, geometry, conf_threshold=0.5):
     num_rows, num_cols = scores.shape[2:4]
@@ -162,7 +165,7 @@ def visualize_region_ocr_debug(cv_img, regions, ocr_fn, engine="easyocr", min_co
                 raise ValueError(f"Unsupported engine: {engine}")
         except Exception as e:
             results = []
-            print(f"⚠️ OCR failed on region {i}: {e}")
+            logger.warning("⚠️ OCR failed on region %s: %s", i, e)
 
         # Normalize output
         texts = [t[1] for t in results if normalize_conf(t[2]) >= min_conf]
@@ -3,7 +3,6 @@
 import time
 import os
 import sys
-import json
 import logging
 import warnings
 import contextlib
@@ -13,10 +12,12 @@ import numpy as np
 import pytesseract
 import easyocr
 import cv2
-from spellchecker import SpellChecker
 from paddleocr import PaddleOCR
 import subprocess
 from PIL import Image, ImageDraw
+from ocr_modules.base_modules.region_cache import RegionCache
+from ocr_modules.base_modules.symspell import get_symspell
+from shared.log_utils import ROOT_LOGGER
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="torch.utils.data")
 
@@ -44,6 +45,8 @@ import logging
 def suppress_paddle_logging():
     logging.getLogger().setLevel(logging.CRITICAL)
     for name in logging.root.manager.loggerDict:
+        if name == ROOT_LOGGER or name.startswith(ROOT_LOGGER + "."):
+            continue  # project loggers keep their configured levels
         logging.getLogger(name).setLevel(logging.CRITICAL)
 
 
@@ -129,16 +132,20 @@ def initialize_models(callback=None):
         models["east"] = timed_load("cv2_east", lambda: cv2.dnn.readNet("resources/east_model.pb"))
 
 
-    # Spellchecker
-    models["spellchecker"] = timed_load("spellchecker", lambda: SpellChecker())
+    # Spellchecker: symmetric-delete index used by the parsers (disk-cached)
+    models["spellchecker"] = timed_load("spellchecker", get_symspell)
 
-    # Corpus freqs
+    # Corpus freqs: the memory-mapped lexicon corpus_score already opened
+    # (one shared table instead of a second JSON-loaded dict)
     def load_corpus():
-        with open("resources/corpus_freqs.json", "r") as f:
-            return json.load(f)
+        from ocr_modules.base_modules.corpus_score import LEXICON
+        return LEXICON
 
     models["corpus_freqs"] = timed_load("corpus_freqs", load_corpus)
 
+    # Per-region OCR cache (shared by every guided-crop run on these models)
+    models["region_cache"] = RegionCache()
+
     return {
         "status": "initialized",
         "diagnostics": diagnostics,
@@ -0,0 +1,226 @@
+# ocr_modules/base_modules/lexicon.py
+
+import os
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from shared.path_utils import project_path
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+CORPUS_JSON_PATH = project_path("resources", "corpus_freqs.json")
+LEXICON_PATH = project_path("resources", "corpus_lexicon.bin")
+
+# File layout (little-endian):
+#   header   MAGIC, count (u4), keys_size (u4)
+#   offsets  u4[count + 1]   byte offsets of each key in the blob
+#   ranks    u2[count]       percentile rank * 10000 (exact: ranks are 4 dp)
+#   keys     utf-8 blob, keys sorted bytewise
+MAGIC = b"OCRLEX1\0"
+_HEADER = struct.Struct("<8sII")
+RANK_SCALE = 10000
+
+
+def _pad4(n):
+    return (n + 3) & ~3
+
+
+def build_lexicon(json_path=CORPUS_JSON_PATH, out_path=LEXICON_PATH, extra_words=()):
+    """
+    Compile corpus_freqs.json into the binary lexicon.
+    Percentile ranks match the old in-memory RANK_PERCENTILE exactly:
+    1 - i/n over words sorted by frequency (descending), rounded to 4 dp.
+    extra_words are appended after the corpus (lowest ranks) if missing.
+    Returns the number of words written.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        raw_freqs = json.load(f)
+
+    freqs = {
+        word.lower(): float(freq) if isinstance(freq, (int, float)) else 0.0
+        for word, freq in raw_freqs.items()
+    }
+    by_freq = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
+    words = [w for w, _ in by_freq]
+    words += [w for w in dict.fromkeys(w.lower() for w in extra_words) if w not in freqs]
+
+    n = len(words)
+    ranks = {w: round(1 - (i / n), 4) for i, w in enumerate(words)}
+
+    encoded = sorted((w.encode("utf-8"), ranks[w]) for w in words)
+    blob = b"".join(k for k, _ in encoded)
+    offsets = np.zeros(n + 1, dtype="<u4")
+    np.cumsum([len(k) for k, _ in encoded], out=offsets[1:])
+    rank_arr = np.array([round(r * RANK_SCALE) for _, r in encoded], dtype="<u2")
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, n, len(blob)))
+        f.write(offsets.tobytes())
+        f.write(rank_arr.tobytes())
+        f.write(b"\0" * (_pad4(rank_arr.nbytes) - rank_arr.nbytes))
+        f.write(blob)
+    os.replace(tmp_path, out_path)
+    return n
+
+
+class Lexicon:
+    """
+    Read-only, memory-mapped word → percentile-rank table.
+    Handles:
+      - zero-copy numpy views over the offsets / ranks arrays
+      - O(log n) binary search over the sorted key blob
+      - sharing: pages live in the OS page cache, so forked or spawned
+        workers mapping the same file do not duplicate the vocabulary
+    """
+
+    def __init__(self, path=LEXICON_PATH):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, keys_size = _HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a lexicon file: {self.path}")
+
+        pos = _HEADER.size
+        self.offsets = np.frombuffer(self.buf, dtype="<u4", count=self.count + 1, offset=pos)
+        pos += self.offsets.nbytes
+        self.ranks = np.frombuffer(self.buf, dtype="<u2", count=self.count, offset=pos)
+        pos += _pad4(self.ranks.nbytes)
+        self.keys_start = pos
+        self.keys_end = pos + keys_size
+
+    def __len__(self):
+        return self.count
+
+    def _key(self, i):
+        return self.buf[self.keys_start + int(self.offsets[i]):self.keys_start + int(self.offsets[i + 1])]
+
+    def index(self, word):
+        """Position of word in the sorted key table, or -1."""
+        target = word.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = self._key(mid)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def get(self, word, default=None):
+        """Percentile rank (0-1] of a lowercase word, or default."""
+        i = self.index(word)
+        if i < 0:
+            return default
+        return int(self.ranks[i]) / RANK_SCALE
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def words(self):
+        for i in range(self.count):
+            yield self._key(i).decode("utf-8")
+
+    def close(self):
+        self.offsets = self.ranks = None
+        self.buf.close()
+
+
+TOKEN_WIDTH = 32  # longest lexicon word is 27 chars; longer tokens are OOV
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def fnv1a_tokens(tokens):
+    """
+    Vectorized 64-bit FNV-1a over a numpy 'S32' array of ASCII tokens.
+    One pass per character column, so cost is O(width) numpy ops, not
+    O(tokens) Python calls.
+    """
+    tokens = np.asarray(tokens, dtype=f"S{TOKEN_WIDTH}")
+    n = len(tokens)
+    hashes = np.full(n, _FNV_OFFSET, dtype=np.uint64)
+    if n == 0:
+        return hashes
+    chars = tokens.view(np.uint8).reshape(n, TOKEN_WIDTH).astype(np.uint64)
+    lengths = np.char.str_len(tokens)
+    with np.errstate(over="ignore"):
+        for j in range(int(lengths.max())):
+            stepped = (hashes ^ chars[:, j]) * _FNV_PRIME
+            hashes = np.where(lengths > j, stepped, hashes)
+    return hashes
+
+
+class TokenRankIndex:
+    """
+    Hashed, vectorized view of a Lexicon for batch scoring.
+    Handles:
+      - FNV-1a hashes of every lexicon word, sorted, with aligned ranks
+      - rank lookup for many tokens in one searchsorted call
+    """
+
+    def __init__(self, lexicon):
+        words = np.array(list(lexicon.words()), dtype=f"S{TOKEN_WIDTH}")
+        hashes = fnv1a_tokens(words)
+        order = np.argsort(hashes)
+        self.hashes = hashes[order]
+        self.ranks = (np.asarray(lexicon.ranks)[order] / RANK_SCALE).astype(np.float64)
+
+    def lookup(self, tokens):
+        """
+        Ranks for a sequence of lowercase ASCII tokens as (ranks, known
+        mask); unknown tokens get rank 0.0.
+        """
+        if len(tokens) == 0:
+            return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=bool)
+
+        # One spare byte tells overlong tokens apart from exact 32-char ones
+        padded = np.array(tokens, dtype=f"S{TOKEN_WIDTH + 1}")
+        fits = np.char.str_len(padded) <= TOKEN_WIDTH
+        hashes = fnv1a_tokens(padded.astype(f"S{TOKEN_WIDTH}"))
+
+        pos = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+        known = (self.hashes[pos] == hashes) & fits
+        ranks = np.where(known, self.ranks[pos], 0.0)
+        return ranks, known
+
+
+def load_lexicon(path=LEXICON_PATH, json_path=CORPUS_JSON_PATH):
+    """
+    Open the binary lexicon, (re)building it first if it is missing or
+    older than the source JSON.
+    """
+    path, json_path = str(path), str(json_path)
+    if not os.path.exists(path) or (
+        os.path.exists(json_path) and os.path.getmtime(json_path) > os.path.getmtime(path)
+    ):
+        logger.warning("🔨 Building lexicon: %s", path)
+        build_lexicon(json_path, path)
+    return Lexicon(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile corpus_freqs.json into the binary lexicon.")
+    parser.add_argument("--promote", help="JSON {word: count} of OOV words to add (OOVTracker.export)")
+    parser.add_argument("--min-count", type=int, default=20, help="min count for a promoted word")
+    args = parser.parse_args()
+
+    extra = []
+    if args.promote:
+        with open(args.promote, "r", encoding="utf-8") as f:
+            extra = [w for w, c in json.load(f).items() if c >= args.min_count]
+        print(f"➕ Promoting {len(extra)} OOV words from {args.promote}")
+
+    count = build_lexicon(extra_words=extra)
+    print(f"✅ Lexicon built: {count} words → {LEXICON_PATH}")
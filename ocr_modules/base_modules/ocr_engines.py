@@ -7,7 +7,7 @@ from PIL import Image
 
 from ocr_modules.base_modules.initialization import initialize_models
 from ocr_modules.base_modules.east_boxes import decode_predictions
-from ocr_modules.base_modules.preprocess import fast_preprocess_bgr, normalize_to_rgb
+from ocr_modules.base_modules.preprocess import fast_preprocess_bgr, normalize_to_rgb, PreprocessedFrame
 from ocr_modules.base_modules.parsers import (
     parse_tesseract_output,
     parse_easyocr_output,
@@ -26,6 +26,9 @@ from ocr_modules.base_modules.east_boxes import decode_predictions
 from ocr_modules.base_modules.east_boxes import merge_horizontal_boxes
 from ocr_modules.base_modules.corpus_score import corpus_score
 from shared.path_utils import ensure_dir, project_path
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
 _models = None
 
 def load_ocr_models(force_reload=False):
@@ -36,12 +39,17 @@ def load_ocr_models(force_reload=False):
     return _models
 
 
-def run_tesseract(image):
-    """Run Tesseract OCR and parse results."""
-    raw = pytesseract.image_to_data(
+def run_tesseract_raw(image):
+    """Tesseract inference only: the raw image_to_data dict, unparsed."""
+    return pytesseract.image_to_data(
         image, config="--psm 6", output_type=pytesseract.Output.DICT
     )
-    return parse_tesseract_output(raw)
+
+
+def run_tesseract(image, min_conf=None, min_corpus=None):
+    """Run Tesseract OCR and parse results."""
+    raw = run_tesseract_raw(image)
+    return parse_tesseract_output(raw, min_conf=min_conf, min_corpus=min_corpus)
 
 
 def run_easyocr(image, lang="en"):
@@ -52,17 +60,30 @@ def run_easyocr(image, lang="en"):
         raise ValueError(f"EasyOCR model for '{lang}' not initialized.")
     return run_easyocr_with_reader(image, reader)
 
-def run_easyocr_with_reader(image, reader, min_token_conf=0.6):
+def run_easyocr_raw(image, reader, preprocessed=False):
+    """
+    EasyOCR inference only: raw [(box, text, confidence)] tokens, unfiltered.
+    Parse with parse_easyocr_output at any threshold without re-running it.
+    image may be a PreprocessedFrame (its cached 1280px pass is used), or
+    an already-preprocessed crop with preprocessed=True.
+    """
+    if isinstance(image, PreprocessedFrame):
+        return reader.readtext(image.at(1280), detail=1, paragraph=False)
+
     if isinstance(image, Image.Image):
         image = cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2BGR)
     elif image.ndim == 2:
         image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
 
-    image = fast_preprocess_bgr(image, max_side=1280)
-    raw = reader.readtext(image, detail=1, paragraph=False)
+    if not preprocessed:
+        image = fast_preprocess_bgr(image, max_side=1280)
+    return reader.readtext(image, detail=1, paragraph=False)
+
+def run_easyocr_with_reader(image, reader, min_token_conf=0.6, score=True, preprocessed=False):
+    raw = run_easyocr_raw(image, reader, preprocessed=preprocessed)
 
     # ✅ Call the parser with min_token_conf
-    return parse_easyocr_output(raw, min_token_conf=min_token_conf)
+    return parse_easyocr_output(raw, min_token_conf=min_token_conf, score=score)
 
 def run_paddleocr(image, reader, east_result=None):
     """Run PaddleOCR with preprocessing, region cropping, and error handling."""
@@ -76,16 +97,15 @@ def run_paddleocr(image, reader, east_result=None):
         else:
             image_bgr = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
 
-        # Collect crops if EAST regions exist
-        crops = crop_regions(image_bgr, east_result) if east_result else [image_bgr]
+        # Preprocess the frame once; EAST crops are views into it
+        frame = PreprocessedFrame(image_bgr)
+        crops = frame.crops(east_result) if east_result else [frame.at(1280)]
 
         all_results = []
         for crop in crops:
             if crop.size == 0:
                 continue
-            # optional preprocessing for contrast/size
-            crop_proc = fast_preprocess_bgr(crop)
-            results = reader.ocr(crop_proc)
+            results = reader.ocr(crop)
             if results:
                 all_results.extend(results)
 
@@ -118,6 +138,14 @@ import threading
 # Lock to protect OpenCV DNN net forward calls which are not thread-safe
 _EAST_NET_LOCK = threading.Lock()
 
+EAST_TARGET_SIZE = 640
+EAST_OUTPUTS = ["feature_fusion/Conv_7/Sigmoid", "feature_fusion/concat_3"]
+EAST_MEAN = (123.68, 116.78, 103.94)
+
+# One Net per worker thread for batched detection (see run_east_batch)
+_east_local = threading.local()
+
+
 def run_east(image, models=None):
     """Run EAST text detector and return annotated regions (parsed)."""
     if models is None:
@@ -129,21 +157,57 @@ def run_east(image, models=None):
     else:
         east_net = cv2.dnn.readNet("resources/east_model.pb")
 
-    target_size = 640
+    target_size = EAST_TARGET_SIZE
     blob = cv2.dnn.blobFromImage(
         cv2.resize(image, (target_size, target_size)),
         1.0,
         (target_size, target_size),
-        (123.68, 116.78, 103.94),
+        EAST_MEAN,
         True,
         False,
     )
     # Protect setInput+forward with a lock to avoid OpenCV native crashes
     with _EAST_NET_LOCK:
         east_net.setInput(blob)
-        scores, geometry = east_net.forward(
-            ["feature_fusion/Conv_7/Sigmoid", "feature_fusion/concat_3"]
-        )
+        scores, geometry = east_net.forward(EAST_OUTPUTS)
+
+    return east_regions(image, scores, geometry)
+
+
+def run_east_batch(images):
+    """
+    EAST on several images with one forward pass (N×3×640×640 blob).
+    Returns one parsed result per image, same as run_east, without the
+    debug image. The calling thread keeps its own Net across calls.
+    """
+    if not images:
+        return []
+    east_net = getattr(_east_local, "net", None)
+    if east_net is None:
+        east_net = _east_local.net = cv2.dnn.readNet("resources/east_model.pb")
+
+    target_size = EAST_TARGET_SIZE
+    blob = cv2.dnn.blobFromImages(
+        [cv2.resize(image, (target_size, target_size)) for image in images],
+        1.0,
+        (target_size, target_size),
+        EAST_MEAN,
+        True,
+        False,
+    )
+    with _EAST_NET_LOCK:
+        east_net.setInput(blob)
+        scores, geometry = east_net.forward(EAST_OUTPUTS)
+
+    return [
+        east_regions(image, scores[i:i + 1], geometry[i:i + 1], annotate=False)
+        for i, image in enumerate(images)
+    ]
+
+
+def east_regions(image, scores, geometry, annotate=True):
+    """Decode one image's EAST maps into merged, reading-ordered regions (parsed)."""
+    target_size = EAST_TARGET_SIZE
     raw_boxes, raw_confidences = decode_predictions(scores, geometry)
 
     # NMS
@@ -174,6 +238,17 @@ def run_east(image, models=None):
         image_shape=image.shape
     )
 
+    if annotate:
+        save_east_debug(image, scaled_boxes, expanded)
+
+    # ✅ Normalize reading order before returning
+    ordered = sort_regions_by_reading_order(expanded)
+
+    return parse_east_output({"regions": ordered, "region_count": len(ordered)})
+
+
+def save_east_debug(image, scaled_boxes, expanded):
+    """Write testing/test_results/east_output.png with raw (red) and merged (green) boxes."""
     # Annotate for debugging
     annotated = image.copy()
     for r in scaled_boxes:
@@ -192,11 +267,6 @@ def run_east(image, models=None):
     if annotated is not None and annotated.size > 0:
         ok = cv2.imwrite(str(out_path), annotated)  
         if not ok:
-            print(f"⚠️ cv2.imwrite failed for {out_path}")
+            logger.warning("⚠️ cv2.imwrite failed for %s", out_path)
     else:
-        print("⚠️ Annotated image empty, skipping save.")
-
-    # ✅ Normalize reading order before returning
-    ordered = sort_regions_by_reading_order(expanded)
-
-    return parse_east_output({"regions": ordered, "region_count": len(ordered)})
+        logger.warning("⚠️ Annotated image empty, skipping save.")
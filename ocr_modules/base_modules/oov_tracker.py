@@ -0,0 +1,106 @@
+# ocr_modules/base_modules/oov_tracker.py
+
+import json
+import hashlib
+import threading
+
+import numpy as np
+
+
+class OOVTracker:
+    """
+    Fixed-memory telemetry for out-of-vocabulary tokens.
+    Handles:
+      - approximate counts via a Count-Min sketch (depth x width uint32)
+      - a top-k heavy-hitter list for the most frequent OOV words
+      - thread-safe updates from concurrent pipelines
+      - export of promotion candidates for an offline lexicon rebuild
+    """
+
+    def __init__(self, width=4096, depth=4, top_k=200, max_word_len=32, export_hook=None):
+        """
+        width / depth: sketch size; overestimate <= 2N/width with prob 1 - 2^-depth
+        top_k: heavy hitters kept with their estimated counts
+        max_word_len: longer tokens are ignored (OCR garbage)
+        export_hook: optional callable(candidates) invoked by export()
+        """
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.max_word_len = max_word_len
+        self.export_hook = export_hook
+
+        self.sketch = np.zeros((depth, width), dtype=np.uint32)
+        self.rows = np.arange(depth)
+        self.heavy = {}  # word -> estimated count, at most top_k entries
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def _columns(self, word):
+        # Stable across processes (unlike hash()), so exported counts can be merged
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype="<u4") % self.width
+
+    def add(self, word, count=1):
+        if not word or len(word) > self.max_word_len:
+            return
+        cols = self._columns(word)
+        with self.lock:
+            self.sketch[self.rows, cols] += count
+            self.total += count
+            estimate = int(self.sketch[self.rows, cols].min())
+
+            if word in self.heavy or len(self.heavy) < self.top_k:
+                self.heavy[word] = estimate
+                return
+            weakest = min(self.heavy, key=self.heavy.get)
+            if estimate > self.heavy[weakest]:
+                del self.heavy[weakest]
+                self.heavy[word] = estimate
+
+    def add_many(self, words):
+        for word in words:
+            self.add(word)
+
+    def estimate(self, word):
+        cols = self._columns(word)
+        with self.lock:
+            return int(self.sketch[self.rows, cols].min())
+
+    def top(self, n=20):
+        with self.lock:
+            return sorted(self.heavy.items(), key=lambda x: x[1], reverse=True)[:n]
+
+    def candidates(self, min_count=20, min_len=3):
+        """Alphabetic heavy hitters seen at least min_count times."""
+        return [
+            (word, count) for word, count in self.top(self.top_k)
+            if count >= min_count and len(word) >= min_len and word.isalpha()
+        ]
+
+    def export(self, path=None, min_count=20):
+        """
+        Write promotion candidates as JSON {word: count} (if path is given)
+        and pass them to export_hook. Returns the candidate list.
+        """
+        candidates = self.candidates(min_count=min_count)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(dict(candidates), f, indent=2)
+        if self.export_hook is not None:
+            self.export_hook(candidates)
+        return candidates
+
+    def reset(self):
+        with self.lock:
+            self.sketch[:] = 0
+            self.heavy.clear()
+            self.total = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "total": self.total,
+                "tracked": len(self.heavy),
+                "sketch_bytes": self.sketch.nbytes,
+            }
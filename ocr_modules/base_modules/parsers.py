@@ -1,69 +1,137 @@
 # ocr_modules/base_modules/parsers.py
 
-from ocr_modules.base_modules.reliability import is_reliable
-from ocr_modules.base_modules.corpus_score import corpus_score
+from ocr_modules.base_modules.reliability import is_reliable, DECISION_THRESHOLDS
+from ocr_modules.base_modules.corpus_score import corpus_score, score_texts, passes_cipher_filter
+from ocr_modules.base_modules.symspell import get_symspell
 import numpy as np
 from shared.helper import normalize_conf
 
 def filter_cipher_output(text: str) -> bool:
-    import re
-    if not text:
-        return False
-
-    # Ratio of alphabetic characters to total
-    alpha_ratio = sum(c.isalpha() for c in text) / max(len(text), 1)
-
-    if alpha_ratio < 0.5:
-        return False
-    if re.search(r"[=]{2,}", text):  # repeated '='
-        return False
-    if re.search(r"[A-Z][a-z][A-Z][a-z]", text):  # alternating case pattern
-        return False
-    if len(text) < 3:
-        return False
-
-    return True
-
-
-def parse_tesseract_output(raw):
-    lines, confidences, alpha_count = [], [], 0
-    for text, conf in zip(raw.get("text", []), raw.get("conf", [])):
+    # Alpha ratio, repeated '=' and alternating-case checks (shared with score_texts)
+    return passes_cipher_filter(text)
+
+
+def parse_tesseract_output(raw, correct=True, min_conf=None, min_corpus=None):
+    """
+    min_conf / min_corpus default to DECISION_THRESHOLDS (reliability.py).
+    corpus_score and reliable are computed on the uncorrected text, so
+    spelling correction never turns noise into a "reliable" reading.
+    """
+    if min_conf is None:
+        min_conf = DECISION_THRESHOLDS["min_conf"]
+    if min_corpus is None:
+        min_corpus = DECISION_THRESHOLDS["min_corpus"]
+    lines, raw_lines, confidences, alpha_count = [], [], [], 0
+    corrected = {}
+    speller = get_symspell() if correct else None
+    for i, (text, conf) in enumerate(zip(raw.get("text", []), raw.get("conf", []))):
         if text.strip() and conf != "-1":
-            lines.append(text)
             conf_val = normalize_conf(conf)
+            raw_lines.append(text)
+            if speller is not None:
+                # Low-confidence OOV words → nearest lexicon word
+                fixed = speller.correct_token(text.strip(), conf_val / 100.0)
+                if fixed != text.strip():
+                    corrected[i] = fixed
+                    text = fixed
+            lines.append(text)
             confidences.append(conf_val)
             alpha_count += sum(c.isalpha() for c in text)
 
     avg_conf = sum(confidences) / len(confidences) if confidences else 0.0
     scaled_conf = avg_conf / 100.0
     text = " ".join(lines).strip()
-    corpus = corpus_score(text)
+    raw_text = " ".join(raw_lines).strip()
+    # Corpus score + cipher filter in one lookup
+    scores = score_texts([raw_text])[0]
+    corpus = scores["corpus_score"]
+    passes_filter = scores["passes_filter"]
 
-    passes_filter = filter_cipher_output(text)
-
-    return {
+    result = {
         "text": text,
         "confidence": round(scaled_conf, 2),
         "corpus_score": corpus,
         "reliable": (
             passes_filter
-            and normalize_conf(scaled_conf) >= 0.6
-            and normalize_conf(corpus) >= 0.5
-        )
+            and normalize_conf(scaled_conf) >= min_conf
+            and normalize_conf(corpus) >= min_corpus
+        ),
+        "lines": group_tesseract_lines(raw, corrected)
     }
-
-
-def parse_easyocr_output(raw, min_token_conf=0.6):
-    lines, confidences = [], []
+    if corrected:
+        result["corrections"] = len(corrected)
+        result["raw_text"] = raw_text
+    return result
+
+
+def group_tesseract_lines(raw, corrected=None):
+    """
+    Group Tesseract word boxes into text lines.
+    corrected: optional {word index: replacement} from spelling correction.
+    Returns [{"text", "confidence", "box": [x1, y1, x2, y2]}] in reading order.
+    """
+    corrected = corrected or {}
+    if "line_num" not in raw or "left" not in raw:
+        return []
+
+    grouped = {}
+    for i, word in enumerate(raw.get("text", [])):
+        conf = normalize_conf(raw["conf"][i], -1.0)
+        if not word.strip() or conf < 0:
+            continue
+        key = (raw["block_num"][i], raw["par_num"][i], raw["line_num"][i])
+        x1, y1 = int(raw["left"][i]), int(raw["top"][i])
+        x2, y2 = x1 + int(raw["width"][i]), y1 + int(raw["height"][i])
+        line = grouped.setdefault(key, {"words": [], "confs": [], "box": [x1, y1, x2, y2]})
+        line["words"].append(corrected.get(i, word.strip()))
+        line["confs"].append(conf / 100.0)
+        box = line["box"]
+        line["box"] = [min(box[0], x1), min(box[1], y1), max(box[2], x2), max(box[3], y2)]
+
+    return [
+        {
+            "text": " ".join(line["words"]),
+            "confidence": round(sum(line["confs"]) / len(line["confs"]), 2),
+            "box": line["box"],
+        }
+        for _, line in sorted(grouped.items())
+    ]
+
+
+def parse_easyocr_output(raw, min_token_conf=0.6, correct=True, score=True,
+                         min_conf=None, min_corpus=None):
+    """
+    score=False skips corpus scoring (reliable then only reflects confidence),
+    for callers that batch-score many results afterwards (score "raw_text"
+    when present). min_conf / min_corpus default to DECISION_THRESHOLDS
+    (reliability.py). As for Tesseract, scoring uses the uncorrected text
+    and "corrections" counts corrected tokens.
+    """
+    if min_conf is None:
+        min_conf = DECISION_THRESHOLDS["min_conf"]
+    if min_corpus is None:
+        min_corpus = DECISION_THRESHOLDS["min_corpus"]
+    lines, raw_lines, confidences = [], [], []
     kept, dropped = [], []
+    corrections = 0
+    speller = get_symspell() if correct else None
 
     for entry in raw:
         if len(entry) >= 3:
             text = entry[1].strip()
             conf = normalize_conf(entry[2])
             if text:
+                raw_text = text
+                if speller is not None and conf >= min_token_conf:
+                    tokens = text.split()
+                    fixed = [speller.correct_token(t, conf) for t in tokens]
+                    changed = sum(a != b for a, b in zip(tokens, fixed))
+                    if changed:
+                        corrections += changed
+                        text = " ".join(fixed)
                 if conf >= min_token_conf:
                     lines.append(text)
+                    raw_lines.append(raw_text)
                     confidences.append(conf)
                     kept.append((text, conf))
                 else:
@@ -71,17 +139,22 @@ def parse_easyocr_output(raw, min_token_conf=0.6):
 
     avg_conf = sum(confidences) / len(confidences) if confidences else 0.0
     text = " ".join(lines).strip()
-    corpus = corpus_score(text)
+    raw_text = " ".join(raw_lines).strip()
+    corpus = corpus_score(raw_text) if score else None
 
-    return {
+    result = {
         "text": text,
         "confidence": round(avg_conf, 2),
         "corpus_score": corpus,
         "reliable": (
-            normalize_conf(avg_conf) >= 0.6
-            and normalize_conf(corpus) >= 0.5
+            normalize_conf(avg_conf) >= min_conf
+            and (corpus is None or normalize_conf(corpus) >= min_corpus)
         )
     }
+    if corrections:
+        result["corrections"] = corrections
+        result["raw_text"] = raw_text
+    return result
 
 
 def parse_paddleocr_output(raw):
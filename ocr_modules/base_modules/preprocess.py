@@ -1,9 +1,26 @@
 # ocr_modules/base_modules/preprocess.py
 
+import threading
+import functools
+
 import cv2
 import numpy as np
 from PIL import Image
 from shared.helper import normalize_conf  # central safe float caster
+from ocr_modules.base_modules.region_cache import crop_key
+from ocr_modules.base_modules.corpus_score import score_texts
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+CLAHE_CLIP_LIMIT = 2.0
+CLAHE_TILE_GRID = (8, 8)
+
+# L-channel 1st-99th percentile spread (0-255) at or above which a frame
+# already uses its full tonal range and CLAHE is skipped
+HIGH_CONTRAST_SPREAD = 240
+
+_THREAD_LOCAL = threading.local()
 
 def normalize_to_rgb(image):
 
@@ -19,34 +36,66 @@ def normalize_to_rgb(image):
     return image
 
 
-def fast_preprocess_bgr(image, max_side=1280):
+def get_clahe(clip_limit=CLAHE_CLIP_LIMIT, tile_grid=CLAHE_TILE_GRID):
+    """Per-thread CLAHE instance (cv2 CLAHE objects are not thread-safe)."""
+    cache = getattr(_THREAD_LOCAL, "clahe", None)
+    if cache is None:
+        cache = _THREAD_LOCAL.clahe = {}
+    key = (clip_limit, tuple(tile_grid))
+    clahe = cache.get(key)
+    if clahe is None:
+        clahe = cache[key] = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tuple(tile_grid))
+    return clahe
 
-    if not isinstance(image, np.ndarray) or image.ndim < 2:
-        raise ValueError("fast_preprocess_bgr expects a BGR ndarray")
 
+def contrast_spread(channel, low=0.01, high=0.99):
+    """Distance between the low and high intensity percentiles of a uint8 channel."""
+    hist = cv2.calcHist([channel], [0], None, [256], [0, 256]).ravel()
+    cdf = np.cumsum(hist) / max(hist.sum(), 1.0)
+    return int(np.searchsorted(cdf, high) - np.searchsorted(cdf, low))
+
+
+def resize_max_side(image, max_side):
+    """Downscale so the longest side is at most max_side; returns (image, scale)."""
     h, w = image.shape[:2]
-    scale = min(1.0, float(max_side) / max(h, w))
+    scale = 1.0 if max_side is None else min(1.0, float(max_side) / max(h, w))
     if scale < 1.0:
         image = cv2.resize(
             image,
             (int(w * scale), int(h * scale)),
             interpolation=cv2.INTER_AREA
         )
+    return image, scale
+
 
+def apply_clahe_bgr(image, skip_high_contrast=False):
+    """
+    CLAHE on the LAB lightness channel. Returns (image, applied); with
+    skip_high_contrast the input comes back untouched when its histogram
+    already spans HIGH_CONTRAST_SPREAD.
+    """
     lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-    l, a, b = cv2.split(lab)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    l = clahe.apply(l)
-    lab = cv2.merge([l, a, b])
-    return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+    l = cv2.extractChannel(lab, 0)
+    if skip_high_contrast and contrast_spread(l) >= HIGH_CONTRAST_SPREAD:
+        return image, False
+    cv2.insertChannel(get_clahe().apply(l), lab, 0)
+    return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR), True
 
 
-def crop_regions(image, east_result, max_regions=10, base_padding=10):
-    if not isinstance(image, np.ndarray):
-        raise ValueError("crop_regions expects a BGR ndarray")
+def fast_preprocess_bgr(image, max_side=1280, skip_high_contrast=False):
 
-    crops = []
-    h, w = image.shape[:2]
+    if not isinstance(image, np.ndarray) or image.ndim < 2:
+        raise ValueError("fast_preprocess_bgr expects a BGR ndarray")
+
+    image, _ = resize_max_side(image, max_side)
+    image, _ = apply_clahe_bgr(image, skip_high_contrast)
+    return image
+
+
+def region_boxes(image_shape, east_result, max_regions=10, base_padding=10):
+    """Padded, clipped [x1, y1, x2, y2] boxes for EAST regions (tiny ones dropped)."""
+    boxes = []
+    h, w = image_shape[:2]
 
     for i, region in enumerate(east_result.get("regions", [])[:max_regions]):
         box = region.get("box")
@@ -72,58 +121,192 @@ def crop_regions(image, east_result, max_regions=10, base_padding=10):
         if (x2 - x1) < 40 or (y2 - y1) < 20:
             continue
 
-        if isinstance(image, np.ndarray):
-            crop = image[y1:y2, x1:x2]
-            crops.append(crop)
+        boxes.append([x1, y1, x2, y2])
 
         # Debug log
-        print(f"Region {i}: original={box}, padded=({x1},{y1},{x2},{y2}), size={x2-x1}x{y2-y1}")
+        logger.debug("Region %s: original=%s, padded=(%s,%s,%s,%s), size=%sx%s",
+                     i, box, x1, y1, x2, y2, x2 - x1, y2 - y1)
+
+    return boxes
 
+
+def crop_regions(image, east_result, max_regions=10, base_padding=10, with_boxes=False):
+    if not isinstance(image, np.ndarray):
+        raise ValueError("crop_regions expects a BGR ndarray")
+
+    boxes = region_boxes(image.shape, east_result, max_regions=max_regions, base_padding=base_padding)
+    crops = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes]
+
+    if with_boxes:
+        return crops, boxes
     return crops
 
 
+class PreprocessedFrame:
+    """
+    One BGR frame, resized + CLAHE'd at most once per target scale and
+    shared by every engine pass over it.
+    Handles:
+      - lazy, thread-safe cache of the preprocessed image per max_side
+        (scales that would not shrink the frame share one entry)
+      - thread-local CLAHE reuse and the optional high-contrast skip
+      - region crops as views of the preprocessed image, boxes in frame coordinates
+    """
+
+    def __init__(self, image, skip_high_contrast=True):
+        # Same inputs the engines always accepted: PIL, grayscale or BGR
+        if isinstance(image, Image.Image):
+            image = cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2BGR)
+        elif isinstance(image, np.ndarray) and image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        if not isinstance(image, np.ndarray) or image.ndim != 3:
+            raise ValueError("PreprocessedFrame expects a BGR ndarray")
+        self.image = image
+        self.skip_high_contrast = skip_high_contrast
+        self._scaled = {}  # max_side (None = full size) -> (image, scale, clahe_applied)
+        self._lock = threading.Lock()
+
+    def _key(self, max_side):
+        if max_side is None or max(self.image.shape[:2]) <= max_side:
+            return None
+        return max_side
+
+    def _get(self, max_side):
+        key = self._key(max_side)
+        with self._lock:
+            entry = self._scaled.get(key)
+            if entry is None:
+                resized, scale = resize_max_side(self.image, key)
+                processed, applied = apply_clahe_bgr(resized, self.skip_high_contrast)
+                entry = self._scaled[key] = (processed, scale, applied)
+        return entry
+
+    def at(self, max_side=1280):
+        """The preprocessed frame, longest side at most max_side (None = full size)."""
+        return self._get(max_side)[0]
+
+    def crop(self, box, max_side=None):
+        """View of the preprocessed frame for an [x1, y1, x2, y2] frame-coordinate box."""
+        processed, scale, _ = self._get(max_side)
+        x1, y1, x2, y2 = [int(round(v * scale)) for v in box]
+        return processed[y1:y2, x1:x2]
+
+    def crops(self, east_result, max_side=None, with_boxes=False, **box_kwargs):
+        """crop_regions over the preprocessed frame (crops are views, not copies)."""
+        boxes = region_boxes(self.image.shape, east_result, **box_kwargs)
+        crops = [self.crop(box, max_side) for box in boxes]
+        if with_boxes:
+            return crops, boxes
+        return crops
+
+    def stats(self):
+        with self._lock:
+            return {
+                "scales": [key or "full" for key in self._scaled],
+                "clahe_skipped": sum(not applied for _, _, applied in self._scaled.values()),
+            }
+
+
 def aggregate_crop_results(
     crops,
     runner_fn,
     reader=None,
     conf_threshold=0.6,
     min_crop_conf=0.4,
-    verbose=False
+    verbose=False,
+    region_cache=None,
+    engine="easyocr",
+    on_region=None
 ):
 
     if not callable(runner_fn):
         raise TypeError(f"runner_fn must be callable, got {type(runner_fn)}")
 
-    texts, confs, details = [], [], []
+    texts, raw_texts, confs, details = [], [], [], []
+    reused = recognized = 0
 
     for i, crop in enumerate(crops):
         try:
-            res = runner_fn(crop, reader) if reader is not None else runner_fn(crop)
+            # Unchanged regions reuse their last reading instead of re-running OCR
+            res = None
+            if region_cache is not None:
+                key = crop_key(crop)
+                res = region_cache.get(key, engine)
+
+            if res is not None:
+                reused += 1
+                cached = True
+            else:
+                res = runner_fn(crop, reader) if reader is not None else runner_fn(crop)
+                recognized += 1
+                cached = False
+                if region_cache is not None:
+                    region_cache.put(key, engine, {
+                        "text": res.get("text") or "",
+                        "raw_text": res.get("raw_text", res.get("text") or ""),
+                        "confidence": res.get("confidence", 0.0),
+                        "engine": engine,
+                    })
+
             text = (res.get("text") or "").strip()
+            # Uncorrected reading: scored below, so correction cannot raise the score
+            raw_text = (res.get("raw_text") or text).strip()
             conf = normalize_conf(res.get("confidence"))
 
-            details.append({"index": i, "text": text, "confidence": conf})
+            details.append({"index": i, "text": text, "raw_text": raw_text,
+                            "confidence": conf, "cached": cached})
+
+            # Stream each region as soon as it is read
+            if on_region is not None and text:
+                on_region(i, text, conf, cached)
 
             if verbose:
-                print(f"🧪 Crop {i}: '{text}' (conf={conf})")
+                logger.info("🧪 Crop %s: '%s' (conf=%s)", i, text, conf)
 
             if text and conf >= min_crop_conf:
                 texts.append(text)
+                raw_texts.append(raw_text)
                 confs.append(conf)
             elif verbose and text:
-                print(f"⚠️ Crop {i} skipped (conf={conf})")
+                logger.info("⚠️ Crop %s skipped (conf=%s)", i, conf)
 
         except Exception as e:
             details.append({"index": i, "error": str(e)})
             if verbose:
-                print(f"❌ OCR failed on crop {i}: {e}")
+                logger.warning("❌ OCR failed on crop %s: %s", i, e)
 
     merged_text = " ".join(texts).strip()
     avg_conf = sum(confs) / len(confs) if confs else 0.0
 
+    # One vectorized scoring pass for the merged text and every crop
+    scores = score_texts([" ".join(raw_texts).strip()] + [d.get("raw_text", "") for d in details])
+    for detail, score in zip(details, scores[1:]):
+        if "text" in detail:
+            detail["corpus_score"] = score["corpus_score"]
+            detail.pop("raw_text")
+
     return {
         "text": merged_text,
         "confidence": round(avg_conf, 2),
+        "corpus_score": scores[0]["corpus_score"],
         "reliable": normalize_conf(avg_conf) >= conf_threshold,
-        "details": details
+        "details": details,
+        "region_stats": {"reused": reused, "recognized": recognized}
     }
+
+
+def aggregate_guided_crops(crops, runner_fn, reader=None, conf_threshold=0.6, min_token_conf=0.6, **kwargs):
+    """
+    Guided EasyOCR aggregation, shared by run_easyocr_guided and
+    ThresholdReplay so a min_token_conf sweep replays the live parse:
+    each crop's tokens and each crop are filtered at min_token_conf.
+    runner_fn(crop[, reader], min_token_conf=, score=) -> parsed crop result.
+    """
+    return aggregate_crop_results(
+        crops,
+        functools.partial(runner_fn, min_token_conf=min_token_conf, score=False),
+        reader,
+        conf_threshold=conf_threshold,
+        min_crop_conf=min_token_conf,
+        **kwargs
+    )
@@ -0,0 +1,80 @@
+# ocr_modules/base_modules/region_cache.py
+
+import time
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def crop_key(crop, rows=8, cols=32, edge_margin=16):
+    """
+    Content key for a text-line crop.
+    Normalization: grayscale → fixed rows x cols grid → min/max stretch,
+    so exposure drift and small size changes map to the same grid.
+    The key is (aspect bucket, rising/falling edge bits). Differences
+    below edge_margin count as flat, so sensor noise on a plain
+    background does not flip bits.
+    """
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    small = cv2.resize(gray, (cols + 1, rows), interpolation=cv2.INTER_AREA)
+    small = cv2.normalize(small, None, 0, 255, cv2.NORM_MINMAX).astype(np.int16)
+    diff = small[:, 1:] - small[:, :-1]
+    bits = np.concatenate([diff > edge_margin, diff < -edge_margin])
+
+    h, w = crop.shape[:2]
+    aspect = int(round(2 * np.log2(max(w, 1) / max(h, 1))))  # half-octave buckets
+    return aspect, int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+class RegionCache:
+    """
+    Per-region OCR cache keyed by normalized crop content.
+    Handles:
+      - storing text / confidence / engine per crop key
+      - near-duplicate matching within a small Hamming distance
+      - LRU size bound + TTL so stale signs age out
+    """
+
+    def __init__(self, max_entries=256, ttl=60.0, max_distance=4):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.entries = OrderedDict()  # (engine, aspect, bits) -> (stored_at, value)
+        self.lock = threading.Lock()
+
+    def get(self, key, engine):
+        aspect, bits = key
+        now = time.monotonic()
+        with self.lock:
+            best_key, best_dist = None, self.max_distance + 1
+            for k, (stored_at, _) in self.entries.items():
+                if k[0] != engine or k[1] != aspect or now - stored_at > self.ttl:
+                    continue
+                dist = bin(k[2] ^ bits).count("1")
+                if dist < best_dist:
+                    best_key, best_dist = k, dist
+                    if dist == 0:
+                        break
+            if best_key is None:
+                return None
+            self.entries.move_to_end(best_key)
+            return dict(self.entries[best_key][1])
+
+    def put(self, key, engine, value):
+        aspect, bits = key
+        with self.lock:
+            k = (engine, aspect, bits)
+            self.entries[k] = (time.monotonic(), value)
+            self.entries.move_to_end(k)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
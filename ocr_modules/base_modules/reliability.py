@@ -1,5 +1,18 @@
 # ocr_modules/base_modules/reliability.py
 
+import os
+import json
+import math
+import threading
+
+import numpy as np
+
+from shared.helper import normalize_conf
+from shared.path_utils import project_path
+from ocr_modules.base_modules.corpus_score import alpha_ratio
+
+RELIABILITY_PARAMS_PATH = project_path("resources", "reliability_params.json")
+
 def is_reliable(confidence, engine):
     thresholds = {
         "east": 0.6,
@@ -7,4 +20,191 @@ def is_reliable(confidence, engine):
         "easyocr": 0.5,
         "paddleocr": 0.5
     }
-    return confidence >= thresholds.get(engine, 0.5)
\ No newline at end of file
+    return confidence >= thresholds.get(engine, 0.5)
+
+
+# Pipeline stop/continue thresholds. The parsers, phase1/phase2 and
+# run_pipeline all read these, and threshold_replay replays the same
+# decisions offline, so a sweep result maps 1:1 onto a live setting.
+DECISION_THRESHOLDS = {
+    "min_conf": 0.6,          # parsers: average token confidence for "reliable"
+    "min_corpus": 0.5,        # parsers: corpus score for "reliable"
+    "phase1_conf": 0.6,       # phase1: accept Tesseract and skip phase2
+    "token_conf": 0.6,        # phase2 cases 1-2: EasyOCR per-token filter
+    "loose_token_conf": 0.3,  # phase2 case 3: looser per-token filter
+    "early_exit_conf": 0.8,   # phase2: stop at a case with this confidence
+    "final_conf": 0.5,        # run_pipeline: final reliability filter
+    "target_precision": 0.9,  # ReliabilityModel: precision every accept must reach
+}
+
+
+class ReliabilityModel:
+    """
+    Calibrated P(reading is correct) per engine, fitted offline
+    (testing/test_runners/reliability_fit.py) and stored as a small JSON file.
+    Handles:
+      - per-engine logistic weights over FEATURES, with a pooled "default" fallback
+      - precision curves, so callers ask for a target precision, not a raw cutoff
+      - None verdicts for unfitted engines (callers fall back to the fixed rules)
+    """
+
+    FEATURES = ("confidence", "corpus_score", "alpha_ratio", "log_tokens", "log_regions")
+
+    def __init__(self, params):
+        self.params = params
+        self.engines = params.get("engines", {})
+
+    @classmethod
+    def load(cls, path=RELIABILITY_PARAMS_PATH):
+        """The fitted model, or None if no parameter file exists."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @staticmethod
+    def features(result, region_count=0):
+        text = result.get("text") or ""
+        return np.array([
+            normalize_conf(result.get("confidence")),
+            normalize_conf(result.get("corpus_score")),
+            alpha_ratio(text),
+            math.log1p(len(text.split())),
+            math.log1p(normalize_conf(region_count)),
+        ])
+
+    def _engine_params(self, engine):
+        return self.engines.get(engine) or self.engines.get("default")
+
+    def probability(self, result, engine, region_count=0):
+        params = self._engine_params(engine)
+        if params is None:
+            return None
+        if not result.get("text"):
+            return 0.0
+        z = float(self.features(result, region_count) @ np.array(params["weights"])) + params["bias"]
+        return 1.0 / (1.0 + math.exp(-max(min(z, 50.0), -50.0)))
+
+    def cutoff(self, engine, target_precision):
+        """
+        Lowest probability cutoff whose held-in precision reaches the
+        target; above-1 (accept nothing) if the engine never gets there.
+        """
+        params = self._engine_params(engine)
+        for cut, precision in params["precision_curve"]:
+            if precision >= target_precision:
+                return cut
+        return 1.01
+
+    def accepts(self, result, engine, target_precision, region_count=0):
+        """True/False verdict, or None if the engine has no fitted parameters."""
+        prob = self.probability(result, engine, region_count)
+        if prob is None:
+            return None
+        return prob >= self.cutoff(engine, target_precision)
+
+
+def fit_logistic(X, y, l2=1.0, iterations=50):
+    """
+    L2-regularized logistic regression by Newton's method (IRLS).
+    Returns (weights, bias). Small benchmark sets only; no scaling needed
+    as every feature is already in [0, ~3].
+    """
+    X = np.column_stack([np.asarray(X, dtype=np.float64), np.ones(len(X))])
+    y = np.asarray(y, dtype=np.float64)
+    reg = np.full(X.shape[1], l2)
+    reg[-1] = 0.0  # no penalty on the bias
+    w = np.zeros(X.shape[1])
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-np.clip(X @ w, -50, 50)))
+        grad = X.T @ (p - y) + reg * w
+        hess = X.T @ (X * (p * (1 - p))[:, None]) + np.diag(reg + 1e-9)
+        step = np.linalg.solve(hess, grad)
+        w -= step
+        if np.abs(step).max() < 1e-6:
+            break
+    return w[:-1].tolist(), float(w[-1])
+
+
+def precision_curve(probs, labels, points=50):
+    """
+    [[cutoff, precision], ...] ascending by cutoff, where precision is
+    over readings with probability >= cutoff. Thinned to ~points entries.
+    """
+    order = np.argsort(probs, kind="stable")[::-1]
+    probs = np.asarray(probs, dtype=np.float64)[order]
+    hits = np.cumsum(np.asarray(labels)[order])
+    precision = hits / np.arange(1, len(probs) + 1)
+
+    # Tied probabilities share one cutoff: keep the last entry of each run
+    last = np.r_[probs[1:] != probs[:-1], True]
+    curve = [[round(float(p), 4), round(float(q), 4)] for p, q in zip(probs[last], precision[last])][::-1]
+    step = max(1, len(curve) // points)
+    thinned = curve[::step]
+    if thinned and thinned[-1] != curve[-1]:
+        thinned.append(curve[-1])
+    return thinned
+
+
+_MODEL = None
+_MODEL_LOADED = False
+_MODEL_LOCK = threading.Lock()
+
+
+def get_reliability_model():
+    """Process-wide fitted model (loaded once), or None if unfitted."""
+    global _MODEL, _MODEL_LOADED
+    if not _MODEL_LOADED:
+        with _MODEL_LOCK:
+            if not _MODEL_LOADED:
+                _MODEL = ReliabilityModel.load()
+                _MODEL_LOADED = True
+    return _MODEL
+
+
+def decision_thresholds(overrides=None):
+    """DECISION_THRESHOLDS with overrides applied (unknown keys rejected)."""
+    if not overrides:
+        return dict(DECISION_THRESHOLDS)
+    unknown = set(overrides) - set(DECISION_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Unknown decision thresholds: {sorted(unknown)}")
+    return {**DECISION_THRESHOLDS, **overrides}
+
+
+# Stop/continue decisions. With a fitted ReliabilityModel each one is
+# P(correct) >= the cutoff for thresholds["target_precision"]; without one
+# (or for an engine it has no parameters for) the fixed rules apply.
+
+def _model_verdict(result, engine, thresholds, region_count):
+    model = get_reliability_model()
+    if model is None:
+        return None
+    return model.accepts(result, engine or "default", thresholds["target_precision"], region_count)
+
+
+def accepts_phase1(tess_result, thresholds=DECISION_THRESHOLDS, region_count=0):
+    verdict = _model_verdict(tess_result, "tesseract", thresholds, region_count)
+    if verdict is not None:
+        return verdict
+    return normalize_conf(tess_result.get("confidence")) >= thresholds["phase1_conf"]
+
+
+def accepts_phase2(result, thresholds=DECISION_THRESHOLDS, region_count=0, engine=None):
+    verdict = _model_verdict(result, engine or result.get("engine"), thresholds, region_count)
+    if verdict is not None:
+        return verdict
+    return bool(result.get("text")) and (
+        result.get("reliable", False)
+        or normalize_conf(result.get("confidence")) >= thresholds["early_exit_conf"]
+    )
+
+
+def passes_final(result, thresholds=DECISION_THRESHOLDS, region_count=0, engine=None):
+    verdict = _model_verdict(result, engine or result.get("engine"), thresholds, region_count)
+    if verdict is not None:
+        return verdict
+    return (
+        bool(result.get("reliable", False))
+        and normalize_conf(result.get("confidence")) >= thresholds["final_conf"]
+    )
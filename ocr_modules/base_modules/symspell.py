@@ -0,0 +1,222 @@
+# ocr_modules/base_modules/symspell.py
+
+import os
+import hashlib
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from shared.path_utils import project_path
+from ocr_modules.base_modules.lexicon import LEXICON_PATH, RANK_SCALE, load_lexicon
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_PATH_TEMPLATE = "corpus_symspell_d{}.npy"
+
+# Tokens recognized at or above this confidence are left alone
+CORRECT_BELOW = 0.85
+# Shorter tokens are never corrected: against a 100k-word lexicon almost
+# any 3-letter string is one edit from some word (qlx -> blx, jjv -> kjv)
+MIN_TOKEN_LEN = 4
+# Corrections only land on the most frequent words of the corpus
+MAX_CANDIDATE_RANK = 20000
+# Shortest lexicon word indexed as a candidate (4-letter tokens may lose a letter)
+MIN_INDEX_LEN = 3
+
+# Common OCR glyph confusions tried before the index lookup
+OCR_CONFUSIONS = str.maketrans({"0": "o", "1": "l", "3": "e", "5": "s", "8": "b", "|": "l", "$": "s", "@": "a"})
+
+
+def _hash(s):
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _deletes(word, max_edit):
+    """All strings reachable from word by up to max_edit deletions (incl. word)."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_edit):
+        nxt = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                nxt.add(w[:i] + w[i + 1:])
+        nxt -= found
+        found |= nxt
+        frontier = nxt
+    return found
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it is exceeded."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def build_index(lexicon, out_path, max_edit=1, min_len=MIN_INDEX_LEN):
+    """
+    Precompute the symmetric-delete index: a 2 x N uint64 array whose rows
+    are hash(delete) and word id, sorted by hash. Both rows are contiguous
+    so searchsorted works on the memory map without copying. Word ids are
+    the lexicon's own sorted positions, so no strings are duplicated.
+    """
+    hashes, word_ids = [], []
+    for word_id, word in enumerate(lexicon.words()):
+        if len(word) < min_len or not word.isalpha():
+            continue
+        for d in _deletes(word, max_edit):
+            hashes.append(_hash(d))
+            word_ids.append(word_id)
+
+    index = np.array([hashes, word_ids], dtype="<u8")
+    index = index[:, np.argsort(index[0], kind="stable")]
+    tmp_path = f"{out_path}.tmp.npy"
+    np.save(tmp_path, index)
+    os.replace(tmp_path, out_path)
+    return index.shape[1]
+
+
+class SymSpell:
+    """
+    Symmetric-delete spelling correction over the corpus lexicon.
+    Handles:
+      - disk-cached, memory-mapped delete index (rebuilt when the lexicon changes)
+      - candidate lookup: hash the token's deletes, searchsorted, verify by edit distance
+      - ranking by (edit distance, corpus rank); only the max_candidate_rank
+        most frequent words are ever suggested
+      - OCR-aware token correction that preserves case and punctuation
+    """
+
+    def __init__(self, lexicon=None, max_edit=1, index_path=None, max_candidate_rank=MAX_CANDIDATE_RANK):
+        self.lexicon = lexicon if lexicon is not None else load_lexicon()
+        self.max_edit = max_edit
+        # Percentile rank (1 - i/n, scaled) of the max_candidate_rank-th word
+        self.min_rank = 0
+        if max_candidate_rank and len(self.lexicon) > max_candidate_rank:
+            self.min_rank = round(RANK_SCALE * (1 - max_candidate_rank / len(self.lexicon)))
+        self.index_path = str(index_path or project_path("resources", INDEX_PATH_TEMPLATE.format(max_edit)))
+
+        if not os.path.exists(self.index_path) or (
+            os.path.getmtime(self.index_path) < os.path.getmtime(self.lexicon.path)
+        ):
+            logger.warning("🔨 Building symspell index: %s", self.index_path)
+            build_index(self.lexicon, self.index_path, max_edit=max_edit)
+
+        index = np.load(self.index_path, mmap_mode="r")
+        self.hashes = index[0]
+        self.word_ids = index[1]
+
+        # Live feeds keep re-reading the same misspellings
+        self.cached_lookup = lru_cache(maxsize=8192)(self.lookup)
+
+    def lookup(self, word):
+        """
+        Best in-lexicon correction for a lowercase word as (word, distance),
+        or (None, None) if no frequent enough word is within max_edit.
+        """
+        if word in self.lexicon:
+            return word, 0
+
+        hashes = np.array([_hash(d) for d in _deletes(word, self.max_edit)], dtype="<u8")
+        lo = np.searchsorted(self.hashes, hashes, side="left")
+        hi = np.searchsorted(self.hashes, hashes, side="right")
+
+        best, best_key = None, None
+        seen = set()
+        for a, b in zip(lo, hi):
+            for word_id in self.word_ids[a:b]:
+                word_id = int(word_id)
+                if word_id in seen:
+                    continue
+                seen.add(word_id)
+                if int(self.lexicon.ranks[word_id]) < self.min_rank:
+                    continue
+                candidate = self.lexicon._key(word_id).decode("utf-8")
+                dist = edit_distance(word, candidate, self.max_edit)
+                if dist > self.max_edit:
+                    continue
+                key = (dist, -int(self.lexicon.ranks[word_id]))
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+
+        if best is None:
+            return None, None
+        return best, best_key[0]
+
+    def correct_token(self, token, confidence=0.0, correct_below=CORRECT_BELOW):
+        """
+        Correct one recognized token if it is low-confidence and out of
+        vocabulary. Leading/trailing punctuation and case are preserved.
+        """
+        if confidence >= correct_below:
+            return token
+
+        start, end = 0, len(token)
+        while start < end and not token[start].isalnum():
+            start += 1
+        while end > start and not token[end - 1].isalnum():
+            end -= 1
+        core = token[start:end]
+        if len(core) < MIN_TOKEN_LEN or core.isdigit():
+            return token
+
+        lowered = core.lower()
+        if lowered in self.lexicon:
+            return token
+
+        # Mixed letters/digits are usually glyph confusions (H3LL0 → hello)
+        candidate = lowered.translate(OCR_CONFUSIONS) if any(c.isalpha() for c in lowered) else lowered
+        if not candidate.isalpha():
+            return token
+        fixed, _ = self.cached_lookup(candidate)
+        if fixed is None:
+            return token
+
+        if sum(c.isupper() for c in core) > sum(c.islower() for c in core):
+            fixed = fixed.upper()
+        elif core[0].isupper():
+            fixed = fixed.capitalize()
+        return token[:start] + fixed + token[end:]
+
+    def correct_text(self, text, confidence=0.0, correct_below=CORRECT_BELOW):
+        """Correct every token of a text that shares one confidence."""
+        return " ".join(
+            self.correct_token(t, confidence, correct_below) for t in text.split()
+        )
+
+
+_SYMSPELL = None
+_SYMSPELL_LOCK = threading.Lock()
+
+
+def get_symspell():
+    """Process-wide SymSpell instance (built/loaded on first use)."""
+    global _SYMSPELL
+    if _SYMSPELL is None:
+        with _SYMSPELL_LOCK:
+            if _SYMSPELL is None:
+                from ocr_modules.base_modules.corpus_score import LEXICON
+                _SYMSPELL = SymSpell(LEXICON)
+    return _SYMSPELL
+
+
+if __name__ == "__main__":
+    lexicon = load_lexicon(LEXICON_PATH)
+    path = project_path("resources", INDEX_PATH_TEMPLATE.format(1))
+    count = build_index(lexicon, path)
+    print(f"✅ Symspell index built: {count} deletes → {path}")
@@ -7,6 +7,7 @@ import concurrent.futures
 
 from ocr_modules.base_modules.initialization import initialize_models
 from ocr_modules.pipeline_utils.pipeline import run_pipeline
+from ocr_modules.pipeline_utils.process_pool import ProcessOCRPool
 
 
 class OCREngine:
@@ -19,14 +20,25 @@ class OCREngine:
       - returning clean results for app runners
     """
 
-    def __init__(self, mode="steady", max_workers=3):
+    def __init__(self, mode="steady", max_workers=3, use_processes=False, cache=None):
         """
         mode: "fast", "steady", or "extended"
-        max_workers: thread pool size for OCR pipeline
+        max_workers: thread pool size for OCR pipeline,
+                     or number of worker processes when use_processes=True
+        use_processes: run each pipeline in its own process (see process_pool)
+        cache: optional FrameResultCache; near-identical frames reuse results
         """
         self.mode = mode
-        self.models = initialize_models()
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self.cache = cache
+        self.pool = None
+        self.executor = None
+
+        if use_processes:
+            self.pool = ProcessOCRPool(processes=max_workers)
+            self.models = self.pool.models
+        else:
+            self.models = initialize_models()
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
 
     # ------------------------------------------------------------
     # Internal helpers
@@ -40,6 +52,21 @@ class OCREngine:
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         return Image.fromarray(rgb)
 
+    def _run_pipeline(self, frame, mode):
+        if self.pool is not None:
+            return self.pool.run(frame, mode=mode)
+
+        pil_img = self._cv2_to_pil(frame)
+
+        # Run your existing pipeline
+        return run_pipeline(
+            frame,
+            pil_img,
+            self.models,
+            self.executor,
+            mode=mode
+        )
+
     # ------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------
@@ -67,16 +94,11 @@ class OCREngine:
                 "error": "Frame is None"
             }
 
-        pil_img = self._cv2_to_pil(frame)
-
-        # Run your existing pipeline
-        result = run_pipeline(
-            frame,
-            pil_img,
-            self.models,
-            self.executor,
-            mode=self.mode
-        )
+        if self.cache is not None:
+            mode = self.mode
+            result = self.cache.get_or_compute(frame, mode, lambda: self._run_pipeline(frame, mode))
+        else:
+            result = self._run_pipeline(frame, self.mode)
 
         final = result.get("final_result", {})
 
@@ -86,6 +108,7 @@ class OCREngine:
             "reliable": final.get("reliable", False),
             "runtime": result.get("total_runtime", 0.0),
             "mode": result.get("mode", self.mode),
+            "cache_hit": result.get("cache_hit", False),
         }
 
     def set_mode(self, mode):
@@ -96,6 +119,9 @@ class OCREngine:
 
     def shutdown(self):
         """
-        Cleanly shut down thread pool.
+        Cleanly shut down thread or process pool.
         """
-        self.executor.shutdown(wait=False)
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+        else:
+            self.executor.shutdown(wait=False)
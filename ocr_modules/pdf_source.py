@@ -0,0 +1,215 @@
+# ocr_modules/pdf_source.py
+
+import time
+import threading
+import concurrent.futures
+
+import cv2
+import pypdfium2 as pdfium
+from PIL import Image
+
+from ocr_modules.base_modules.corpus_score import corpus_score
+from ocr_modules.pipeline_utils.pipeline import run_pipeline
+from ocr_modules.pipeline_utils.modes import get_mode_dpi
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# PDFium is not thread-safe: every call into it goes through this lock.
+_PDFIUM_LOCK = threading.Lock()
+
+
+class PDFSource:
+    """
+    Lazy PDF page source.
+    Handles:
+      - opening a PDF without rasterizing anything up front
+      - embedded text-layer extraction (born-digital pages)
+      - rendering one page at a time to a BGR ndarray at a given DPI
+    """
+
+    def __init__(self, path, dpi=150, min_text_chars=20):
+        """
+        dpi: render resolution for pages that need OCR
+        min_text_chars: text-layer length at which a page counts as born-digital
+        """
+        self.path = str(path)
+        self.dpi = dpi
+        self.min_text_chars = min_text_chars
+        with _PDFIUM_LOCK:
+            self.pdf = pdfium.PdfDocument(self.path)
+            self.page_count = len(self.pdf)
+
+    def __len__(self):
+        return self.page_count
+
+    def text_layer(self, index):
+        """
+        Return the page's embedded text, or "" if it has none worth using.
+        """
+        with _PDFIUM_LOCK:
+            page = self.pdf[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_bounded() or ""
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+
+        text = " ".join(text.split())
+        alpha = sum(c.isalpha() for c in text)
+        if alpha < self.min_text_chars:
+            return ""
+        return text
+
+    def render(self, index, dpi=None):
+        """
+        Rasterize a single page to a BGR ndarray (cv2 layout).
+        """
+        scale = (dpi or self.dpi) / 72.0
+        with _PDFIUM_LOCK:
+            page = self.pdf[index]
+            try:
+                bitmap = page.render(scale=scale)
+                try:
+                    image = bitmap.to_numpy().copy()
+                finally:
+                    bitmap.close()
+            finally:
+                page.close()
+
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+        elif image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        return image
+
+    def close(self):
+        with _PDFIUM_LOCK:
+            self.pdf.close()
+
+
+def _text_layer_result(page_index, text, start, mode):
+    return {
+        "page": page_index,
+        "final_result": {
+            "text": text,
+            "confidence": 1.0,
+            "corpus_score": corpus_score(text),
+            "reliable": True,
+        },
+        "case_triggered": "text_layer",
+        "total_runtime": round(time.perf_counter() - start, 3),
+        "mode": mode,
+    }
+
+
+def _page_error_result(page_index, error, start, mode):
+    return {
+        "page": page_index,
+        "final_result": {"text": "", "confidence": 0.0, "reliable": False, "error": str(error)},
+        "case_triggered": "exception",
+        "total_runtime": 0.0,
+        "page_runtime": round(time.perf_counter() - start, 3),
+        "mode": mode,
+    }
+
+
+def iter_pdf_results(path, run_fn, mode="steady", max_in_flight=2, skip_pages=()):
+    """
+    Stream per-page pipeline results from a PDF as they complete.
+
+    run_fn(cv_img, pil_img) -> run_pipeline-style result dict.
+    At most `max_in_flight` rasterized pages exist at any time, so memory
+    stays bounded regardless of page count. Pages with a usable text
+    layer are returned immediately without rendering or OCR.
+    Each yielded result carries a 0-based "page" index; a page that cannot
+    be read or rendered yields an "exception" result instead of raising.
+    """
+    source = PDFSource(path, dpi=get_mode_dpi(mode))
+    slots = threading.Semaphore(max_in_flight)
+    skip_pages = set(skip_pages)
+
+    def ocr_page(page_index, image, start):
+        try:
+            pil_img = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            result = run_fn(image, pil_img)
+        except Exception as e:
+            logger.error("❌ PDF page %s OCR error: %s", page_index, e)
+            result = {
+                "final_result": {"text": "", "confidence": 0.0, "reliable": False, "error": str(e)},
+                "case_triggered": "exception",
+                "total_runtime": 0.0,
+                "mode": mode,
+            }
+        finally:
+            slots.release()
+
+        result["page"] = page_index
+        result["render_dpi"] = source.dpi
+        result["page_runtime"] = round(time.perf_counter() - start, 3)
+        return result
+
+    workers = concurrent.futures.ThreadPoolExecutor(max_workers=max_in_flight)
+    pending = set()
+    try:
+        for page_index in range(len(source)):
+            if page_index in skip_pages:
+                continue
+
+            start = time.perf_counter()
+            try:
+                text = source.text_layer(page_index)
+            except Exception as e:
+                # Broken text layer: the rendered page may still OCR fine
+                logger.warning("⚠️ PDF page %s text layer unreadable: %s", page_index, e)
+                text = ""
+            if text:
+                yield _text_layer_result(page_index, text, start, mode)
+                continue
+
+            # Block here (not after rendering) so a page is only rasterized
+            # once a worker slot is free
+            while not slots.acquire(timeout=0.05):
+                done = {f for f in pending if f.done()}
+                for fut in done:
+                    pending.discard(fut)
+                    yield fut.result()
+
+            try:
+                image = source.render(page_index)
+            except Exception as e:
+                slots.release()
+                logger.error("❌ PDF page %s render error: %s", page_index, e)
+                yield _page_error_result(page_index, e, start, mode)
+                continue
+            pending.add(workers.submit(ocr_page, page_index, image, start))
+            del image
+
+            done = {f for f in pending if f.done()}
+            for fut in done:
+                pending.discard(fut)
+                yield fut.result()
+
+        for fut in concurrent.futures.as_completed(pending):
+            yield fut.result()
+        pending = set()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        workers.shutdown(wait=True)
+        source.close()
+
+
+def run_pdf(path, models, executor, mode="steady", max_in_flight=2):
+    """
+    OCR every page of a PDF with the standard pipeline.
+    Returns results ordered by page.
+    """
+    def run_fn(cv_img, pil_img):
+        return run_pipeline(cv_img, pil_img, models, executor, mode=mode, pad_interval=False)
+
+    results = list(iter_pdf_results(path, run_fn, mode=mode, max_in_flight=max_in_flight))
+    return sorted(results, key=lambda r: r["page"])
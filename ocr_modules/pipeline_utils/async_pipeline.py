@@ -2,18 +2,23 @@
 
 import threading
 import time
-from ocr_modules.pipeline_utils.pipeline import run_pipeline
+from ocr_modules.pipeline_utils.pipeline import run_pipeline, run_tesseract_pass
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 class AsyncPipeline:
-    def __init__(self, models, executor, mode="steady"):
+    def __init__(self, models, executor, mode="steady", cache=None, fusion=None):
         self.models = models
         self.executor = executor
         self.mode = mode
+        self.cache = cache  # optional FrameResultCache
+        self.fusion = fusion  # optional TemporalFusion
         self.is_ready = True
         self.processing_thread = None
         self.lock = threading.Lock()
 
-    def process_frame_async(self, cv_img, pil_img, callback=None):
+    def process_frame_async(self, cv_img, pil_img, callback=None, on_event=None):
         if not self.is_ready:
             return False  # Pipeline busy
 
@@ -21,11 +26,26 @@ class AsyncPipeline:
 
         def worker():
             try:
-                result = run_pipeline(cv_img, pil_img, self.models, executor=self.executor, mode=self.mode)
+                mode = self.mode
+                if self.fusion is not None and mode == "fast":
+                    # Fusion converges over frames, so one cheap engine per frame is enough
+                    compute = lambda: run_tesseract_pass(pil_img, mode=mode)
+                else:
+                    compute = lambda: run_pipeline(cv_img, pil_img, self.models, executor=self.executor,
+                                                   mode=mode, on_event=on_event)
+
+                if self.cache is not None:
+                    result = self.cache.get_or_compute(cv_img, mode, compute)
+                else:
+                    result = compute()
+
+                if self.fusion is not None:
+                    # A cache hit is the same frame again, not a new vote
+                    result = self.fusion.apply(result, update=not result.get("cache_hit"))
                 if callback:
                     callback(result)
             except Exception as e:
-                print(f"❌ Pipeline error: {e}")
+                logger.error("❌ Pipeline error: %s", e)
             finally:
                 with self.lock:
                     self.is_ready = True
@@ -0,0 +1,40 @@
+# ocr_modules/pipeline_utils/events.py
+
+import time
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Event types emitted by run_pipeline(on_event=...), in the order they occur
+DETECTION = "detection"          # EAST finished: boxes
+ENGINE_RESULT = "engine_result"  # one engine / phase2 case finished
+REGION_TEXT = "region_text"      # one guided crop recognized
+WINNER = "winner"                # engine whose result was chosen
+FINAL = "final"                  # same dict run_pipeline returns
+
+
+def emit(on_event, event_type, **payload):
+    """
+    Send a typed event dict to on_event, if set.
+    Listener errors are logged and never break the pipeline.
+    """
+    if on_event is None:
+        return
+    event = {"type": event_type}
+    event.update(payload)
+    try:
+        on_event(event)
+    except Exception as e:
+        logger.warning("⚠️ Pipeline event listener error: %s", e)
+
+
+def timed_listener(on_event, start):
+    """Wrap on_event so every event carries "elapsed" seconds since start."""
+    if on_event is None:
+        return None
+
+    def listener(event):
+        event["elapsed"] = round(time.perf_counter() - start, 3)
+        on_event(event)
+
+    return listener
@@ -0,0 +1,127 @@
+# ocr_modules/pipeline_utils/frame_gate.py
+
+import time
+import threading
+from collections import Counter
+
+import cv2
+import numpy as np
+
+# Reasons that mean "try again on the very next frame" rather than
+# "nothing new here, wait for the next cycle".
+DEFER_REASONS = ("blurry", "underexposed", "overexposed")
+
+
+class FrameGate:
+    """
+    Cheap pre-OCR gate.
+    Handles:
+      - frame change: largest per-tile mean abs difference of a downsampled
+        gray frame against the last frame that was actually OCR'd (a global
+        mean dilutes a changed digit on a sign below any usable threshold)
+      - sharpness: variance of the Laplacian (motion blur / defocus)
+      - exposure: mean brightness and fraction of clipped pixels
+      - skip-reason counters
+    """
+
+    def __init__(
+        self,
+        min_change=3.0,
+        min_sharpness=50.0,
+        min_brightness=35.0,
+        max_brightness=225.0,
+        max_clipped=0.35,
+        max_skip_age=30.0,
+        size=(160, 120),
+        grid=8,
+    ):
+        """
+        min_change: mean abs gray difference (0-255) of the most-changed tile
+            below which a frame is "unchanged"
+        min_sharpness: Laplacian variance below which a frame is "blurry"
+        min_brightness / max_brightness: acceptable mean gray level
+        max_clipped: max fraction of pixels at black/white clip
+        max_skip_age: re-OCR an unchanged scene after this many seconds anyway
+        size: downsampled (width, height) all metrics are computed on
+        grid: change is measured on a grid x grid tiling of that frame
+        """
+        self.min_change = min_change
+        self.min_sharpness = min_sharpness
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.max_clipped = max_clipped
+        self.max_skip_age = max_skip_age
+        self.size = size
+        self.grid = grid
+
+        self.last_small = None
+        self.last_processed_time = 0.0
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def _small_gray(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+
+    def _tile_change(self, small, last):
+        # INTER_AREA down to grid x grid = mean of each tile
+        diff = cv2.absdiff(small, last).astype(np.float32)
+        return float(cv2.resize(diff, (self.grid, self.grid), interpolation=cv2.INTER_AREA).max())
+
+    def measure(self, frame):
+        small = self._small_gray(frame)
+        with self.lock:
+            last = self.last_small
+        change = (
+            self._tile_change(small, last)
+            if last is not None and last.shape == small.shape else None
+        )
+        clipped = float(np.count_nonzero((small <= 5) | (small >= 250))) / small.size
+        return small, {
+            "change": change,
+            "sharpness": float(cv2.Laplacian(small, cv2.CV_64F).var()),
+            "brightness": float(small.mean()),
+            "clipped": clipped,
+        }
+
+    def check(self, frame):
+        """
+        Returns (ok, reason, metrics). reason is None when ok, else one of
+        "unchanged", "blurry", "underexposed", "overexposed".
+        A passing frame becomes the new reference for change detection.
+        """
+        small, m = self.measure(frame)
+
+        reason = None
+        if m["brightness"] < self.min_brightness:
+            reason = "underexposed"
+        elif m["brightness"] > self.max_brightness or m["clipped"] > self.max_clipped:
+            reason = "overexposed"
+        elif m["sharpness"] < self.min_sharpness:
+            reason = "blurry"
+        elif (
+            m["change"] is not None
+            and m["change"] < self.min_change
+            and time.time() - self.last_processed_time < self.max_skip_age
+        ):
+            reason = "unchanged"
+
+        with self.lock:
+            self.counts["checked"] += 1
+            if reason is None:
+                self.counts["passed"] += 1
+                self.last_small = small
+                self.last_processed_time = time.time()
+            else:
+                self.counts[reason] += 1
+
+        return reason is None, reason, m
+
+    def reset(self):
+        with self.lock:
+            self.last_small = None
+            self.last_processed_time = 0.0
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
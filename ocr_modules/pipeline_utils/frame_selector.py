@@ -0,0 +1,97 @@
+# ocr_modules/pipeline_utils/frame_selector.py
+
+import time
+import threading
+
+import cv2
+
+
+class BestFrameSelector:
+    """
+    Best-of-window frame picker for the capture thread.
+    Handles:
+      - per-frame score on a downsampled gray view (constant cost per frame)
+      - sharpness (Laplacian variance) discounted by motion vs the previous frame
+      - small candidate buffer limited to the last `window` seconds
+      - best(since) lookup for the OCR phase
+    """
+
+    def __init__(self, window=5.0, size=6, min_spacing=0.05, size_px=(160, 120)):
+        """
+        window: seconds a candidate stays eligible
+        size: max candidates kept (worst is replaced when full)
+        min_spacing: seconds between scored frames (caps scoring rate)
+        size_px: downsampled (width, height) the score is computed on
+        """
+        self.window = window
+        self.size = size
+        self.min_spacing = min_spacing
+        self.size_px = size_px
+
+        self.candidates = []  # [score, timestamp, frame]
+        self.prev_small = None
+        self.last_scored = 0.0
+        self.lock = threading.Lock()
+
+    def score(self, frame):
+        """
+        Return (score, small). Sharp, still frames score highest:
+        sharpness / (1 + motion), where motion is the mean abs gray
+        difference against the previous scored frame.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        small = cv2.resize(gray, self.size_px, interpolation=cv2.INTER_AREA)
+        sharpness = float(cv2.Laplacian(small, cv2.CV_64F).var())
+
+        prev = self.prev_small
+        motion = (
+            float(cv2.absdiff(small, prev).mean())
+            if prev is not None and prev.shape == small.shape else 0.0
+        )
+        return sharpness / (1.0 + motion), small
+
+    def push(self, frame, now=None):
+        """
+        Offer a captured frame. The frame is kept by reference, so the
+        caller must not modify it in place afterwards.
+        """
+        now = time.time() if now is None else now
+        if now - self.last_scored < self.min_spacing:
+            return
+
+        score, small = self.score(frame)
+
+        with self.lock:
+            self.prev_small = small
+            self.last_scored = now
+
+            # Age out candidates that fell outside the window
+            cutoff = now - self.window
+            self.candidates = [c for c in self.candidates if c[1] >= cutoff]
+
+            if len(self.candidates) < self.size:
+                self.candidates.append([score, now, frame])
+                return
+
+            # Replace the weakest; ties go to the newer frame
+            worst = min(range(len(self.candidates)), key=lambda i: self.candidates[i][0])
+            if score >= self.candidates[worst][0]:
+                self.candidates[worst] = [score, now, frame]
+
+    def best(self, since=0.0):
+        """
+        Return (frame copy, score) for the best candidate captured at or
+        after `since`, or (None, 0.0) if there is none.
+        """
+        with self.lock:
+            eligible = [c for c in self.candidates if c[1] >= since]
+            if not eligible:
+                return None, 0.0
+            score, _, frame = max(eligible, key=lambda c: (c[0], c[1]))
+            return frame.copy(), score
+
+    def reset(self):
+        with self.lock:
+            self.candidates = []
+            self.prev_small = None
+            self.last_scored = 0.0
@@ -0,0 +1,166 @@
+# ocr_modules/pipeline_utils/micro_batch.py
+
+import time
+import queue
+import threading
+import concurrent.futures
+
+import cv2
+
+from ocr_modules.base_modules.ocr_engines import run_east_batch
+from ocr_modules.pipeline_utils.pipeline import run_pipeline
+from ocr_modules.pipeline_utils.events import DETECTION, ENGINE_RESULT, WINNER
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def stage_timings(events):
+    """Pipeline events → [{"stage", "runtime", "elapsed"}] in the order they finished."""
+    stages = []
+    for event in events:
+        if event["type"] == DETECTION:
+            stages.append({"stage": "east", "runtime": event.get("runtime"), "elapsed": event.get("elapsed")})
+        elif event["type"] == ENGINE_RESULT:
+            stages.append({"stage": event.get("engine"), "runtime": event.get("runtime"),
+                           "elapsed": event.get("elapsed")})
+        elif event["type"] == WINNER:
+            stages.append({"stage": "decision", "runtime": None, "elapsed": event.get("elapsed")})
+    return stages
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-image OCR requests into micro-batches.
+    Handles:
+      - a short collection window (window seconds or max_batch images, whichever first)
+      - one batched EAST forward per batch (run_east_batch)
+      - the rest of run_pipeline per image, in parallel, reusing that detection
+      - per-request futures carrying queue wait / batch / stage timings
+    """
+
+    def __init__(self, models, executor, window=0.005, max_batch=8, workers=4):
+        """
+        executor: engine pool used inside run_pipeline (phase1 / phase2 tasks)
+        workers: pipelines running at once (separate pool, so a pipeline
+        never waits behind its own engine tasks)
+        """
+        self.models = models
+        self.executor = executor
+        self.window = window
+        self.max_batch = max_batch
+
+        self.pending = queue.Queue()
+        self.workers = concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                             thread_name_prefix="ocr-batch")
+        self.lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+
+    def submit(self, cv_img, mode="steady", thresholds=None):
+        """Queue one BGR image; returns a Future of the run_pipeline result (+ "timings")."""
+        future = concurrent.futures.Future()
+        self.pending.put({
+            "image": cv_img,
+            "mode": mode,
+            "thresholds": thresholds,
+            "future": future,
+            "queued": time.perf_counter(),
+        })
+        with self.lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ocr-microbatch", daemon=True)
+                self._thread.start()
+        return future
+
+    def stop(self):
+        self._stop.set()
+        self.workers.shutdown(wait=False)
+
+    def _collect(self):
+        """Block for the first request, then gather more for up to window seconds."""
+        try:
+            batch = [self.pending.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if batch:
+                self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        # Requests whose caller already gave up are dropped here
+        live = [r for r in batch if r["future"].set_running_or_notify_cancel()]
+        if not live:
+            return
+
+        start = time.perf_counter()
+        try:
+            detections = run_east_batch([r["image"] for r in live])
+        except Exception as e:
+            # Each pipeline falls back to its own EAST pass
+            logger.error("❌ Batched EAST failed (%s images): %s", len(live), e, exc_info=True)
+            detections = [None] * len(live)
+        east_seconds = round(time.perf_counter() - start, 3)
+
+        self.batches += 1
+        self.requests += len(live)
+        self.largest_batch = max(self.largest_batch, len(live))
+        logger.debug("📦 Micro-batch of %s: EAST %ss", len(live), east_seconds)
+
+        for request, east_result in zip(live, detections):
+            timings = {
+                "queue_wait": round(start - request["queued"], 3),
+                "batch_size": len(live),
+                "east_batch": east_seconds if east_result is not None else None,
+            }
+            try:
+                self.workers.submit(self._finish, request, east_result, timings)
+            except RuntimeError as e:
+                # Pool shut down
+                request["future"].set_exception(e)
+
+    def _finish(self, request, east_result, timings):
+        events = []
+        start = time.perf_counter()
+        try:
+            cv_img = request["image"]
+            pil_img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
+            result = run_pipeline(cv_img, pil_img, self.models, self.executor,
+                                  mode=request["mode"], pad_interval=False,
+                                  on_event=events.append, thresholds=request["thresholds"],
+                                  east_result=east_result)
+        except Exception as e:
+            request["future"].set_exception(e)
+            return
+
+        timings["pipeline"] = round(time.perf_counter() - start, 3)
+        timings["total"] = round(time.perf_counter() - request["queued"], 3)
+        timings["stages"] = stage_timings(events)
+        result["timings"] = timings
+        request["future"].set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "largest_batch": self.largest_batch,
+            "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "queued": self.pending.qsize(),
+        }
@@ -3,16 +3,20 @@
 import time
 
 MODES = {
-    "fast": {"budget": 1.0, "min_interval": 0.0},        # cap at 1s, finish ASAP
-    "steady": {"budget": 5.0, "min_interval": 2.0},      # Consistent rhythm, allows up to 5s
-    "extended": {"budget": 9999.0, "min_interval": 10.0}    # no max per image, but wait 10s between cycles
+    "fast": {"budget": 1.0, "min_interval": 0.0, "pdf_dpi": 100},        # cap at 1s, finish ASAP
+    "steady": {"budget": 5.0, "min_interval": 2.0, "pdf_dpi": 150},      # Consistent rhythm, allows up to 5s
+    "extended": {"budget": 9999.0, "min_interval": 10.0, "pdf_dpi": 300}    # no max per image, but wait 10s between cycles
 }
 
 def get_mode_budget(mode_name):
     mode = MODES.get(mode_name, MODES["steady"])
     return mode["budget"]
 
-def enforce_mode(mode_name, start_time):
+def get_mode_dpi(mode_name):
+    mode = MODES.get(mode_name, MODES["steady"])
+    return mode["pdf_dpi"]
+
+def enforce_mode(mode_name, start_time, pad_interval=True):
     mode = MODES.get(mode_name, MODES["steady"])
     elapsed = time.perf_counter() - start_time
 
@@ -20,8 +24,9 @@ def enforce_mode(mode_name, start_time):
     if mode["budget"] is not None and elapsed > mode["budget"]:
         return round(mode["budget"], 3)
 
-    # Pad runtime if min_interval is set
-    if mode["min_interval"] > 0 and elapsed < mode["min_interval"]:
+    # Pad runtime if min_interval is set (callers that schedule their own
+    # rate, e.g. the stream multiplexer, pass pad_interval=False)
+    if pad_interval and mode["min_interval"] > 0 and elapsed < mode["min_interval"]:
         sleep_time = mode["min_interval"] - elapsed
         time.sleep(sleep_time)
         return round(mode["min_interval"], 3)
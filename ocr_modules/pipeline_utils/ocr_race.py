@@ -9,6 +9,9 @@ from ocr_modules.base_modules.ocr_engines import (
     run_paddleocr,
     run_easyocr_with_reader,
 )
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 def run_with_abort_check(fn, *args, stop_event=None, max_time=3.5, **kwargs):
     result = [None]
@@ -23,18 +26,20 @@ def run_with_abort_check(fn, *args, stop_event=None, max_time=3.5, **kwargs):
         if stop_event and stop_event.is_set():
             return {"skipped": True, "aborted": True}
         if time.perf_counter() - start > max_time:
-            print("⏱️ Engine timed out internally.")
+            logger.warning("⏱️ Engine timed out internally.")
             return {"skipped": True, "timed_out": True}
         time.sleep(0.05)
 
     return result[0]
-from ocr_modules.base_modules.preprocess import crop_regions, aggregate_crop_results
+import functools
+from ocr_modules.base_modules.preprocess import aggregate_crop_results, PreprocessedFrame
 
-def run_easyocr_guided(cv_img, reader, east_result=None, conf_threshold=0.6):
+def run_easyocr_guided(cv_img, reader, east_result=None, conf_threshold=0.6, region_cache=None):
     if east_result and east_result.get("region_count", 0) > 0:
-        crops = crop_regions(cv_img, east_result)
-        return aggregate_crop_results(crops, run_easyocr_with_reader, reader,
-                                      conf_threshold=conf_threshold)
+        crops = PreprocessedFrame(cv_img).crops(east_result)
+        return aggregate_crop_results(crops, functools.partial(run_easyocr_with_reader, preprocessed=True), reader,
+                                      conf_threshold=conf_threshold,
+                                      region_cache=region_cache, engine="easyocr")
     else:
         return run_easyocr_with_reader(cv_img, reader)
 
@@ -46,7 +51,7 @@ def ocr_race_engines(cv_img, pil_img, models, timeout=5.0, east_result=None):
 
     def engine_wrapper(name, stop_event):
         if stop_event.is_set():
-            print(f"⏭️ {name} aborted early due to winner.")
+            logger.info("⏭️ %s aborted early due to winner.", name)
             return {"engine": name, "skipped": True, "aborted": True}
 
         try:
@@ -68,7 +73,8 @@ def ocr_race_engines(cv_img, pil_img, models, timeout=5.0, east_result=None):
                 reader = models.get("easyocr_en")
                 if east_result and east_result.get("region_count", 0) > 0:
                     # Guided mode: crop first, then aggregate results
-                    result = run_easyocr_guided(cv_img, reader, east_result)
+                    result = run_easyocr_guided(cv_img, reader, east_result,
+                                                region_cache=models.get("region_cache"))
                 else:
                     # Full image mode
                     result = run_with_abort_check(run_easyocr_with_reader, cv_img, reader,
@@ -84,7 +90,7 @@ def ocr_race_engines(cv_img, pil_img, models, timeout=5.0, east_result=None):
             return result
 
         except Exception as e:
-            print(f"🧪 {name} crashed: {e}")
+            logger.error("🧪 %s crashed: %s", name, e)
             return None
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
@@ -99,7 +105,7 @@ def ocr_race_engines(cv_img, pil_img, models, timeout=5.0, east_result=None):
                 results[name] = result
                 if result.get("reliable"):
                     winner = result
-                    print(f"🏁 Reliable result from {name}. Cancelling other threads...")
+                    logger.info("🏁 Reliable result from %s. Cancelling other threads...", name)
                     stop_event.set()
                     # cancel remaining futures
                     for f in futures:
@@ -107,7 +113,7 @@ def ocr_race_engines(cv_img, pil_img, models, timeout=5.0, east_result=None):
                             f.cancel()
                     break
         except concurrent.futures.TimeoutError:
-            print("⚠️ OCR race timed out.")
+            logger.warning("⚠️ OCR race timed out.")
             stop_event.set()
             for f in futures:
                 if not f.done():
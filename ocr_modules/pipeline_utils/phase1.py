@@ -1,48 +1,67 @@
 # ocr_modules/pipeline_utils/phase1.py
 
 import time
+import logging
+import functools
 import concurrent.futures
 from shared.runtime import timed_run
 from shared.helper import normalize_conf  # safe float caster
 from ocr_modules.base_modules.ocr_engines import run_east, run_easyocr_with_reader, run_tesseract
-from ocr_modules.base_modules.preprocess import crop_regions, aggregate_crop_results
+from ocr_modules.base_modules.preprocess import aggregate_guided_crops, PreprocessedFrame
+from ocr_modules.pipeline_utils.events import emit, DETECTION, ENGINE_RESULT, REGION_TEXT
+from ocr_modules.base_modules.reliability import decision_thresholds, accepts_phase1
+from shared.log_utils import get_logger
 
-def run_phase1_parallel(cv_img, pil_img, executor, budget=2.0, models=None):
+logger = get_logger(__name__)
+
+def run_phase1_parallel(cv_img, pil_img, executor, budget=2.0, models=None, on_event=None,
+                        thresholds=None, east_result=None):
+    """
+    east_result: detection already done by the caller (e.g. run_east_batch
+    across several requests); only Tesseract is submitted then.
+    """
+    thresholds = decision_thresholds(thresholds)
     phase1_start = time.perf_counter()
     
     # Submit both tasks
     # Pass preloaded models to the EAST worker to avoid reinitialization
-    future_east = executor.submit(run_east, cv_img, models)
+    if east_result is None:
+        future_east = executor.submit(run_east, cv_img, models)
+    else:
+        future_east = concurrent.futures.Future()
+        future_east.set_result(east_result)
     east_start = time.perf_counter()
 
-    future_tess = executor.submit(run_tesseract, pil_img)
+    future_tess = executor.submit(run_tesseract, pil_img,
+                                  min_conf=thresholds["min_conf"], min_corpus=thresholds["min_corpus"])
     tess_start = time.perf_counter()
     
     try:
         east_result = future_east.result(timeout=budget)
         east_time = round(time.perf_counter() - east_start, 3)
     except concurrent.futures.TimeoutError:
-        print(f"⚠️ EAST timeout ({budget}s budget exceeded)")
+        logger.warning("⚠️ EAST timeout (%ss budget exceeded)", budget)
         east_result = {"region_count": 0, "regions": []}
         east_time = round(budget, 3)
     except Exception as e:
-        print("❌ Exception while retrieving EAST future:")
-        import traceback as _tb
-        _tb.print_exc()
+        logger.error("❌ Exception while retrieving EAST future:", exc_info=True)
         east_result = {"region_count": 0, "regions": [], "error": str(e)}
         east_time = round(time.perf_counter() - east_start, 3)
+
+    emit(on_event, DETECTION,
+         boxes=[r.get("box") for r in east_result.get("regions", [])],
+         region_count=normalize_conf(east_result.get("region_count"), 0),
+         runtime=east_time)
     
     try:
         tess_result = future_tess.result(timeout=budget)
         tess_time = round(time.perf_counter() - tess_start, 3)
     except concurrent.futures.TimeoutError:
-        print(f"⚠️ Tesseract timeout ({budget}s budget exceeded)")
+        logger.warning("⚠️ Tesseract timeout (%ss budget exceeded)", budget)
         tess_result = {"text": "", "confidence": 0.0}
         tess_time = round(budget, 3)
     except Exception as e:
-        print("❌ Exception while retrieving Tesseract future:")
-        import traceback as _tb
-        _tb.print_exc()
+        logger.error("❌ Exception while retrieving Tesseract future:", exc_info=True)
         tess_result = {"text": "", "confidence": 0.0, "error": str(e)}
         tess_time = round(time.perf_counter() - tess_start, 3)
     
@@ -57,7 +76,15 @@ def run_phase1_parallel(cv_img, pil_img, executor, budget=2.0, models=None):
     )
     
     tess_conf = normalize_conf(tess_result.get("confidence"))
-    tess_result["isReliable"] = tess_conf >= 0.6
+    tess_result["isReliable"] = accepts_phase1(tess_result, thresholds, region_count=region_count)
+
+    emit(on_event, ENGINE_RESULT,
+         engine="tesseract",
+         text=tess_result.get("text", ""),
+         confidence=tess_conf,
+         reliable=tess_result["isReliable"],
+         lines=tess_result.get("lines", []),
+         runtime=tess_time)
     
     return {
         "east_result": east_result,
@@ -70,6 +97,8 @@ def run_phase1_parallel(cv_img, pil_img, executor, budget=2.0, models=None):
     }
 
 def print_phase1_log(phase1_result):
+    if not logger.isEnabledFor(logging.INFO):
+        return
     east_result = phase1_result["east_result"]
     tess_result = phase1_result["tess_result"]
     east_time = phase1_result["east_time"]
@@ -85,28 +114,44 @@ def print_phase1_log(phase1_result):
     )
     tess_conf = normalize_conf(tess_result.get("confidence"))
     
-    print(f"📦 EAST regions: {region_count} boxes, avg confidence: {avg_conf} (runtime: {east_time}s)")
-    print(f"🧠 Tesseract complete (runtime: {tess_time}s)")
-    print(f"   Parallel overhead check: max({east_time}s, {tess_time}s) = {max(east_time, tess_time)}s")
-    print(f"⏱️ Phase 1 elapsed: {elapsed}s (budget: {budget}s)")
+    logger.info("📦 EAST regions: %s boxes, avg confidence: %s (runtime: %ss)", region_count, avg_conf, east_time)
+    logger.info("🧠 Tesseract complete (runtime: %ss)", tess_time)
+    logger.info("   Parallel overhead check: max(%ss, %ss) = %ss", east_time, tess_time, max(east_time, tess_time))
+    logger.info("⏱️ Phase 1 elapsed: %ss (budget: %ss)", elapsed, budget)
 
 def run_easyocr_guided(cv_img, reader, east_result=None,
-                       conf_threshold=0.6, min_token_conf=0.6, max_crops=5, verbose=False):
+                       conf_threshold=0.6, min_token_conf=0.6, max_crops=5, verbose=False,
+                       region_cache=None, on_event=None, frame=None):
+    """
+    frame: optional PreprocessedFrame of cv_img shared with the caller's
+    other EasyOCR passes; crops are views into its preprocessed image.
+    """
+    if frame is None:
+        frame = PreprocessedFrame(cv_img)
     region_count = normalize_conf(east_result.get("region_count"), 0) if east_result else 0
     if east_result and region_count > 0:
         if region_count >= max_crops:
             # Too many boxes → fallback to full image
-            return run_easyocr_with_reader(cv_img, reader, min_token_conf=min_token_conf)
+            return run_easyocr_with_reader(frame, reader, min_token_conf=min_token_conf)
         else:
-            crops = crop_regions(cv_img, east_result)
-            return aggregate_crop_results(
+            crops, boxes = frame.crops(east_result, with_boxes=True)
+
+            def on_region(index, text, conf, cached):
+                emit(on_event, REGION_TEXT, engine="easyocr-guided", index=index,
+                     box=boxes[index], text=text, confidence=conf, cached=cached)
+
+            # Crops are scored together in aggregate_guided_crops
+            return aggregate_guided_crops(
                 crops,
-                run_easyocr_with_reader,
+                functools.partial(run_easyocr_with_reader, preprocessed=True),
                 reader,
                 conf_threshold=conf_threshold,
-                min_crop_conf=min_token_conf,
-                verbose=verbose
+                min_token_conf=min_token_conf,
+                verbose=verbose,
+                region_cache=region_cache,
+                engine="easyocr",
+                on_region=on_region if on_event is not None else None
             )
     else:
         # No EAST regions → full image
-        return run_easyocr_with_reader(cv_img, reader, min_token_conf=min_token_conf)
+        return run_easyocr_with_reader(frame, reader, min_token_conf=min_token_conf)
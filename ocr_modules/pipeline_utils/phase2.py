@@ -1,13 +1,22 @@
 # ocr_modules/pipeline_utils/phase2.py
 
 import time
+import logging
 import concurrent.futures
 from shared.helper import normalize_conf  # safe float caster
 from ocr_modules.pipeline_utils.phase1 import run_easyocr_guided
-from ocr_modules.base_modules.ocr_engines import run_easyocr_with_reader
+from ocr_modules.base_modules.ocr_engines import run_easyocr_raw
+from ocr_modules.base_modules.parsers import parse_easyocr_output
+from ocr_modules.base_modules.preprocess import PreprocessedFrame
+from ocr_modules.pipeline_utils.events import emit, ENGINE_RESULT
+from ocr_modules.base_modules.reliability import decision_thresholds, accepts_phase2
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 def run_phase2_conditional(cv_img, pil_img, models, east_result,
-                           executor=None, budget=2.0, max_crops=5):
+                           executor=None, budget=2.0, max_crops=5, on_event=None, thresholds=None):
+    thresholds = decision_thresholds(thresholds)
     if executor is None:
         local_exec = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         exec_ctx = local_exec
@@ -23,11 +32,20 @@ def run_phase2_conditional(cv_img, pil_img, models, east_result,
         "final_result": None,
         "total_runtime": None,
         "best_result": None,
-        "best_case": None
+        "best_case": None,
+        "saved_seconds": 0.0
     }
 
+    # Raw engine tokens for this frame: looser-threshold cases re-parse
+    # these instead of running inference again. engine -> (raw, runtime)
+    raw_outputs = {}
+
+    # Resize + CLAHE once; guided crops and the full-image passes share it
+    frame = PreprocessedFrame(cv_img)
+
     best_confidence = -1.0
     best_result_overall = None
+    best_engine = None
 
     def elapsed():
         return time.perf_counter() - overall_start
@@ -47,33 +65,55 @@ def run_phase2_conditional(cv_img, pil_img, models, east_result,
             "status": status,
             "result": result
         })
-
-    def update_best(case_idx, result):
-        nonlocal best_confidence, best_result_overall
+        emit(on_event, ENGINE_RESULT,
+             engine=engine_name,
+             case=case_idx,
+             status=status,
+             text=result.get("text", ""),
+             confidence=normalize_conf(result.get("confidence")),
+             reliable=result["reliable"],
+             runtime=result["runtime"])
+
+    def update_best(case_idx, result, engine_name):
+        nonlocal best_confidence, best_result_overall, best_engine
         conf = normalize_conf(result.get("confidence"))
         if conf > best_confidence:
             best_confidence = conf
             best_result_overall = result
+            best_engine = engine_name
             case_log["best_case"] = case_idx
 
+    def set_final(result, engine_name):
+        # Tag with the producing engine: passes_final picks its calibration by it
+        result["engine"] = engine_name
+        case_log["final_result"] = result
+
+    def set_final_best(placeholder, engine_name):
+        if best_result_overall:
+            set_final(best_result_overall, best_engine)
+        else:
+            set_final(placeholder, engine_name)
+
     try:
         # Case 1: Guided EasyOCR
         region_count = normalize_conf(east_result.get("region_count"), 0) if east_result else 0
         if east_result and 0 < region_count < max_crops and remaining_budget() > 0.0:
             start = time.perf_counter()
-            fut = exec_ctx.submit(run_easyocr_guided, cv_img, models["easyocr_en"], east_result, max_crops=max_crops)
+            fut = exec_ctx.submit(run_easyocr_guided, cv_img, models["easyocr_en"], east_result,
+                                 conf_threshold=thresholds["min_conf"],
+                                 min_token_conf=thresholds["token_conf"],
+                                 max_crops=max_crops, region_cache=models.get("region_cache"),
+                                 on_event=on_event, frame=frame)
             try:
                 easy_result = fut.result(timeout=remaining_budget())
                 step_runtime = time.perf_counter() - start
                 status = "success" if easy_result.get("text") else "fail"
                 record_step(1, easy_result, "Phase2 Case 1: EasyOCR guided by EAST", "easyocr-guided", step_runtime, status)
-                update_best(1, easy_result)
+                update_best(1, easy_result, "easyocr-guided")
 
-                if easy_result.get("text") and (
-                    easy_result.get("reliable", False) or normalize_conf(easy_result.get("confidence")) >= 0.8
-                ):
+                if accepts_phase2(easy_result, thresholds, region_count=region_count, engine="easyocr-guided"):
                     case_log["case_triggered"] = 1
-                    case_log["final_result"] = easy_result
+                    set_final(easy_result, "easyocr-guided")
                     case_log["total_runtime"] = round(elapsed(), 3)
                     return case_log
             except concurrent.futures.TimeoutError:
@@ -81,26 +121,28 @@ def run_phase2_conditional(cv_img, pil_img, models, east_result,
                 placeholder = {"text": "", "confidence": 0.0, "reliable": False}
                 record_step(1, placeholder, "Phase2 Case 1: EasyOCR guided by EAST (timeout)", "easyocr-guided", step_runtime, "timeout")
                 case_log["case_triggered"] = 1
-                case_log["final_result"] = best_result_overall if best_result_overall else placeholder
+                set_final_best(placeholder, "easyocr-guided")
                 case_log["total_runtime"] = round(budget, 3)
                 return case_log
 
         # Case 2: EasyOCR full-image (normal thresholds)
         if remaining_budget() > 0.0:
             start = time.perf_counter()
-            fut = exec_ctx.submit(run_easyocr_with_reader, cv_img, models["easyocr_en"], min_token_conf=0.6)
+            fut = exec_ctx.submit(run_easyocr_raw, frame, models["easyocr_en"])
             try:
-                easy_result = fut.result(timeout=remaining_budget())
+                raw = fut.result(timeout=remaining_budget())
                 step_runtime = time.perf_counter() - start
+                raw_outputs["easyocr-full"] = (raw, step_runtime)
+                easy_result = parse_easyocr_output(raw, min_token_conf=thresholds["token_conf"],
+                                                   min_conf=thresholds["min_conf"],
+                                                   min_corpus=thresholds["min_corpus"])
                 status = "success" if easy_result.get("text") else "fail"
                 record_step(2, easy_result, "Phase2 Case 2: EasyOCR full-image", "easyocr-full", step_runtime, status)
-                update_best(2, easy_result)
+                update_best(2, easy_result, "easyocr-full")
 
-                if easy_result.get("text") and (
-                    easy_result.get("reliable", False) or normalize_conf(easy_result.get("confidence")) >= 0.8
-                ):
+                if accepts_phase2(easy_result, thresholds, region_count=region_count, engine="easyocr-full"):
                     case_log["case_triggered"] = 2
-                    case_log["final_result"] = easy_result
+                    set_final(easy_result, "easyocr-full")
                     case_log["total_runtime"] = round(elapsed(), 3)
                     return case_log
             except concurrent.futures.TimeoutError:
@@ -108,35 +150,55 @@ def run_phase2_conditional(cv_img, pil_img, models, east_result,
                 placeholder = {"text": "", "confidence": 0.0, "reliable": False}
                 record_step(2, placeholder, "Phase2 Case 2: EasyOCR full-image (timeout)", "easyocr-full", step_runtime, "timeout")
                 case_log["case_triggered"] = case_log["best_case"] if case_log["best_case"] else 2
-                case_log["final_result"] = best_result_overall if best_result_overall else placeholder
+                set_final_best(placeholder, "easyocr-full")
                 case_log["total_runtime"] = round(budget, 3)
                 return case_log
 
         # Case 3: EasyOCR full-image (looser thresholds)
-        if remaining_budget() > 0.0:
+        if "easyocr-full" in raw_outputs:
+            # Same image, same engine: re-filter Case 2's raw tokens (no inference)
+            start = time.perf_counter()
+            raw, inference_runtime = raw_outputs["easyocr-full"]
+            backup_result = parse_easyocr_output(raw, min_token_conf=thresholds["loose_token_conf"],
+                                                 min_conf=thresholds["min_conf"],
+                                                 min_corpus=thresholds["min_corpus"])
+            step_runtime = time.perf_counter() - start
+            case_log["saved_seconds"] += inference_runtime
+            backup_result.update({"backup_triggered": True, "raw_reused": True})
+            status = "success" if backup_result.get("text") else "fail"
+            record_step(3, backup_result, "Phase2 Case 3: EasyOCR full-image (looser thresholds, reused raw)", "easyocr-full-loose", step_runtime, status)
+            update_best(3, backup_result, "easyocr-full-loose")
+        elif remaining_budget() > 0.0:
             start = time.perf_counter()
-            fut = exec_ctx.submit(run_easyocr_with_reader, cv_img, models["easyocr_en"], min_token_conf=0.3)
+            fut = exec_ctx.submit(run_easyocr_raw, frame, models["easyocr_en"])
             try:
-                backup_result = fut.result(timeout=remaining_budget())
+                backup_result = parse_easyocr_output(fut.result(timeout=remaining_budget()),
+                                                     min_token_conf=thresholds["loose_token_conf"],
+                                                     min_conf=thresholds["min_conf"],
+                                                     min_corpus=thresholds["min_corpus"])
                 step_runtime = time.perf_counter() - start
                 backup_result.update({"backup_triggered": True})
                 status = "success" if backup_result.get("text") else "fail"
                 record_step(3, backup_result, "Phase2 Case 3: EasyOCR full-image (looser thresholds)", "easyocr-full-loose", step_runtime, status)
-                update_best(3, backup_result)
+                update_best(3, backup_result, "easyocr-full-loose")
             except concurrent.futures.TimeoutError:
                 step_runtime = time.perf_counter() - start
                 placeholder = {"text": "", "confidence": 0.0, "reliable": False, "backup_triggered": True}
                 record_step(3, placeholder, "Phase2 Case 3: EasyOCR full-image (looser thresholds, timeout)", "easyocr-full-loose", step_runtime, "timeout")
                 case_log["case_triggered"] = case_log["best_case"] if case_log["best_case"] else 3
-                case_log["final_result"] = best_result_overall if best_result_overall else placeholder
+                set_final_best(placeholder, "easyocr-full-loose")
                 case_log["total_runtime"] = round(budget, 3)
                 return case_log
 
         # Finalize within budget
         case_log["case_triggered"] = case_log["best_case"]
-        case_log["final_result"] = best_result_overall if best_result_overall else (
-            case_log["steps"][-1]["result"] if case_log["steps"] else {"text": "", "confidence": 0.0, "reliable": False}
-        )
+        if best_result_overall:
+            set_final(best_result_overall, best_engine)
+        elif case_log["steps"]:
+            last = case_log["steps"][-1]["result"]
+            set_final(last, last["engine"])
+        else:
+            set_final({"text": "", "confidence": 0.0, "reliable": False}, "default")
         runtime = elapsed()
         case_log["total_runtime"] = round(runtime if runtime <= budget else budget, 3)
         return case_log
@@ -146,16 +208,23 @@ def run_phase2_conditional(cv_img, pil_img, models, east_result,
             exec_ctx.shutdown(wait=False)
 
 def print_phase2_log(case_log):
+    if not logger.isEnabledFor(logging.INFO):
+        return
     for step in case_log["steps"]:
         case = step["case"]
         status = step["status"]
         result = step["result"]
-        print(f"📍 Case {case}: {result['path']} → {status.upper()}")
+        logger.info("📍 Case %s: %s → %s", case, result["path"], status.upper())
         if result.get("text"):
-            print(f"   Text: '{result['text']}' (conf={normalize_conf(result.get('confidence'))})")
+            logger.info("   Text: '%s' (conf=%s)", result["text"], normalize_conf(result.get("confidence")))
+        stats = result.get("region_stats")
+        if stats:
+            logger.info("   Regions: %s reused, %s recognized", stats["reused"], stats["recognized"])
 
     final = case_log["final_result"]
-    print(f"🔎 Final OCR result (Case {case_log['case_triggered']}): "
-          f"{final.get('text','')} (conf={normalize_conf(final.get('confidence'))})")
-    print(f"⏱️ Phase 2 runtime: {case_log['total_runtime']}s")
+    logger.info("🔎 Final OCR result (Case %s): %s (conf=%s)",
+                case_log["case_triggered"], final.get("text", ""), normalize_conf(final.get("confidence")))
+    logger.info("⏱️ Phase 2 runtime: %ss", case_log["total_runtime"])
+    if case_log.get("saved_seconds"):
+        logger.info("♻️ Reused raw engine output: saved %ss of inference", round(case_log["saved_seconds"], 3))
 
@@ -1,20 +1,41 @@
 # ocr_modules/pipeline_utils/pipeline.py
 
 import time
-import traceback
+import queue
+import threading
+import logging
 from shared.helper import normalize_conf  # safe float caster
 from ocr_modules.pipeline_utils.phase1 import run_phase1_parallel, print_phase1_log
 from ocr_modules.pipeline_utils.phase2 import run_phase2_conditional, print_phase2_log
 from ocr_modules.pipeline_utils.modes import get_mode_budget, enforce_mode
-
-def run_pipeline(cv_img, pil_img, models, executor, mode="steady"):
+from ocr_modules.base_modules.ocr_engines import run_tesseract
+from ocr_modules.pipeline_utils.events import emit, timed_listener, WINNER, FINAL
+from ocr_modules.base_modules.reliability import decision_thresholds, passes_final
+from shared.log_utils import get_logger, traced
+
+logger = get_logger(__name__)
+
+def run_pipeline(cv_img, pil_img, models, executor, mode="steady", pad_interval=True, on_event=None,
+                 thresholds=None, east_result=None):
+    """
+    on_event(event_dict), if given, receives typed events (see events.py)
+    as each stage finishes, ending with a "final" event carrying the result.
+    thresholds: overrides for reliability.DECISION_THRESHOLDS (e.g. a
+    setting picked with testing/test_runners/threshold_whatif_test.py).
+    east_result: precomputed EAST detection for cv_img (skips phase 1's EAST).
+    """
 
     pipeline_start = time.perf_counter()
     mode_budget = get_mode_budget(mode)
+    thresholds = decision_thresholds(thresholds)
+    on_event = timed_listener(on_event, pipeline_start)
 
     try:
         # Phase 1 with mode-aware budget (pass models so workers reuse preloaded models)
-        phase1 = run_phase1_parallel(cv_img, pil_img, executor, budget=mode_budget, models=models)
+        with traced(logger, "phase1", mode=mode):
+            phase1 = run_phase1_parallel(cv_img, pil_img, executor, budget=mode_budget, models=models,
+                                         on_event=on_event, thresholds=thresholds,
+                                         east_result=east_result)
         print_phase1_log(phase1)
 
         # Defensive reads
@@ -27,52 +48,115 @@ def run_pipeline(cv_img, pil_img, models, executor, mode="steady"):
         tess_is_rel = bool(tess.get("isReliable", False))
         east_region_count = normalize_conf(east.get("region_count"), 0)
 
-        print(f"🔧 Phase1 debug: tess_conf={tess_conf}, tess_isReliable={tess_is_rel}, "
-              f"east_region_count={east_region_count}, elapsed={elapsed}, budget={mode_budget}")
+        logger.debug("🔧 Phase1 debug: tess_conf=%s, tess_isReliable=%s, east_region_count=%s, "
+                     "elapsed=%s, budget=%s", tess_conf, tess_is_rel, east_region_count, elapsed, mode_budget)
 
         # Decide whether to stop or continue
+        saved_seconds = 0.0
         if tess_is_rel or elapsed >= mode_budget:
             final_result = tess
+            final_engine = "tesseract"
             case_triggered = "phase1"
         else:
             remaining_budget = max(0.5, mode_budget - elapsed)
-            race_log = run_phase2_conditional(
-                cv_img, pil_img, models, east, executor, budget=remaining_budget
-            )
+            with traced(logger, "phase2", mode=mode):
+                race_log = run_phase2_conditional(
+                    cv_img, pil_img, models, east, executor, budget=remaining_budget,
+                    on_event=on_event, thresholds=thresholds
+                )
             print_phase2_log(race_log)
             final_result = race_log.get("final_result") or {"text": "", "confidence": 0.0, "reliable": False}
+            final_engine = final_result.get("engine") or "default"
             case_triggered = f"phase2_case{race_log.get('case_triggered')}"
+            saved_seconds = race_log.get("saved_seconds", 0.0)
+
+        emit(on_event, WINNER,
+             engine=final_engine,
+             case_triggered=case_triggered,
+             text=final_result.get("text", ""),
+             confidence=normalize_conf(final_result.get("confidence")))
 
         # Apply reliability filter
         conf = normalize_conf(final_result.get("confidence"))
-        rel = bool(final_result.get("reliable", False))
-        if not rel or conf < 0.5:
+        if not passes_final(final_result, thresholds, region_count=east_region_count, engine=final_engine):
             final_result = {"text": "", "confidence": conf, "reliable": False}
 
         # Enforce mode timing
-        total_runtime = enforce_mode(mode, pipeline_start)
+        inference_runtime = round(time.perf_counter() - pipeline_start, 3)
+        total_runtime = enforce_mode(mode, pipeline_start, pad_interval=pad_interval)
 
-        return {
+        result = {
             "final_result": final_result,
             "case_triggered": case_triggered,
             "total_runtime": total_runtime,
-            "mode": mode
+            "inference_runtime": inference_runtime,
+            "mode": mode,
+            "engine_seconds_saved": round(saved_seconds, 3)
         }
+        emit(on_event, FINAL, result=result)
+        return result
 
 
     except Exception as e:
-        print(f"❌ Pipeline exception: {e}")
-        traceback.print_exc()
+        logger.error("❌ Pipeline exception: %s", e, exc_info=True)
         # Return a safe failure payload so the caller can keep going
-        return {
+        result = {
             "final_result": {"text": "", "confidence": 0.0, "reliable": False, "error": str(e)},
             "case_triggered": "exception",
             "total_runtime": round(time.perf_counter() - pipeline_start, 3),
             "mode": mode
         }
+        emit(on_event, FINAL, result=result)
+        return result
+
+
+def iter_pipeline_events(cv_img, pil_img, models, executor, mode="steady", pad_interval=False):
+    """
+    Generator form of run_pipeline: yields event dicts as they happen and
+    stops after the "final" event. The pipeline runs on its own thread so
+    the shared executor stays free for the engines.
+    """
+    events = queue.Queue()
+    thread = threading.Thread(
+        target=run_pipeline,
+        args=(cv_img, pil_img, models, executor),
+        kwargs={"mode": mode, "pad_interval": pad_interval, "on_event": events.put},
+        daemon=True,
+    )
+    thread.start()
+
+    while True:
+        event = events.get()
+        yield event
+        if event["type"] == FINAL:
+            return
+
+
+def run_tesseract_pass(pil_img, mode="fast"):
+    """
+    Cheapest per-frame pass: Tesseract only, no cascade and no reliability
+    filter. Meant to be fed into TemporalFusion, which decides what is stable.
+    """
+    start = time.perf_counter()
+    try:
+        tess = run_tesseract(pil_img)
+        case_triggered = "tesseract_pass"
+    except Exception as e:
+        logger.error("❌ Tesseract pass exception: %s", e)
+        tess = {"text": "", "confidence": 0.0, "reliable": False, "error": str(e)}
+        case_triggered = "exception"
+
+    return {
+        "final_result": tess,
+        "case_triggered": case_triggered,
+        "total_runtime": round(time.perf_counter() - start, 3),
+        "mode": mode
+    }
 
 
 def print_pipeline_log(pipeline_result):
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
     final = pipeline_result.get("final_result") or {}
     case_triggered = pipeline_result.get("case_triggered")
@@ -84,8 +168,10 @@ def print_pipeline_log(pipeline_result):
     rel = bool(final.get("reliable", False))
     err = final.get("error")
 
-    print("\n📊 Pipeline Summary")
-    print(f"🔎 Final OCR result ({case_triggered}): {text} (conf={conf}, reliable={rel})")
+    logger.info("\n📊 Pipeline Summary")
+    logger.info("🔎 Final OCR result (%s): %s (conf=%s, reliable=%s)", case_triggered, text, conf, rel,
+                extra={"case_triggered": case_triggered, "confidence": conf, "reliable": rel})
     if err:
-        print(f"⚠️ Error: {err}")
-    print(f"⏱️ Total pipeline runtime: {total_runtime}s (mode={mode})")
+        logger.info("⚠️ Error: %s", err)
+    logger.info("⏱️ Total pipeline runtime: %ss (mode=%s)", total_runtime, mode,
+                extra={"runtime": total_runtime, "mode": mode})
@@ -0,0 +1,230 @@
+# ocr_modules/pipeline_utils/process_pool.py
+
+import os
+import time
+import threading
+import concurrent.futures
+import multiprocessing
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ocr_modules.base_modules.initialization import initialize_models
+from ocr_modules.pipeline_utils.pipeline import run_pipeline
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# ------------------------------------------------------------
+# Worker-side state
+# ------------------------------------------------------------
+# With the "fork" start method the parent sets _WORKER_MODELS before the
+# pool spawns, so every worker inherits the already-loaded models
+# copy-on-write. With "spawn" (Windows/macOS) the initializer loads them.
+
+_WORKER_MODELS = None
+_WORKER_EXECUTOR = None
+
+
+def _init_worker(threads_per_worker=3):
+    global _WORKER_MODELS, _WORKER_EXECUTOR
+
+    # One OCR pipeline per process: keep native libraries from
+    # oversubscribing the cores the other workers are using.
+    cv2.setNumThreads(1)
+    try:
+        import torch
+        torch.set_num_threads(1)
+    except Exception:
+        pass
+
+    if _WORKER_MODELS is None:
+        _WORKER_MODELS = initialize_models()
+    _WORKER_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=threads_per_worker)
+
+
+def _run_shared_frame(shm_name, shape, dtype, mode, pad_interval=True):
+    """
+    Attach to the frame the parent placed in shared memory and run the
+    full pipeline on it. Only the block name/shape travel through pickle.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf).copy()
+    finally:
+        shm.close()
+
+    pil_img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    result = run_pipeline(frame, pil_img, _WORKER_MODELS, _WORKER_EXECUTOR, mode=mode,
+                          pad_interval=pad_interval)
+    result["worker_pid"] = os.getpid()
+    return result
+
+
+# ------------------------------------------------------------
+# Parent-side pool
+# ------------------------------------------------------------
+
+class ProcessOCRPool:
+    """
+    Process-pool execution mode for the OCR pipeline.
+    Handles:
+      - one pipeline per worker process (no shared GIL)
+      - models preloaded in the parent and shared via fork,
+        or loaded once per worker on spawn-only platforms
+      - frames handed over through multiprocessing.shared_memory
+      - all workers forked up front, while the caller is still single-threaded
+    """
+
+    def __init__(self, processes=None, models=None, threads_per_worker=3):
+        global _WORKER_MODELS
+
+        self.processes = processes or max(1, (os.cpu_count() or 2) - 1)
+        methods = multiprocessing.get_all_start_methods()
+        self.start_method = "fork" if "fork" in methods else "spawn"
+
+        if self.start_method == "fork":
+            # Load once here; forked workers see these pages copy-on-write.
+            _WORKER_MODELS = models if models is not None else initialize_models()
+            self.models = _WORKER_MODELS
+        else:
+            self.models = None
+
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_init_worker,
+            initargs=(threads_per_worker,),
+        )
+        if self.start_method == "fork":
+            # Fork every worker now, before the caller starts its decode /
+            # camera / voice threads: forking a multi-threaded process can
+            # leave a child blocked on a lock some other thread held
+            self.warmup()
+
+    def submit(self, frame, mode="steady", pad_interval=True):
+        """
+        Copy a cv2 frame into a fresh shared-memory block and queue it.
+        Returns a Future resolving to the run_pipeline result dict.
+        pad_interval=False skips the mode's min_interval sleep (batch work).
+        """
+        frame = np.ascontiguousarray(frame)
+        shm = shared_memory.SharedMemory(create=True, size=max(frame.nbytes, 1))
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[...] = frame
+
+        try:
+            future = self.executor.submit(
+                _run_shared_frame, shm.name, frame.shape, frame.dtype.str, mode, pad_interval
+            )
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+
+        def release(_):
+            shm.close()
+            shm.unlink()
+
+        future.add_done_callback(release)
+        return future
+
+    def run(self, frame, mode="steady", pad_interval=True):
+        return self.submit(frame, mode=mode, pad_interval=pad_interval).result()
+
+    def warmup(self):
+        """
+        Start every worker now instead of on first submit (with fork,
+        the first submit launches the whole pool).
+        """
+        blank = np.zeros((32, 32, 3), dtype=np.uint8)
+        futures = [self.submit(blank, mode="fast", pad_interval=False) for _ in range(self.processes)]
+        concurrent.futures.wait(futures)
+
+    def shutdown(self, wait=False):
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class ProcessPipeline:
+    """
+    Drop-in replacement for AsyncPipeline backed by a ProcessOCRPool.
+    Keeps up to one frame in flight per worker process.
+    """
+
+    def __init__(self, pool, mode="steady", cache=None):
+        self.pool = pool
+        self.mode = mode
+        self.cache = cache  # optional FrameResultCache
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+    def process_frame_async(self, cv_img, pil_img=None, callback=None):
+        mode = self.mode
+        if self.cache is not None:
+            hit = self.cache.lookup(cv_img, mode)
+            if hit is not None:
+                if callback:
+                    callback(hit)
+                return True
+
+        with self.lock:
+            if self.in_flight >= self.pool.processes:
+                return False  # Every worker busy
+            self.in_flight += 1
+
+        def done(future):
+            with self.lock:
+                self.in_flight -= 1
+            try:
+                result = future.result()
+                if self.cache is not None and result.get("case_triggered") != "exception":
+                    self.cache.store(cv_img, mode, result)
+                if callback:
+                    callback(result)
+            except Exception as e:
+                logger.error("❌ Pipeline error: %s", e)
+
+        # pil_img is rebuilt inside the worker from the shared frame
+        try:
+            future = self.pool.submit(cv_img, mode=mode)
+        except Exception:
+            # Broken or shut-down pool: give the slot back
+            with self.lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(done)
+        return True
+
+    def is_pipeline_ready(self):
+        with self.lock:
+            return self.in_flight < self.pool.processes
+
+
+def measure_scaling(frames, process_counts, mode="fast", rounds=1, models=None):
+    """
+    Throughput curve: frames/s for each process count.
+    Returns [{"processes": n, "frames": k, "seconds": s, "fps": f}, ...]
+    """
+    curve = []
+    for n in process_counts:
+        pool = ProcessOCRPool(processes=n, models=models)
+        models = pool.models  # reuse the parent copy for the next pool
+        try:
+            pool.warmup()
+            batch = list(frames) * rounds
+            start = time.perf_counter()
+            futures = [pool.submit(f, mode=mode, pad_interval=False) for f in batch]
+            concurrent.futures.wait(futures)
+            seconds = time.perf_counter() - start
+        finally:
+            pool.shutdown(wait=True)
+
+        curve.append({
+            "processes": n,
+            "frames": len(batch),
+            "seconds": round(seconds, 3),
+            "fps": round(len(batch) / seconds, 3) if seconds > 0 else 0.0,
+        })
+        logger.info("⚙️ %s process(es): %s frames/s", n, curve[-1]["fps"])
+    return curve
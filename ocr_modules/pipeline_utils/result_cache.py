@@ -0,0 +1,193 @@
+# ocr_modules/pipeline_utils/result_cache.py
+
+import time
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def dhash(frame, hash_size=8):
+    """
+    Difference hash of a frame: downscale to (hash_size+1) x hash_size
+    grayscale and record whether each pixel is brighter than its right
+    neighbour. Returns a hash_size*hash_size-bit int.
+    """
+    small = cv2.resize(frame, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _inference_seconds(result):
+    """Pipeline time a reuse actually saves: total_runtime includes min_interval padding."""
+    seconds = result.get("inference_runtime")
+    if seconds is None:
+        seconds = result.get("total_runtime")
+    return seconds or 0.0
+
+
+class _Flight:
+    """A computation in progress that identical requests can wait on."""
+
+    def __init__(self, frame_hash, mode):
+        self.frame_hash = frame_hash
+        self.mode = mode
+        self.done = threading.Event()
+        self.result = None
+
+
+class FrameResultCache:
+    """
+    Perceptual-hash cache in front of run_pipeline.
+    Handles:
+      - dHash(frame) + mode keys, matched within a Hamming distance
+      - size-bounded LRU + TTL eviction
+      - single-flight: near-identical concurrent frames share one run
+      - hit / miss / coalesced / saved-seconds counters
+    """
+
+    def __init__(self, max_entries=32, ttl=30.0, max_distance=1, hash_size=16):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+
+        self.entries = OrderedDict()  # (hash, mode) -> (stored_at, result)
+        self.flights = []
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.saved_seconds = 0.0
+
+    # ------------------------------------------------------------
+    # Internal helpers (caller holds self.lock)
+    # ------------------------------------------------------------
+
+    def _evict_expired(self, now):
+        expired = [k for k, (stored_at, _) in self.entries.items() if now - stored_at > self.ttl]
+        for k in expired:
+            del self.entries[k]
+
+    def _find(self, frame_hash, mode):
+        best_key, best_dist = None, self.max_distance + 1
+        for key in self.entries:
+            if key[1] != mode:
+                continue
+            dist = hamming(key[0], frame_hash)
+            if dist < best_dist:
+                best_key, best_dist = key, dist
+                if dist == 0:
+                    break
+        return best_key
+
+    def _find_flight(self, frame_hash, mode):
+        for flight in self.flights:
+            if flight.mode == mode and hamming(flight.frame_hash, frame_hash) <= self.max_distance:
+                return flight
+        return None
+
+    def _hit(self, frame_hash, mode):
+        self._evict_expired(time.monotonic())
+        key = self._find(frame_hash, mode)
+        if key is None:
+            return None
+        self.entries.move_to_end(key)
+        result = self.entries[key][1]
+        self.hits += 1
+        self.saved_seconds += _inference_seconds(result)
+        return self._as_hit(result)
+
+    def _store(self, frame_hash, mode, result):
+        key = (frame_hash, mode)
+        self.entries[key] = (time.monotonic(), result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def _as_hit(result):
+        hit = dict(result)
+        hit["cache_hit"] = True
+        return hit
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+
+    def lookup(self, frame, mode):
+        """Return a cached result for a near-identical frame, or None."""
+        frame_hash = dhash(frame, self.hash_size)
+        with self.lock:
+            return self._hit(frame_hash, mode)
+
+    def store(self, frame, mode, result):
+        frame_hash = dhash(frame, self.hash_size)
+        with self.lock:
+            self._store(frame_hash, mode, result)
+
+    def get_or_compute(self, frame, mode, compute):
+        """
+        Return a cached result for this frame, or run compute() once.
+        Concurrent callers with near-identical frames wait for the same run.
+        """
+        frame_hash = dhash(frame, self.hash_size)
+
+        with self.lock:
+            hit = self._hit(frame_hash, mode)
+            if hit is not None:
+                return hit
+
+            flight = self._find_flight(frame_hash, mode)
+            leader = flight is None
+            if leader:
+                flight = _Flight(frame_hash, mode)
+                self.flights.append(flight)
+                self.misses += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.result is None:
+                # Leader failed; run our own
+                return compute()
+            with self.lock:
+                self.coalesced += 1
+                self.saved_seconds += _inference_seconds(flight.result)
+            return self._as_hit(flight.result)
+
+        try:
+            result = compute()
+            # Never cache or share failures; waiters and the next frame retry
+            if result.get("case_triggered") != "exception":
+                with self.lock:
+                    self._store(frame_hash, mode, result)
+                flight.result = result
+            return result
+        finally:
+            with self.lock:
+                self.flights.remove(flight)
+            flight.done.set()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / total, 3) if total else 0.0,
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
@@ -0,0 +1,255 @@
+# ocr_modules/pipeline_utils/temporal_fusion.py
+
+import time
+import difflib
+import threading
+from collections import Counter
+
+from shared.helper import normalize_conf
+from ocr_modules.base_modules.corpus_score import corpus_score
+
+
+def box_iou(a, b):
+    """IoU of two [x1, y1, x2, y2] boxes."""
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    if inter == 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area_a + area_b - inter)
+
+
+def observations_from_result(result):
+    """
+    Turn a run_pipeline-style result into [(box or None, text, confidence)].
+    Uses per-line boxes when the engine reported them, else one
+    full-frame observation.
+    """
+    final = result.get("final_result") or {}
+    lines = final.get("lines") or []
+    obs = [
+        (line.get("box"), line.get("text", ""), normalize_conf(line.get("confidence")))
+        for line in lines
+        if (line.get("text") or "").strip()
+    ]
+    if obs:
+        return obs
+
+    text = (final.get("text") or "").strip()
+    if text:
+        return [(None, text, normalize_conf(final.get("confidence")))]
+    return []
+
+
+class _Track:
+    """One tracked text region: smoothed box + per-word-slot votes."""
+
+    def __init__(self, box, now):
+        self.box = box
+        self.slots = []          # [Counter(word -> weight)]
+        self.total = 0.0         # decayed weight of all observations
+        self.frames = 0
+        self.first_seen = now
+        self.last_seen = now
+        self.stable_text = ""
+        self.share = 0.0
+        self.converged_at = None
+        self.frames_to_converge = None
+
+    def consensus_words(self):
+        return [slot.most_common(1)[0][0] for slot in self.slots]
+
+    def decay(self, factor):
+        self.total *= factor
+        for slot in self.slots:
+            for word in slot:
+                slot[word] *= factor
+
+    def vote(self, words, weight):
+        """
+        Align `words` against the current consensus and add weighted votes.
+        Slots missing from this observation get no vote, so their share of
+        self.total drops; unmatched new words open new slots.
+        """
+        current = [w.lower() for w in self.consensus_words()]
+        incoming = [w.lower() for w in words]
+        matcher = difflib.SequenceMatcher(None, current, incoming, autojunk=False)
+
+        merged = []
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal" or op == "replace":
+                n = max(i2 - i1, j2 - j1)
+                for k in range(n):
+                    slot = self.slots[i1 + k] if i1 + k < i2 else Counter()
+                    if j1 + k < j2:
+                        slot[words[j1 + k]] += weight
+                    merged.append(slot)
+            elif op == "delete":
+                merged.extend(self.slots[i1:i2])
+            elif op == "insert":
+                merged.extend(Counter({w: weight}) for w in words[j1:j2])
+
+        self.slots = merged
+        self.total += weight
+        self.frames += 1
+
+    def evaluate(self, consensus, min_frames):
+        """
+        Return (text, share) when every slot agrees strongly enough, where a
+        slot either holds a word (top vote >= consensus) or is absent
+        (combined word votes <= 1 - consensus). Otherwise (None, share).
+        """
+        if self.frames < min_frames or self.total <= 0:
+            return None, 0.0
+
+        words, shares = [], []
+        for slot in self.slots:
+            word, top = slot.most_common(1)[0]
+            present = sum(slot.values()) / self.total
+            top_share = top / self.total
+            if top_share >= consensus:
+                words.append(word)
+                shares.append(top_share)
+            elif present <= 1.0 - consensus:
+                shares.append(1.0 - present)
+            else:
+                return None, min(shares + [top_share])
+
+        if not words:
+            return None, 0.0
+        return " ".join(words), min(shares)
+
+
+class TemporalFusion:
+    """
+    Multi-frame text fusion for live OCR.
+    Handles:
+      - tracking text regions across frames by box IoU
+      - aligning each region's word sequence against its running consensus
+      - confidence-weighted word votes with exponential decay
+      - emitting a stabilized reading once votes reach consensus
+      - time / frames-to-convergence stats per region
+    """
+
+    def __init__(self, iou_threshold=0.3, consensus=0.6, min_frames=3, decay=0.85, max_age=3.0):
+        """
+        iou_threshold: min box IoU for an observation to join an existing track
+        consensus: min decayed vote share for a word (or its absence) to be stable
+        min_frames: observations a track needs before it can be stable
+        decay: per-observation weight decay, so scene changes take over
+        max_age: seconds a track survives without being observed
+        """
+        self.iou_threshold = iou_threshold
+        self.consensus = consensus
+        self.min_frames = min_frames
+        self.decay = decay
+        self.max_age = max_age
+
+        self.tracks = []
+        self.lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # Internal helpers (caller holds self.lock)
+    # ------------------------------------------------------------
+
+    def _match(self, box, used):
+        best, best_iou = None, self.iou_threshold
+        for track in self.tracks:
+            if id(track) in used:
+                continue
+            if box is None or track.box is None:
+                if box is None and track.box is None:
+                    return track
+                continue
+            iou = box_iou(box, track.box)
+            if iou >= best_iou:
+                best, best_iou = track, iou
+        return best
+
+    def _fused_final(self):
+        stable = [t for t in self.tracks if t.stable_text]
+        stable.sort(key=lambda t: (t.box[1], t.box[0]) if t.box else (-1, -1))
+        if not stable:
+            return None
+        text = " ".join(t.stable_text for t in stable)
+        return {
+            "text": text,
+            "confidence": round(min(t.share for t in stable), 2),
+            "corpus_score": corpus_score(text),
+            "reliable": True,
+            "fused": True,
+        }
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+
+    def update(self, observations, now=None):
+        """
+        Feed one frame's [(box or None, text, confidence)] observations.
+        Returns the fused final_result dict, or None if nothing is stable yet.
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            self.tracks = [t for t in self.tracks if now - t.last_seen <= self.max_age]
+
+            used = set()
+            for box, text, conf in observations:
+                words = text.split()
+                if not words:
+                    continue
+                track = self._match(box, used)
+                if track is None:
+                    track = _Track(box, now)
+                    self.tracks.append(track)
+                elif box is not None:
+                    # Smooth the box so jitter does not break the IoU match
+                    track.box = [int(0.5 * a + 0.5 * b) for a, b in zip(track.box, box)]
+                used.add(id(track))
+
+                track.decay(self.decay)
+                track.vote(words, max(conf, 0.05))
+                track.last_seen = now
+
+                stable_text, track.share = track.evaluate(self.consensus, self.min_frames)
+                if stable_text is not None:
+                    track.stable_text = stable_text
+                    if track.converged_at is None:
+                        track.converged_at = now
+                        track.frames_to_converge = track.frames
+
+            return self._fused_final()
+
+    def apply(self, result, update=True, now=None):
+        """
+        Fuse a pipeline result in place of its per-frame reading.
+        The raw reading is kept under "frame_result"; until a region is
+        stable the final_result is empty so the HUD does not flicker.
+        """
+        fused = self.update(observations_from_result(result), now=now) if update else self.current()
+
+        result = dict(result)
+        result["frame_result"] = result.get("final_result")
+        result["final_result"] = fused or {"text": "", "confidence": 0.0, "reliable": False}
+        result["fusion"] = self.stats()
+        return result
+
+    def current(self):
+        with self.lock:
+            return self._fused_final()
+
+    def reset(self):
+        with self.lock:
+            self.tracks = []
+
+    def stats(self):
+        with self.lock:
+            converged = [t for t in self.tracks if t.converged_at is not None]
+            return {
+                "tracks": len(self.tracks),
+                "converged": len(converged),
+                "convergence_seconds": [round(t.converged_at - t.first_seen, 3) for t in converged],
+                "frames_to_converge": [t.frames_to_converge for t in converged],
+            }
@@ -0,0 +1,172 @@
+# ocr_modules/pipeline_utils/threshold_replay.py
+
+import time
+import itertools
+
+from shared.helper import normalize_conf  # safe float caster
+from ocr_modules.base_modules.parsers import parse_tesseract_output, parse_easyocr_output
+from ocr_modules.base_modules.preprocess import aggregate_guided_crops
+from ocr_modules.base_modules.reliability import (
+    decision_thresholds, accepts_phase1, accepts_phase2, passes_final
+)
+
+EMPTY_RESULT = {"text": "", "confidence": 0.0, "reliable": False}
+
+
+class ThresholdReplay:
+    """
+    Replays the run_pipeline stop/continue logic over recorded raw engine
+    outputs (see testing/test_runners/raw_output_recorder.py), no inference.
+    Handles:
+      - re-parsing recorded Tesseract / EasyOCR tokens at any threshold
+      - phase1 → phase2 case 1/2/3 decisions with the recorded timings and mode budget
+      - expected latency (inference time up to the deciding case) and acceptance rate
+      - memoized parses, so a grid costs milliseconds per configuration
+    """
+
+    def __init__(self, records, budget=5.0, max_crops=5):
+        self.records = records
+        self.budget = budget
+        self.max_crops = max_crops
+        self._parsed = {}
+
+    def _parse(self, index, engine, token_conf, thresholds):
+        key = (index, engine, token_conf, thresholds["min_conf"], thresholds["min_corpus"])
+        if key in self._parsed:
+            return self._parsed[key]
+
+        record = self.records[index]
+        kwargs = {"min_conf": thresholds["min_conf"], "min_corpus": thresholds["min_corpus"]}
+        if engine == "tesseract":
+            result = parse_tesseract_output(record["tesseract"]["raw"], **kwargs)
+        elif engine == "easyocr-guided":
+            # Same helper as run_easyocr_guided, with crops replaced by their raw tokens
+            result = aggregate_guided_crops(
+                record["guided"]["crops"],
+                parse_easyocr_output,
+                conf_threshold=thresholds["min_conf"],
+                min_token_conf=token_conf,
+            )
+        else:
+            result = parse_easyocr_output(record["full"]["raw"], min_token_conf=token_conf, **kwargs)
+
+        self._parsed[key] = result
+        return result
+
+    def replay(self, index, thresholds):
+        """
+        One recorded image through the decision logic.
+        Returns {"case", "engine", "latency", "accepted", "text", "confidence"}.
+        """
+        record = self.records[index]
+        east_count = normalize_conf(record["east"].get("region_count"), 0)
+
+        # Phase 1: EAST and Tesseract run in parallel
+        tess = self._parse(index, "tesseract", None, thresholds)
+        elapsed = max(record["east"]["seconds"], record["tesseract"]["seconds"])
+        if accepts_phase1(tess, thresholds, region_count=east_count) or elapsed >= self.budget:
+            return self._outcome("phase1", elapsed, tess, thresholds, "tesseract", east_count)
+
+        phase2_budget = max(0.5, self.budget - elapsed)
+        spent, best, best_case, best_engine = 0.0, None, None, None
+
+        def consider(case, engine, result):
+            nonlocal best, best_case, best_engine
+            if best is None or normalize_conf(result.get("confidence")) > normalize_conf(best.get("confidence")):
+                best, best_case, best_engine = result, case, engine
+
+        # Case 1: guided EasyOCR (only when EAST found a few regions)
+        if 0 < east_count < self.max_crops and record.get("guided"):
+            seconds = record["guided"]["seconds"]
+            if seconds > phase2_budget:
+                return self._outcome("phase2_case1", elapsed + phase2_budget, EMPTY_RESULT, thresholds,
+                                     "easyocr-guided", east_count)
+            spent += seconds
+            result = self._parse(index, "easyocr-guided", thresholds["token_conf"], thresholds)
+            consider(1, "easyocr-guided", result)
+            if accepts_phase2(result, thresholds, region_count=east_count, engine="easyocr-guided"):
+                return self._outcome("phase2_case1", elapsed + spent, result, thresholds,
+                                     "easyocr-guided", east_count)
+
+        # Case 2: full-image EasyOCR
+        if phase2_budget - spent > 0.0:
+            seconds = record["full"]["seconds"]
+            if seconds > phase2_budget - spent:
+                case = f"phase2_case{best_case or 2}"
+                return self._outcome(case, elapsed + phase2_budget, best or EMPTY_RESULT, thresholds,
+                                     best_engine, east_count)
+            spent += seconds
+            result = self._parse(index, "easyocr-full", thresholds["token_conf"], thresholds)
+            consider(2, "easyocr-full", result)
+            if accepts_phase2(result, thresholds, region_count=east_count, engine="easyocr-full"):
+                return self._outcome("phase2_case2", elapsed + spent, result, thresholds,
+                                     "easyocr-full", east_count)
+
+            # Case 3: re-filter case 2's raw tokens (no extra inference)
+            loose = self._parse(index, "easyocr-full", thresholds["loose_token_conf"], thresholds)
+            consider(3, "easyocr-full-loose", loose)
+
+        case = f"phase2_case{best_case}" if best_case else "phase2_caseNone"
+        return self._outcome(case, elapsed + spent, best or EMPTY_RESULT, thresholds,
+                             best_engine, east_count)
+
+    def candidates(self, index, overrides=None):
+        """
+        Every reading the cascade could produce for one record, as
+        [(engine, result)] — the rows ReliabilityModel is fitted on.
+        """
+        thresholds = decision_thresholds(overrides)
+        record = self.records[index]
+        east_count = normalize_conf(record["east"].get("region_count"), 0)
+        rows = [("tesseract", self._parse(index, "tesseract", None, thresholds))]
+        if 0 < east_count < self.max_crops and record.get("guided"):
+            rows.append(("easyocr-guided", self._parse(index, "easyocr-guided", thresholds["token_conf"], thresholds)))
+        rows.append(("easyocr-full", self._parse(index, "easyocr-full", thresholds["token_conf"], thresholds)))
+        rows.append(("easyocr-full-loose", self._parse(index, "easyocr-full", thresholds["loose_token_conf"], thresholds)))
+        return rows
+
+    @staticmethod
+    def _outcome(case, latency, result, thresholds, engine, region_count):
+        accepted = passes_final(result, thresholds, region_count=region_count, engine=engine)
+        return {
+            "case": case,
+            "engine": engine,
+            "latency": round(latency, 3),
+            "accepted": accepted,
+            "text": result.get("text", "") if accepted else "",
+            "confidence": normalize_conf(result.get("confidence")),
+        }
+
+    def evaluate(self, overrides=None):
+        """Replay every record under one threshold setting and summarize."""
+        thresholds = decision_thresholds(overrides)
+        start = time.perf_counter()
+        outcomes = [self.replay(i, thresholds) for i in range(len(self.records))]
+        replay_ms = (time.perf_counter() - start) * 1000
+
+        n = max(len(outcomes), 1)
+        latencies = sorted(o["latency"] for o in outcomes)
+        cases = {}
+        for o in outcomes:
+            cases[o["case"]] = cases.get(o["case"], 0) + 1
+
+        return {
+            "thresholds": thresholds,
+            "acceptance_rate": round(sum(o["accepted"] for o in outcomes) / n, 3),
+            "mean_latency": round(sum(latencies) / n, 3),
+            "p90_latency": latencies[int(0.9 * (len(latencies) - 1))] if latencies else 0.0,
+            "cases": cases,
+            "replay_ms": round(replay_ms, 2),
+            "outcomes": outcomes,
+        }
+
+    def sweep(self, grid):
+        """
+        Evaluate every combination of a {threshold: [values]} grid.
+        Returns one evaluate() summary per setting, in grid order.
+        """
+        keys = list(grid)
+        return [
+            self.evaluate(dict(zip(keys, values)))
+            for values in itertools.product(*(grid[k] for k in keys))
+        ]
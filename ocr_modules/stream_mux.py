@@ -0,0 +1,237 @@
+# ocr_modules/stream_mux.py
+
+import time
+import threading
+import concurrent.futures
+
+import cv2
+from PIL import Image
+
+from ocr_modules.camera_source import CameraSource
+from ocr_modules.pipeline_utils.pipeline import run_pipeline
+from ocr_modules.pipeline_utils.modes import MODES
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class _StreamSlot:
+    """Per-stream capture state, schedule and counters."""
+
+    def __init__(self, stream_id, camera, mode, weight, min_interval):
+        self.stream_id = stream_id
+        self.camera = camera
+        self.mode = mode
+        self.weight = max(1, int(weight))
+        self.min_interval = min_interval
+
+        self.frame = None
+        self.frame_seq = 0
+        self.submitted_seq = 0
+        self.last_ocr_time = 0.0
+        self.busy = False
+        self.current_weight = 0  # smooth weighted round-robin credit
+
+        self.result = None
+        self.captured = 0
+        self.processed = 0
+        self.dropped = 0   # due frames superseded while waiting for a worker
+        self.errors = 0
+
+    def interval(self):
+        if self.min_interval is not None:
+            return self.min_interval
+        return MODES.get(self.mode, MODES["steady"])["min_interval"]
+
+    def is_due(self, now):
+        return (
+            not self.busy
+            and self.frame is not None
+            and self.frame_seq > self.submitted_seq
+            and now - self.last_ocr_time >= self.interval()
+        )
+
+
+class StreamMultiplexer:
+    """
+    Multi-camera scheduler sharing one model set.
+    Handles:
+      - one capture thread per CameraSource (latest frame only)
+      - fair weighted round-robin across due streams
+      - per-stream mode and OCR rate
+      - frame-drop accounting
+      - per-stream callback(stream_id, result) dispatch
+    """
+
+    def __init__(self, models, executor, max_concurrent=1, callback=None):
+        self.models = models
+        self.executor = executor
+        self.max_concurrent = max_concurrent
+        self.callback = callback
+
+        self.streams = {}
+        self.lock = threading.Lock()
+        self.workers = concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent)
+        self.in_flight = 0
+        self._running = False
+        self._threads = []
+
+    # ------------------------------------------------------------
+    # Stream management
+    # ------------------------------------------------------------
+
+    def add_stream(self, stream_id, source, mode="steady", weight=1, min_interval=None):
+        """
+        source: webcam index, URL, or an already-open CameraSource
+        min_interval: seconds between OCR runs (defaults to the mode's)
+        """
+        camera = source if isinstance(source, CameraSource) else CameraSource(source)
+        slot = _StreamSlot(stream_id, camera, mode, weight, min_interval)
+        with self.lock:
+            self.streams[stream_id] = slot
+        if self._running:
+            self._start_capture(slot)
+        return slot
+
+    def set_mode(self, stream_id, mode):
+        with self.lock:
+            self.streams[stream_id].mode = mode
+
+    def stream_ids(self):
+        with self.lock:
+            return list(self.streams)
+
+    # ------------------------------------------------------------
+    # Threads
+    # ------------------------------------------------------------
+
+    def _start_capture(self, slot):
+        t = threading.Thread(target=self._capture_loop, args=(slot,),
+                             name=f"Capture-{slot.stream_id}", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def _capture_loop(self, slot):
+        while self._running:
+            frame = slot.camera.read()
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            with self.lock:
+                # The stream wanted OCR but its last frame never got a worker
+                if slot.is_due(time.time()):
+                    slot.dropped += 1
+                slot.frame = frame
+                slot.frame_seq += 1
+                slot.captured += 1
+
+    def _pick_next(self, now):
+        """
+        Smooth weighted round-robin (nginx style) over due streams.
+        Caller holds self.lock.
+        """
+        due = [s for s in self.streams.values() if s.is_due(now)]
+        if not due:
+            return None
+        total = sum(s.weight for s in due)
+        for s in due:
+            s.current_weight += s.weight
+        best = max(due, key=lambda s: s.current_weight)
+        best.current_weight -= total
+        return best
+
+    def _schedule_loop(self):
+        while self._running:
+            now = time.time()
+            with self.lock:
+                slot = None
+                if self.in_flight < self.max_concurrent:
+                    slot = self._pick_next(now)
+                if slot is not None:
+                    frame = slot.frame
+                    slot.submitted_seq = slot.frame_seq
+                    slot.last_ocr_time = now
+                    slot.busy = True
+                    self.in_flight += 1
+
+            if slot is None:
+                time.sleep(0.005)
+                continue
+
+            self.workers.submit(self._run_stream, slot, frame)
+
+    def _run_stream(self, slot, frame):
+        try:
+            pil_img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            result = run_pipeline(frame, pil_img, self.models, self.executor,
+                                  mode=slot.mode, pad_interval=False)
+            result["stream_id"] = slot.stream_id
+            with self.lock:
+                slot.result = result
+                slot.processed += 1
+            if self.callback:
+                self.callback(slot.stream_id, result)
+        except Exception as e:
+            with self.lock:
+                slot.errors += 1
+            logger.error("❌ Stream %s OCR error: %s", slot.stream_id, e)
+        finally:
+            with self.lock:
+                slot.busy = False
+                self.in_flight -= 1
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        for slot in list(self.streams.values()):
+            self._start_capture(slot)
+        t = threading.Thread(target=self._schedule_loop, name="StreamScheduler", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def stop(self):
+        self._running = False
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads = []
+        self.workers.shutdown(wait=False)
+        for slot in self.streams.values():
+            slot.camera.release()
+
+    def latest_frame(self, stream_id):
+        with self.lock:
+            slot = self.streams.get(stream_id)
+            return slot.frame.copy() if slot is not None and slot.frame is not None else None
+
+    def frame_seq(self, stream_id):
+        """Capture counter of the stream's latest frame (0 = none yet)."""
+        with self.lock:
+            slot = self.streams.get(stream_id)
+            return slot.frame_seq if slot is not None else 0
+
+    def get_result(self, stream_id):
+        with self.lock:
+            slot = self.streams.get(stream_id)
+            return slot.result if slot is not None else None
+
+    def stats(self):
+        with self.lock:
+            return {
+                sid: {
+                    "mode": s.mode,
+                    "weight": s.weight,
+                    "captured": s.captured,
+                    "processed": s.processed,
+                    "dropped": s.dropped,
+                    "errors": s.errors,
+                    "busy": s.busy,
+                    "text": ((s.result or {}).get("final_result") or {}).get("text", ""),
+                    "confidence": ((s.result or {}).get("final_result") or {}).get("confidence", 0.0),
+                }
+                for sid, s in self.streams.items()
+            }
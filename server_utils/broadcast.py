@@ -0,0 +1,196 @@
+# server_utils/broadcast.py
+
+import time
+import queue
+import threading
+
+import cv2
+
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_QUALITY = 80
+MIN_QUALITY, MAX_QUALITY = 10, 95
+MIN_SCALE = 0.1
+KEEPALIVE_SECONDS = 1.0  # resend the cached JPEG this often on a static scene
+
+
+def stream_variant(quality=None, scale=None, default_quality=DEFAULT_QUALITY):
+    """Clamp client ?quality=&scale= into a (quality, scale) encoding key."""
+    try:
+        quality = int(quality) if quality is not None else default_quality
+    except (TypeError, ValueError):
+        quality = default_quality
+    try:
+        scale = float(scale) if scale is not None else 1.0
+    except (TypeError, ValueError):
+        scale = 1.0
+    return (
+        max(MIN_QUALITY, min(MAX_QUALITY, quality)),
+        round(max(MIN_SCALE, min(1.0, scale)), 2),
+    )
+
+
+def encode_variant(display, variant):
+    quality, scale = variant
+    if scale < 1.0:
+        display = cv2.resize(display, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    ret, jpeg = cv2.imencode('.jpg', display, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return jpeg.tobytes() if ret else None
+
+
+class BroadcastHub:
+    """
+    Encode-once fan-out of one rendered MJPEG stream to every viewer.
+    Handles:
+      - a single producer thread: render() → compose → cv2.imencode → publish bytes
+      - change-driven encoding: nothing is composed or encoded while the
+        render key (frame id + overlay content) stays the same
+      - output capped at fps; cached JPEG resent as a keepalive on static scenes
+      - one encode per (quality, scale) variant in use, whatever the viewer count
+      - per-client bounded queues; a slow client loses its oldest frame
+        instead of stalling the producer or the other clients
+      - producer runs only while someone is subscribed
+    """
+
+    def __init__(self, render, fps=15.0, queue_size=2, name="stream"):
+        """
+        render: () -> (key, compose) where compose() builds the BGR display
+        frame; key changes whenever the frame or overlay content does.
+        (None, None) when there is nothing to show yet.
+        fps: output cap (None = as fast as render() changes, polled every 5 ms)
+        """
+        self.render = render
+        self.fps = fps
+        self.queue_size = queue_size
+        self.name = name
+
+        self.lock = threading.Lock()
+        self._subscribers = {}  # queue -> {"variant", "dropped"}
+        self._thread = None
+
+        self._key = None
+        self._display = None
+        self._cache = {}        # variant -> JPEG bytes of the current key
+        self._last_sent = 0.0
+
+        self.frames_encoded = 0
+        self.frames_unchanged = 0
+
+    def subscribe(self, variant=(DEFAULT_QUALITY, 1.0)):
+        """New client queue of JPEG bytes; starts the producer if idle."""
+        client = queue.Queue(maxsize=self.queue_size)
+        with self.lock:
+            self._subscribers[client] = {"variant": variant, "dropped": 0}
+            cached = self._cache.get(variant)
+            if cached is not None:
+                # Static scene: show the current frame right away
+                client.put_nowait(cached)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"broadcast-{self.name}", daemon=True)
+                self._thread.start()
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self._subscribers.pop(client, None)
+
+    def _publish(self, jpegs):
+        """jpegs: {variant: bytes}; each client gets its variant's frame."""
+        with self.lock:
+            clients = [(client, info["variant"]) for client, info in self._subscribers.items()]
+        for client, variant in clients:
+            jpeg = jpegs.get(variant)
+            if jpeg is None:
+                continue
+            try:
+                client.put_nowait(jpeg)
+            except queue.Full:
+                # Drop the stale frame, keep the newest
+                try:
+                    client.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    client.put_nowait(jpeg)
+                except queue.Full:
+                    pass
+                with self.lock:
+                    if client in self._subscribers:
+                        self._subscribers[client]["dropped"] += 1
+
+    def _variants(self):
+        with self.lock:
+            return {info["variant"] for info in self._subscribers.values()}
+
+    def _encode(self, variants):
+        fresh = {}
+        for variant in variants:
+            jpeg = encode_variant(self._display, variant)
+            if jpeg is not None:
+                fresh[variant] = jpeg
+                self.frames_encoded += 1
+        with self.lock:
+            self._cache.update(fresh)
+        return fresh
+
+    def _tick(self):
+        key, compose = self.render()
+        if key is None:
+            return False
+
+        now = time.perf_counter()
+        variants = self._variants()
+        if key != self._key:
+            self._key = key
+            self._display = compose()
+            with self.lock:
+                self._cache = {}
+            fresh = self._encode(variants)
+        else:
+            self.frames_unchanged += 1
+            # Only variants a new client asked for since the last change
+            fresh = self._encode(variants - set(self._cache))
+            if now - self._last_sent >= KEEPALIVE_SECONDS:
+                with self.lock:
+                    fresh = {**self._cache, **fresh}
+
+        if fresh:
+            self._publish(fresh)
+            self._last_sent = now
+        return True
+
+    def _run(self):
+        # Uncapped still polls render() every 5 ms rather than spinning
+        interval = 1.0 / self.fps if self.fps else 0.005
+        while True:
+            with self.lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+
+            start = time.perf_counter()
+            try:
+                shown = self._tick()
+            except Exception as e:
+                logger.error("❌ Render error on %s: %s", self.name, e, exc_info=True)
+                shown = False
+
+            # Wait for the next frame slot (or a little, when there is nothing yet)
+            wait = interval if shown else max(interval, 0.01)
+            time.sleep(max(0.0, wait - (time.perf_counter() - start)))
+
+    def stats(self):
+        with self.lock:
+            variants = {}
+            for info in self._subscribers.values():
+                label = "q{}@{}".format(*info["variant"])
+                variants[label] = variants.get(label, 0) + 1
+            return {
+                "subscribers": len(self._subscribers),
+                "variants": variants,
+                "frames_encoded": self.frames_encoded,
+                "frames_unchanged": self.frames_unchanged,
+                "dropped": sorted(info["dropped"] for info in self._subscribers.values()),
+            }
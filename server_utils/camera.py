@@ -1,12 +1,15 @@
 import cv2
 import sys
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 def init_camera(source=0, width=1280, height=720):
 
     cap = cv2.VideoCapture(source)
 
     if not cap.isOpened():
-        print(f"❌ Could not open camera source: {source}")
+        logger.error("❌ Could not open camera source: %s", source)
         sys.exit(1)
 
     # Only set width/height if source is a local device index
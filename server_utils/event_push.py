@@ -0,0 +1,110 @@
+# server_utils/event_push.py
+
+import json
+import time
+import queue
+import threading
+
+from shared.json_utils import sanitize_for_json
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Event types pushed to /events clients
+OCR_DETECTION = "detection"   # EAST boxes of the frame being OCR'd
+OCR_RESULT = "ocr"            # final text, confidence, boxes, stage timings
+SUBTITLE = "subtitle"         # voice line (partial=True while still being spoken)
+
+
+class EventHub:
+    """
+    Fan-out of small JSON events (OCR results, subtitles) to WebSocket clients.
+    Handles:
+      - one json.dumps per event, whatever the client count
+      - per-client bounded queues; a slow client loses its oldest event
+      - latest event of each type replayed to clients as they connect
+    """
+
+    def __init__(self, queue_size=32):
+        self.queue_size = queue_size
+        self.lock = threading.Lock()
+        self._clients = set()
+        self._latest = {}  # event type -> serialized event
+        self.published = 0
+
+    def publish(self, event_type, **payload):
+        message = json.dumps(sanitize_for_json({"type": event_type, "ts": round(time.time(), 3), **payload}),
+                             default=str)
+        with self.lock:
+            self._latest[event_type] = message
+            clients = list(self._clients)
+            self.published += 1
+        for client in clients:
+            try:
+                client.put_nowait(message)
+            except queue.Full:
+                try:
+                    client.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    client.put_nowait(message)
+                except queue.Full:
+                    pass
+
+    def subscribe(self):
+        client = queue.Queue(maxsize=self.queue_size)
+        with self.lock:
+            for message in self._latest.values():
+                client.put_nowait(message)
+            self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self.lock:
+            self._clients.discard(client)
+
+    def stats(self):
+        with self.lock:
+            return {"clients": len(self._clients), "published": self.published}
+
+
+def start_event_server(hub, app_state, host="0.0.0.0", port=8081, path="/events"):
+    """
+    WebSocket server pushing hub events at ws://<host>:<port><path>, on its
+    own thread. Returns the server (call .shutdown()), or None when the
+    websockets package is unavailable or the port cannot be bound.
+    """
+    try:
+        from websockets.exceptions import ConnectionClosed
+        from websockets.protocol import State
+        from websockets.sync.server import serve
+    except ImportError:
+        logger.warning("⚠️ websockets not installed: OCR/subtitle push disabled")
+        return None
+
+    def handler(ws):
+        if ws.request.path != path:
+            ws.close(1008, "unknown path")
+            return
+        client = hub.subscribe()
+        try:
+            while app_state.is_running() and ws.state is State.OPEN:
+                try:
+                    message = client.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                ws.send(message)
+        except ConnectionClosed:
+            pass
+        finally:
+            hub.unsubscribe(client)
+
+    try:
+        server = serve(handler, host, port, compression=None)
+    except OSError as e:
+        logger.warning("⚠️ Event push unavailable, port %s: %s", port, e)
+        return None
+
+    threading.Thread(target=server.serve_forever, name="event-push", daemon=True).start()
+    return server
@@ -1,74 +1,33 @@
 # server_utils/http_server.py
+import json
+import time
 import threading
 import cv2
 import numpy as np
 import socket
 import concurrent.futures
+from urllib.parse import urlsplit, parse_qs
 from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
-from ocr_modules.base_modules.initialization import initialize_models
-from ocr_modules.base_modules.ocr_engines import run_east
-from ocr_modules.pipeline_utils.modes import get_mode_budget
-from ocr_modules.pipeline_utils.async_pipeline import AsyncPipeline
+from ocr_modules.pipeline_utils.frame_gate import FrameGate
+from ocr_modules.pipeline_utils.frame_selector import BestFrameSelector
+from ocr_modules.pipeline_utils.modes import MODES
 
 from .ui_templates import control_page
 from .camera import init_camera
-from .overlay import overlay_combined   # combined overlay
 from .state import AppState
-from .voice import VoiceRecognizer
-from .ocr_tasks import ocr_task
-from .stream_loop import run_stream_phased
+from .stream_loop import StreamRenderer, mux_renderer, serve_broadcast
+from .ocr_service import OCRService
+from .ocr_api import handle_ocr_post, handle_ocr_latest
+from .event_push import EventHub, start_event_server, SUBTITLE
+from .broadcast import BroadcastHub, stream_variant, DEFAULT_QUALITY
+from shared.frame_buffer import FrameBuffer
+from shared.log_utils import get_logger
 
-# -----------------------------
-# Global state and initialization
-# -----------------------------
-
-app_state = AppState()
-
-# Initialize models once
-models = initialize_models()
-_ = run_east(np.zeros((320, 320, 3), dtype=np.uint8))
-
-current_mode = "steady"
-mode_budget = get_mode_budget(current_mode)
-
-# Try phone MJPEG stream first, fall back to webcam if unavailable
-try:
-    cap = init_camera("http://149.61.230.251:8080/video")
-    print("📱 Using phone MJPEG stream")
-except SystemExit:
-    cap = init_camera(0)
-    print("💻 Falling back to laptop webcam")
-
-# Shared frame buffer (updated by capture thread)
-latest_frame_ref = {'frame': None}
-frame_lock = threading.Lock()
-
-# Thread pool for OCR (used by AsyncPipeline)
-executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
-
-# Async OCR pipeline instance
-async_pipeline = AsyncPipeline(models=models, executor=executor, mode=current_mode)
+logger = get_logger(__name__)
 
-# Voice recognizer
-voice = VoiceRecognizer(model_path="resources/vosk_model_small", samplerate=16000)
-voice.start(device=15) # Specify your audio input device index here
-
-# -----------------------------
-# Camera capture thread
-# -----------------------------
-
-def camera_loop(cap):
-    while app_state.is_running():
-        ret, frame = cap.read()
-        if not ret:
-            cv2.waitKey(1)
-            continue
-        with frame_lock:
-            latest_frame_ref['frame'] = frame
-
-# Start capture thread
-threading.Thread(target=camera_loop, args=(cap,), daemon=True).start()
+# The pipeline cannot run without these; the other readers only widen coverage
+REQUIRED_MODELS = ("pytesseract", "easyocr_en", "cv2_east")
 
 # -----------------------------
 # HTTP handler
@@ -78,60 +37,411 @@ class OCRHandler(BaseHTTPRequestHandler):
     def log_message(self, format, *args):
         return
 
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_variant(self, query):
+        """?quality=10..95&scale=0.1..1.0 for MJPEG streams."""
+        params = parse_qs(query)
+        return stream_variant(params.get("quality", [None])[0], params.get("scale", [None])[0],
+                              default_quality=self.server.app.jpeg_quality)
+
+    def handle_mode(self, params):
+        """GET /mode → current mode; /mode?mode=fast[&stream=<id>] switches it."""
+        app = self.server.app
+        mode = params.get("mode", [None])[0]
+        stream_id = params.get("stream", [None])[0]
+        if mode is not None and mode not in MODES:
+            self.send_json({"error": f"unknown mode: {mode}", "modes": list(MODES)}, status=400)
+            return
+
+        if stream_id is not None:
+            if app.mux is None or stream_id not in app.mux.stream_ids():
+                self.send_json({"error": f"unknown stream: {stream_id}"}, status=404)
+                return
+            if mode is not None:
+                app.mux.set_mode(stream_id, mode)
+                logger.info("🎚️ Stream %s mode: %s", stream_id, mode)
+            self.send_json({"stream": stream_id, "mode": app.mux.stats()[stream_id].get("mode"),
+                            "modes": list(MODES)})
+            return
+
+        if mode is not None:
+            app.state.set_mode(mode)
+            logger.info("🎚️ OCR mode: %s", mode)
+        self.send_json({**app.ocr_service.stats(), "modes": list(MODES)})
+
     def do_GET(self):
-        if self.path == "/":
+        app = self.server.app
+        url = urlsplit(self.path)
+        path = url.path
+
+        if path == "/":
             self.send_response(200)
             self.send_header("Content-type", "text/html")
             self.end_headers()
-            self.wfile.write(control_page(app_state.is_paused()).encode("utf-8"))
+            self.wfile.write(control_page(app.state.is_paused(), events_port=app.events_port).encode("utf-8"))
+
+        elif path == "/healthz":
+            # Process is up and serving; says nothing about the models
+            self.send_json({"status": "ok", "uptime": round(time.time() - app.started, 1)})
 
-        elif self.path == "/toggle":
-            paused = app_state.toggle_pause()
+        elif path == "/readyz":
+            ready = app.state.is_ready()
+            self.send_json({
+                "ready": ready,
+                "uptime": round(time.time() - app.started, 1),
+                "components": app.state.get_components(),
+                "ocr_api": app.batcher.stats() if app.batcher is not None else None,
+                "events": app.events.stats() if app.events_port else None,
+            }, status=200 if ready else 503)
+
+        elif path == "/toggle":
+            paused = app.state.toggle_pause()
             state = "paused" if paused else "running"
             self.send_response(303)
             self.send_header("Location", "/")
             self.end_headers()
-            print(f"🔁 OCR toggled: {state}")
+            logger.info("🔁 OCR toggled: %s", state)
 
-        elif self.path == "/quit":
-            app_state.stop_server()
+        elif path == "/quit":
+            app.state.stop_server()
             self.send_response(200)
             self.send_header("Content-type", "text/plain")
             self.end_headers()
             self.wfile.write(b"Server shutting down...")
             threading.Thread(target=self.server.shutdown, daemon=True).start()
 
-        elif self.path == "/stream":
-            run_stream_phased(self, app_state, frame_lock, latest_frame_ref,
-                            models, executor, current_mode, voice,
-                            capture_duration=5.0, ocr_duration=5.0)
+        elif path == "/mode":
+            self.handle_mode(parse_qs(url.query))
+
+        elif path == "/ocr/latest":
+            handle_ocr_latest(self, app)
+
+        elif path == "/stream":
+            if app.mux_factory is not None:
+                # The multiplexer owns the cameras: /stream is its first source
+                if app.mux is None:
+                    self.send_error(503, "Streams not ready")
+                    return
+                stream_id = app.mux.stream_ids()[0]
+                serve_broadcast(self, app.state, app.mux_hub(stream_id), self.stream_variant(url.query),
+                                label=f"stream {stream_id}")
+                return
+            # ?overlay=0: plain frames, text drawn by the page from /events
+            plain = parse_qs(url.query).get("overlay", ["1"])[0] == "0"
+            hub = app.plain_hub if plain else app.stream_hub
+            serve_broadcast(self, app.state, hub, self.stream_variant(url.query))
+
+        elif path == "/streams":
+            stats = app.mux.stats() if app.mux is not None else {}
+            for stream_id, hub in app.hub_stats().items():
+                stats.setdefault(stream_id, {})["broadcast"] = hub
+            self.send_json(stats)
+
+        elif path.startswith("/stream/"):
+            stream_id = path[len("/stream/"):]
+            if app.mux is None or stream_id not in app.mux.stream_ids():
+                self.send_error(404, "Unknown stream")
+                return
+            serve_broadcast(self, app.state, app.mux_hub(stream_id), self.stream_variant(url.query),
+                            label=f"stream {stream_id}")
+
+    def do_POST(self):
+        app = self.server.app
+        url = urlsplit(self.path)
+
+        if url.path == "/ocr":
+            handle_ocr_post(self, app, parse_qs(url.query))
+        else:
+            self.send_error(404, "Unknown endpoint")
+
+# -----------------------------
+# Server application
+# -----------------------------
+
+class OCRServerApp:
+    """
+    One OCR server instance: listening socket, shared state, background workers.
+    Handles:
+      - binding the port before anything slow happens (sub-second to listening)
+      - model loading + EAST warmup on a background thread, per model state for /readyz
+      - camera sources (first one that opens) and voice input taken from config
+      - OCR on its own service thread, decoupled from the stream handlers
+      - POST /ocr requests coalesced into micro-batches (MicroBatcher)
+      - OCR results and subtitles pushed as JSON over WebSocket (EventHub)
+      - optional multi-camera multiplexer, built once the models are warm; it then
+        owns the cameras (no single-camera capture / OCRService) and feeds /stream
+      - one BroadcastHub per stream: rendered and JPEG-encoded once for all
+        viewers, only when the picture changed, at most stream_fps
+    """
+
+    def __init__(self, config, mux_factory=None):
+        self.config = config
+        self.mux_factory = mux_factory
+        self.started = time.time()
+
+        self.state = AppState(mode=getattr(config, "OCR_MODE", "steady"))
+
+        # Filled in place by the warmup thread, so handlers holding it see the models
+        self.models = {}
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=getattr(config, "OCR_MAX_WORKERS", 3))
+
+        # Shared frame buffer (updated by capture thread)
+        self.frame_buffer = FrameBuffer()
+
+        # Pre-OCR gate (skip unchanged / blurry frames)
+        self.frame_gate = None
+        if getattr(config, "OCR_GATE_ENABLED", True):
+            self.frame_gate = FrameGate(
+                min_change=getattr(config, "GATE_MIN_CHANGE", 3.0),
+                min_sharpness=getattr(config, "GATE_MIN_SHARPNESS", 50.0),
+                min_brightness=getattr(config, "GATE_MIN_BRIGHTNESS", 35.0),
+                max_brightness=getattr(config, "GATE_MAX_BRIGHTNESS", 225.0),
+            )
+
+        # Scores frames in the capture thread so the OCR phase gets the sharpest one
+        self.frame_selector = BestFrameSelector(window=5.0)
+
+        self.cap = None
+        self.voice = None
+        self.mux = None
+        self.batcher = None  # POST /ocr, created once the models are warm
+
+        self.stream_fps = getattr(config, "STREAM_FPS", 15.0)
+        self.jpeg_quality = getattr(config, "STREAM_JPEG_QUALITY", DEFAULT_QUALITY)
+
+        # OCR results / subtitles for ws://<host>:<events_port>/events
+        self.events = EventHub()
+        self.event_server = None
+        self.events_port = None
+
+        # Capture/OCR cycle; handlers only read what it publishes to self.state
+        self.ocr_service = OCRService(self.state, self.frame_buffer, self.models, self.executor,
+                                      capture_duration=5.0, ocr_duration=5.0,
+                                      gate=self.frame_gate, selector=self.frame_selector,
+                                      events=self.events)
+
+        # /stream: one encoder, whatever the viewer count.
+        # self stands in for the voice recognizer (latest_lines) until it is up
+        self.stream_hub = BroadcastHub(
+            StreamRenderer(self.state, self.frame_buffer, self).render,
+            fps=self.stream_fps,
+            name="stream",
+        )
+        # /stream?overlay=0: re-encoded only when the camera frame changes
+        self.plain_hub = BroadcastHub(
+            StreamRenderer(self.state, self.frame_buffer, self, overlay=False).render,
+            fps=self.stream_fps,
+            name="stream-plain",
+        )
+        self._mux_hubs = {}
+        self._hub_lock = threading.Lock()
+
+        self.host = getattr(config, "SERVER_HOST", "0.0.0.0")
+        self.port = getattr(config, "SERVER_PORT", 8080)
+        self.server = ThreadingHTTPServer((self.host, self.port), OCRHandler)
+        self.server.app = self
+
+    def start(self):
+        """Start warmup, camera, OCR, voice and event push threads; the socket is already bound."""
+        events_port = getattr(self.config, "SERVER_EVENTS_PORT", self.port + 1)
+        if events_port:
+            self.event_server = start_event_server(self.events, self.state, self.host, events_port)
+            self.events_port = events_port if self.event_server is not None else None
+        threading.Thread(target=self._warmup, name="warmup", daemon=True).start()
+        if self.mux_factory is None:
+            threading.Thread(target=self._camera_loop, name="camera", daemon=True).start()
+            self.ocr_service.start()
+        else:
+            # The multiplexer opens every CAMERA_STREAMS source itself; a second
+            # capture of the same device here would fail or steal its frames
+            logger.info("🎥 Cameras handled by the stream multiplexer")
+        if getattr(self.config, "ENABLE_VOICE", False):
+            threading.Thread(target=self._start_voice, name="voice", daemon=True).start()
+        return self
+
+    # -----------------------------
+    # Background workers
+    # -----------------------------
+
+    def _warmup(self):
+        self.state.set_component("models", "loading")
+        start = time.perf_counter()
+        try:
+            # Heavy imports (EasyOCR / Paddle) happen here, not at server import
+            from ocr_modules.base_modules.initialization import initialize_models
+            from ocr_modules.base_modules.ocr_engines import run_east
+
+            def on_model(name, ok, load_time, error):
+                self.state.set_component(name, "ready" if ok else "failed",
+                                         load_time=load_time, error=error)
+
+            self.models.update(initialize_models(callback=on_model))
+            self.state.set_component("models", "ready", load_time=round(time.perf_counter() - start, 3))
+
+            # Dummy EAST pass on the loaded net
+            self.state.set_component("east_warmup", "loading")
+            east_start = time.perf_counter()
+            run_east(np.zeros((320, 320, 3), dtype=np.uint8), self.models)
+            self.state.set_component("east_warmup", "ready",
+                                     load_time=round(time.perf_counter() - east_start, 3))
+        except Exception as e:
+            logger.error("❌ Model warmup failed: %s", e, exc_info=True)
+            self.state.set_component("models", "failed", error=str(e))
+            return
+
+        diagnostics = self.models.get("diagnostics", {})
+        missing = [name for name in REQUIRED_MODELS if not diagnostics.get(name, {}).get("status")]
+        if missing:
+            logger.error("❌ Required models failed to load: %s", ", ".join(missing))
+            return
+
+        if self.mux_factory is not None:
+            self.mux = self.mux_factory(self.models, self.executor)
+
+        from ocr_modules.pipeline_utils.micro_batch import MicroBatcher
+        self.batcher = MicroBatcher(
+            self.models, self.executor,
+            window=getattr(self.config, "OCR_API_BATCH_WINDOW", 0.005),
+            max_batch=getattr(self.config, "OCR_API_MAX_BATCH", 8),
+            workers=getattr(self.config, "OCR_API_WORKERS", 4),
+        )
+
+        self.state.set_ready(True)
+        logger.info("✅ Models warm in %.1fs, OCR enabled", time.perf_counter() - start)
+
+    def _open_camera(self):
+        sources = getattr(self.config, "SERVER_CAMERA_SOURCES",
+                          [getattr(self.config, "CAMERA_SOURCE", 0)])
+        for source in sources:
+            self.state.set_component("camera", "loading", source=source)
+            try:
+                cap = init_camera(source)
+            except SystemExit:
+                logger.warning("⚠️ Camera source unavailable: %s", source)
+                continue
+            self.state.set_component("camera", "ready", source=source)
+            logger.info("📷 Using camera source: %s", source)
+            return cap
+        self.state.set_component("camera", "failed", error="no camera source could be opened")
+        return None
+
+    def _camera_loop(self):
+        self.cap = self._open_camera()
+        if self.cap is None:
+            return
+        while self.state.is_running():
+            ret, frame = self.cap.read()
+            if not ret:
+                cv2.waitKey(1)
+                continue
+            self.frame_buffer.push_frame(frame)
+            self.frame_selector.push(frame)
+
+    def _start_voice(self):
+        self.state.set_component("voice", "loading")
+        start = time.perf_counter()
+        try:
+            from .voice import VoiceRecognizer
+            voice = VoiceRecognizer(
+                model_path=str(getattr(self.config, "VOSK_MODEL_PATH", "resources/vosk_model_small")),
+                samplerate=getattr(self.config, "VOICE_SAMPLERATE", 16000),
+                on_text=lambda text, partial: self.events.publish(SUBTITLE, text=text, partial=partial),
+            )
+            voice.start(device=getattr(self.config, "VOICE_DEVICE", None))
+        except Exception as e:
+            logger.warning("⚠️ Voice recognition unavailable: %s", e)
+            self.state.set_component("voice", "failed", error=str(e))
+            return
+        self.voice = voice
+        self.state.set_component("voice", "ready", load_time=round(time.perf_counter() - start, 3))
+
+    def mux_hub(self, stream_id):
+        """Broadcast hub for one multiplexer source, created on first viewer."""
+        with self._hub_lock:
+            if stream_id not in self._mux_hubs:
+                self._mux_hubs[stream_id] = BroadcastHub(
+                    mux_renderer(self.mux, stream_id, self), fps=self.stream_fps, name=stream_id)
+            return self._mux_hubs[stream_id]
+
+    def hub_stats(self):
+        with self._hub_lock:
+            hubs = {"stream": self.stream_hub, "stream-plain": self.plain_hub, **self._mux_hubs}
+        return {name: hub.stats() for name, hub in hubs.items()}
+
+    def latest_lines(self, n=1):
+        """Voice subtitle lines, empty until (or unless) the recognizer is up."""
+        voice = self.voice
+        return voice.latest_lines(n=n) if voice is not None else []
+
+    # -----------------------------
+    # Serving
+    # -----------------------------
+
+    def serve_forever(self):
+        # Detect LAN IP
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.connect(("8.8.8.8", 80))
+            lan_ip = s.getsockname()[0]
+            s.close()
+        except Exception:
+            lan_ip = "Unavailable"
+
+        localhost_ip = "127.0.0.1"
+
+        logger.info("📡 OCR Live Runner server available at:")
+        logger.info("   http://%s:%s   (local only)", localhost_ip, self.port)
+        logger.info("   http://%s:%s   (LAN devices)", lan_ip, self.port)
+        if self.events_port:
+            logger.info("   ws://%s:%s/events   (OCR / subtitle push)", lan_ip, self.events_port)
+        logger.info("   /readyz reports model warmup (%.2fs to listening)", time.time() - self.started)
+
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        self.state.stop_server()
+        self.server.server_close()
+        self.ocr_service.stop()
+        if self.event_server is not None:
+            self.event_server.shutdown()
+        if self.batcher is not None:
+            self.batcher.stop()
+        if self.mux is not None:
+            self.mux.stop()
+        self.executor.shutdown(wait=True)
+        if self.cap is not None:
+            self.cap.release()
+        if self.voice is not None:
+            self.voice.stop()
+        logger.info("✅ Server closed")
+
+
+def create_app(config=None, mux_factory=None):
+    """
+    Build a server that is already listening and warming up in the background.
+    config: module/object with the app/config.py settings (default: app.config)
+    mux_factory: optional (models, executor) -> StreamMultiplexer; its sources
+    are served at /stream/<stream_id> and summarized at /streams.
+    """
+    if config is None:
+        from app import config
+    return OCRServerApp(config, mux_factory=mux_factory).start()
+
 
 # -----------------------------
 # Server runner
 # -----------------------------
 
-def run_server():
-    # Detect LAN IP
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        lan_ip = s.getsockname()[0]
-        s.close()
-    except Exception:
-        lan_ip = "Unavailable"
-
-    localhost_ip = "127.0.0.1"
-
-    print("📡 OCR Live Runner server available at:")
-    print(f"   http://{localhost_ip}:8080   (local only)")
-    print(f"   http://{lan_ip}:8080   (LAN devices)")
-
-    server = ThreadingHTTPServer(('0.0.0.0', 8080), OCRHandler)
-    try:
-        server.serve_forever()
-    finally:
-        app_state.stop_server()
-        executor.shutdown(wait=True)
-        cap.release()
-        voice.stop()
-        print("✅ Server closed")
+def run_server(config=None, mux_factory=None):
+    create_app(config, mux_factory=mux_factory).serve_forever()
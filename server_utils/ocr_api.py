@@ -0,0 +1,99 @@
+# server_utils/ocr_api.py
+
+import concurrent.futures
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import cv2
+import numpy as np
+
+from ocr_modules.pipeline_utils.modes import MODES, get_mode_budget
+from shared.json_utils import sanitize_for_json
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def decode_image_body(content_type, body):
+    """
+    Raw image bytes, or the first file / image part of a multipart/form-data
+    body, decoded to BGR. None when nothing decodable was sent.
+    """
+    if content_type.startswith("multipart/"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+        )
+        parts = [p for p in message.iter_parts()
+                 if p.get_filename() or p.get_content_maintype() == "image"]
+        if not parts:
+            return None
+        body = parts[0].get_payload(decode=True) or b""
+
+    data = np.frombuffer(body, dtype=np.uint8)
+    return cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+
+
+def request_timeout(mode, requested, config):
+    """Mode budget plus slack, capped (extended mode has no real budget)."""
+    timeout = get_mode_budget(mode) + getattr(config, "OCR_API_TIMEOUT_SLACK", 1.0)
+    timeout = min(timeout, getattr(config, "OCR_API_MAX_TIMEOUT", 60.0))
+    if requested is not None:
+        try:
+            timeout = min(timeout, max(0.1, float(requested)))
+        except ValueError:
+            pass
+    return round(timeout, 3)
+
+
+def handle_ocr_post(handler, app, params):
+    """POST /ocr[?mode=&timeout=]: image in, run_pipeline result + timings out (JSON)."""
+    if not app.state.is_ready() or app.batcher is None:
+        handler.send_json({"error": "models are still loading", "ready": False}, status=503)
+        return
+
+    length = handler.headers.get("Content-Length")
+    if length is None:
+        handler.send_json({"error": "Content-Length required"}, status=411)
+        return
+    length = int(length)
+    max_bytes = getattr(app.config, "OCR_API_MAX_BYTES", 20 * 1024 * 1024)
+    if length > max_bytes:
+        handler.send_json({"error": f"image larger than {max_bytes} bytes"}, status=413)
+        return
+
+    body = handler.rfile.read(length)
+    image = decode_image_body(handler.headers.get("Content-Type", ""), body)
+    if image is None:
+        handler.send_json({"error": "could not decode an image from the request body"}, status=400)
+        return
+
+    mode = params.get("mode", [app.state.get_mode()])[0]
+    if mode not in MODES:
+        handler.send_json({"error": f"unknown mode: {mode}", "modes": list(MODES)}, status=400)
+        return
+    timeout = request_timeout(mode, params.get("timeout", [None])[0], app.config)
+
+    future = app.batcher.submit(image, mode=mode)
+    try:
+        result = future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        # Still queued: never runs. Already running: finishes in the background
+        future.cancel()
+        handler.send_json({"error": "timeout", "timeout": timeout, "mode": mode}, status=504)
+        return
+    except Exception as e:
+        logger.error("❌ OCR request failed: %s", e, exc_info=True)
+        handler.send_json({"error": str(e)}, status=500)
+        return
+
+    handler.send_json(sanitize_for_json(result))
+
+
+def handle_ocr_latest(handler, app):
+    """GET /ocr/latest: newest result of the server's own camera OCR."""
+    result_id, result = app.state.get_latest_result()
+    handler.send_json({
+        "result_id": result_id,
+        "mode": app.state.get_mode(),
+        "result": sanitize_for_json(result) if result is not None else None,
+    })
@@ -0,0 +1,166 @@
+# server_utils/ocr_service.py
+
+import time
+import threading
+import concurrent.futures
+
+import cv2
+
+from .ocr_tasks import ocr_task
+from .event_push import OCR_DETECTION, OCR_RESULT
+from ocr_modules.pipeline_utils.events import DETECTION
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class OCRService:
+    """
+    Server-side OCR worker, decoupled from the HTTP handlers.
+    Handles:
+      - the capture/OCR phase cycle (best frame of each capture window is frozen)
+      - gate check, then one pipeline run per cycle on its own worker thread
+      - publishing phase, frozen frame and results into AppState / FrameBuffer
+      - mode switches at runtime (AppState.get_mode() is read per run)
+      - pushing detection boxes and final results to an EventHub as they happen
+    """
+
+    def __init__(self, app_state, frame_buffer, models, executor,
+                 capture_duration=5.0, ocr_duration=5.0, gate=None, selector=None,
+                 events=None):
+        self.app_state = app_state
+        self.frame_buffer = frame_buffer
+        self.models = models
+        self.executor = executor  # phase1/phase2 engine pool inside run_pipeline
+        self.capture_duration = capture_duration
+        self.ocr_duration = ocr_duration
+        self.gate = gate
+        self.selector = selector
+        self.events = events  # optional EventHub (WebSocket push)
+
+        # Own single worker: a pipeline run never waits behind its own engine tasks
+        self.worker = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr-service")
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.runs = 0
+        self.skipped = {"busy": 0, "unchanged": 0, "gated": 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="ocr-service", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.worker.shutdown(wait=False)
+
+    def _wait(self, seconds):
+        """Sleep that ends early on shutdown; False once stopping."""
+        return not self._stop.wait(seconds) and self.app_state.is_running()
+
+    def _best_frame(self, since):
+        frame = None
+        if self.selector is not None:
+            frame, _ = self.selector.best(since=since)
+        if frame is None:
+            frame_id, frame = self.frame_buffer.get_latest_with_id()
+            return frame, frame_id
+        return frame, None
+
+    def _run(self):
+        while self.app_state.is_running() and not self._stop.is_set():
+            phase_start = time.time()
+            self.app_state.set_phase("capture")
+            if not self._wait(self.capture_duration):
+                return
+
+            frame, frame_id = self._best_frame(phase_start)
+            if frame is None:
+                continue
+
+            self.app_state.set_phase("ocr", frame)
+            phase_end = time.time() + self.ocr_duration
+            self._ocr_phase(frame, frame_id, phase_end)
+            if not self._wait(max(0.0, phase_end - time.time())):
+                return
+
+    def _ocr_phase(self, frame, frame_id, phase_end):
+        """Gate (refreezing on blurry frames) and submit at most one run."""
+        # No OCR until the background warmup has loaded the models
+        if self.app_state.is_paused() or not self.app_state.is_ready():
+            return
+
+        future = self.app_state.get_future()
+        if future is not None and not future.done():
+            # Previous run still going: keep showing its predecessor's result
+            self.skipped["busy"] += 1
+            return
+
+        while self.gate is not None:
+            ok, reason, _ = self.gate.check(frame)
+            if reason == "unchanged":
+                # Same scene as last OCR: keep the previous result
+                self.skipped["unchanged"] += 1
+                return
+            if ok:
+                break
+            # Blurred / badly exposed: refreeze on the newest frame and retry
+            if time.time() >= phase_end or not self._wait(0.05):
+                self.skipped["gated"] += 1
+                return
+            frame_id, latest = self.frame_buffer.get_latest_with_id()
+            if latest is not None:
+                frame = latest
+                self.app_state.set_phase("ocr", frame)
+
+        mode = self.app_state.get_mode()
+        self.app_state.set_future(self.worker.submit(self._ocr, frame, frame_id, mode))
+
+    def _ocr(self, frame, frame_id, mode):
+        frame_size = [frame.shape[1], frame.shape[0]]
+        stages, boxes = [], []
+
+        def on_event(event):
+            if event["type"] == DETECTION:
+                boxes.extend(event.get("boxes") or [])
+                if self.events is not None:
+                    self.events.publish(OCR_DETECTION, boxes=boxes, frame_size=frame_size)
+            if event.get("runtime") is not None:
+                stages.append({"stage": event.get("engine", event["type"]), "runtime": event["runtime"]})
+
+        try:
+            pil_img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            result = ocr_task(frame, pil_img, self.models, self.executor, mode, on_event=on_event)
+        except Exception as e:
+            logger.error("❌ OCR error: %s", e, exc_info=True)
+            return None
+
+        final = result.get("final_result", {})
+        self.app_state.set_ocr_result(final.get("text", ""), final.get("confidence", 0.0), result)
+        self.frame_buffer.set_ocr_result(frame_id, result)  # None: best-of-window frame
+        self.runs += 1
+
+        if self.events is not None:
+            self.events.publish(
+                OCR_RESULT,
+                text=final.get("text", ""),
+                confidence=final.get("confidence", 0.0),
+                reliable=final.get("reliable", False),
+                boxes=boxes,
+                frame_size=frame_size,
+                case_triggered=result.get("case_triggered"),
+                mode=mode,
+                total_runtime=result.get("total_runtime"),
+                stages=stages,
+            )
+        return result
+
+    def stats(self):
+        future = self.app_state.get_future()
+        return {
+            "mode": self.app_state.get_mode(),
+            "running": future is not None and not future.done(),
+            "runs": self.runs,
+            "skipped": dict(self.skipped),
+        }
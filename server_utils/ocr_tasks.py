@@ -1,9 +1,9 @@
-from ocr_modules.pipeline_utils.pipeline import run_pipeline, print_pipeline_log
+def ocr_task(cv_img, pil_img, models, executor, mode, on_event=None):
+    """Run OCR pipeline and return its result (text/confidence in final_result)."""
+    # Imported on first use: the pipeline pulls in every OCR engine, and the
+    # HTTP server binds its port before those are loaded
+    from ocr_modules.pipeline_utils.pipeline import run_pipeline, print_pipeline_log
 
-def ocr_task(cv_img, pil_img, models, executor, mode):
-    """Run OCR pipeline and return text, confidence."""
-    result = run_pipeline(cv_img, pil_img, models, executor=executor, mode=mode)
-    text = result["final_result"].get("text", "")
-    conf = result["final_result"].get("confidence", 0.0)
+    result = run_pipeline(cv_img, pil_img, models, executor=executor, mode=mode, on_event=on_event)
     print_pipeline_log(result)
-    return text, conf
\ No newline at end of file
+    return result
@@ -2,12 +2,20 @@ import threading
 
 class AppState:
     """Thread-safe application state."""
-    def __init__(self):
+    def __init__(self, mode="steady"):
         self.ocr_paused = False
         self.server_running = True
         self.latest_text = ""
         self.latest_conf = 0.0
+        self.latest_result = None
+        self.result_id = 0
+        self.mode = mode
+        self.phase = "capture"
+        self.frozen_frame = None
+        self.frozen_id = 0
         self.future = None
+        self.ready = False
+        self.components = {}
         self.lock = threading.Lock()
 
     def toggle_pause(self):
@@ -16,17 +24,47 @@ class AppState:
             self.ocr_paused = not self.ocr_paused
         return self.ocr_paused
 
-    def set_ocr_result(self, text, conf):
-        """Update latest OCR result."""
+    def set_ocr_result(self, text, conf, result=None):
+        """Update latest OCR result (result: full run_pipeline output)."""
         with self.lock:
             self.latest_text = text
             self.latest_conf = conf
+            self.latest_result = result
+            self.result_id += 1
 
     def get_ocr_result(self):
         """Get latest OCR result."""
         with self.lock:
             return self.latest_text, self.latest_conf
 
+    def get_latest_result(self):
+        """Get (result_id, full pipeline result) of the latest OCR run."""
+        with self.lock:
+            return self.result_id, self.latest_result
+
+    def set_mode(self, mode):
+        """Switch OCR mode; applies from the next run."""
+        with self.lock:
+            self.mode = mode
+
+    def get_mode(self):
+        """Get current OCR mode."""
+        with self.lock:
+            return self.mode
+
+    def set_phase(self, phase, frame=None):
+        """Enter "capture" or "ocr" (with the frame being OCR'd)."""
+        with self.lock:
+            self.phase = phase
+            if frame is not None:
+                self.frozen_frame = frame
+                self.frozen_id += 1
+
+    def get_phase(self):
+        """Get (phase, frozen frame, frozen frame id)."""
+        with self.lock:
+            return self.phase, self.frozen_frame, self.frozen_id
+
     def is_paused(self):
         """Check if OCR is paused."""
         with self.lock:
@@ -42,6 +80,26 @@ class AppState:
         with self.lock:
             return self.future
 
+    def set_component(self, name, status, **info):
+        """Record warmup state of one model / device ("loading", "ready", "failed")."""
+        with self.lock:
+            self.components[name] = {"status": status, **info}
+
+    def get_components(self):
+        """Snapshot of every component's warmup state."""
+        with self.lock:
+            return {name: dict(info) for name, info in self.components.items()}
+
+    def set_ready(self, ready):
+        """Mark models loaded and warm (OCR may run)."""
+        with self.lock:
+            self.ready = ready
+
+    def is_ready(self):
+        """Check if models are loaded and warm."""
+        with self.lock:
+            return self.ready
+
     def stop_server(self):
         """Stop server."""
         with self.lock:
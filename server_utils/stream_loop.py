@@ -1,79 +1,92 @@
 # server_utils/stream_loop.py
-import cv2
+import queue
 from .overlay import overlay_combined
-from .ocr_tasks import ocr_task
+from shared.log_utils import get_logger
 
-import time
-import cv2
-from .overlay import overlay_combined
-from .ocr_tasks import ocr_task
+logger = get_logger(__name__)
 
-def run_stream_phased(self, app_state, frame_lock, latest_frame_ref,
-                      models, executor, current_mode, voice,
-                      capture_duration=3.0, ocr_duration=3.0):
-    boundary = "--frame"
-    self.send_response(200)
-    self.send_header('Content-type', f'multipart/x-mixed-replace; boundary={boundary}')
-    self.end_headers()
+BOUNDARY = "--frame"
 
-    phase = "capture"
-    phase_end = time.time() + capture_duration
-    frozen_frame = None
-    ocr_ran_this_phase = False
 
-    while app_state.is_running():
-        now = time.time()
-        if now >= phase_end:
-            if phase == "capture":
-                with frame_lock:
-                    frozen_frame = (latest_frame_ref['frame'].copy()
-                                    if latest_frame_ref['frame'] is not None else None)
-                ocr_ran_this_phase = False
-                phase = "ocr"
-                phase_end = now + ocr_duration
-            else:
-                phase = "capture"
-                phase_end = now + capture_duration
+class StreamRenderer:
+    """
+    /stream view, read-only over shared state (OCR runs in OCRService).
+    Handles:
+      - live frames during capture, the frozen frame while it is being OCR'd
+      - overlay of the latest OCR result and voice line (overlay=False: plain
+        frames, for pages that draw /events client-side)
+      - a render key (frame id + overlay content), so the hub only re-encodes
+        when something visible changed (the frozen OCR frame never does)
+    """
 
-        frame = None
-        if phase == "capture":
-            with frame_lock:
-                frame = (latest_frame_ref['frame'].copy()
-                         if latest_frame_ref['frame'] is not None else None)
-        else:
-            frame = frozen_frame.copy() if frozen_frame is not None else None
+    def __init__(self, app_state, frame_buffer, voice, overlay=True):
+        self.app_state = app_state
+        self.frame_buffer = frame_buffer
+        self.voice = voice
+        self.overlay = overlay
 
+    def render(self):
+        """(key, compose) for the hub, or (None, None) when there is nothing to show yet."""
+        phase, frame, frame_id = self.app_state.get_phase()
+        if phase != "ocr" or frame is None:
+            phase = "capture"
+            frame_id, frame = self.frame_buffer.get_latest_with_id()
         if frame is None:
-            cv2.waitKey(1)
-            continue
+            return None, None
+        if not self.overlay:
+            # Text changes never force a re-encode here
+            return (phase, frame_id), lambda: frame
 
-        if phase == "ocr" and not app_state.is_paused() and not ocr_ran_this_phase:
-            try:
-                pil_img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                text, conf = ocr_task(frame, pil_img, models, executor, current_mode)
-                app_state.set_ocr_result(text, conf)
-            except Exception as e:
-                print(f"❌ OCR error: {e}")
-            finally:
-                ocr_ran_this_phase = True
+        text, conf = self.app_state.get_ocr_result()
+        voice_lines = tuple(self.voice.latest_lines(n=1))
+        key = (phase, frame_id, text, conf, voice_lines)
+        return key, lambda: overlay_combined(frame, text, conf, list(voice_lines))
+
+
+def mux_renderer(mux, stream_id, voice):
+    """Render callable for one multiplexer source with its latest OCR result."""
+    def render():
+        seq = mux.frame_seq(stream_id)
+        if not seq:
+            return None, None
+        final = (mux.get_result(stream_id) or {}).get("final_result") or {}
+        text, conf = final.get("text", ""), final.get("confidence", 0.0)
+        voice_lines = tuple(voice.latest_lines(n=1))
 
-        text, conf = app_state.get_ocr_result()
-        voice_lines = voice.latest_lines(n=1)
-        display = overlay_combined(frame, text, conf, voice_lines)
+        def compose():
+            frame = mux.latest_frame(stream_id)
+            return overlay_combined(frame, text, conf, list(voice_lines))
 
-        ret, jpeg = cv2.imencode('.jpg', display)
-        if not ret:
-            continue
+        return (seq, text, conf, voice_lines), compose
+    return render
+
+
+def serve_broadcast(self, app_state, hub, variant, label="stream"):
+    """
+    MJPEG response fed from a BroadcastHub; encoding happens once in the hub.
+    variant: (jpeg quality, scale) from stream_variant()
+    """
+    self.send_response(200)
+    self.send_header('Content-type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+    self.end_headers()
+
+    client = hub.subscribe(variant)
+    try:
+        while app_state.is_running():
+            try:
+                jpeg = client.get(timeout=1.0)
+            except queue.Empty:
+                continue
 
-        try:
-            self.wfile.write(boundary.encode("utf-8") + b"\r\n")
+            self.wfile.write(BOUNDARY.encode("utf-8") + b"\r\n")
             header = (
                 f"Content-Type: image/jpeg\r\n"
                 f"Content-Length: {len(jpeg)}\r\n\r\n"
             ).encode("utf-8")
             self.wfile.write(header)
-            self.wfile.write(jpeg.tobytes())
+            self.wfile.write(jpeg)
             self.wfile.write(b'\r\n')
-        except (BrokenPipeError, ConnectionResetError):
-            print("🔌 Client disconnected")
-            return
+    except (BrokenPipeError, ConnectionResetError):
+        logger.info("🔌 Client disconnected from %s", label)
+    finally:
+        hub.unsubscribe(client)
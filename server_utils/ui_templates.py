@@ -1,13 +1,95 @@
-def control_page(ocr_paused):
-    """Generate HTML control page."""
+# Draws /events pushes (OCR text, boxes, confidence, subtitles) on a canvas
+# over the plain /stream?overlay=0 video. Same look as overlay.py.
+OVERLAY_SCRIPT = """
+<script>
+(function () {
+    var canvas = document.getElementById("overlay");
+    var ctx = canvas.getContext("2d");
+    var state = {ocr: null, boxes: [], frameSize: null, subtitle: null, partial: false};
+
+    function label(text, y, color, size) {
+        ctx.font = size + "px sans-serif";
+        var w = ctx.measureText(text).width;
+        var x = (canvas.width - w) / 2;
+        ctx.fillStyle = "rgba(0, 0, 0, 0.55)";
+        ctx.fillRect(x - 12, y - size - 6, w + 24, size + 16);
+        ctx.fillStyle = color;
+        ctx.fillText(text, x, y);
+    }
+
+    function draw() {
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        if (state.frameSize) {
+            var sx = canvas.width / state.frameSize[0], sy = canvas.height / state.frameSize[1];
+            ctx.strokeStyle = "#00ff00";
+            ctx.lineWidth = 2;
+            state.boxes.forEach(function (b) {
+                ctx.strokeRect(b[0] * sx, b[1] * sy, (b[2] - b[0]) * sx, (b[3] - b[1]) * sy);
+            });
+        }
+        if (state.ocr) {
+            if (state.ocr.text) {
+                label(state.ocr.text, 40, "#00ff00", 24);
+            }
+            ctx.font = "14px sans-serif";
+            ctx.fillStyle = "#ffffff";
+            ctx.fillText("Conf: " + Number(state.ocr.confidence || 0).toFixed(2) +
+                         "  (" + state.ocr.total_runtime + "s, " + state.ocr.mode + ")", 10, canvas.height - 10);
+        }
+        if (state.subtitle) {
+            label(state.subtitle, canvas.height - 40, state.partial ? "#bbbbbb" : "#00ff00", 20);
+        }
+    }
+
+    function connect() {
+        var ws = new WebSocket("ws://" + location.hostname + ":" + EVENTS_PORT + "/events");
+        ws.onmessage = function (msg) {
+            var event = JSON.parse(msg.data);
+            if (event.type === "detection") {
+                state.boxes = event.boxes || [];
+                state.frameSize = event.frame_size;
+            } else if (event.type === "ocr") {
+                state.ocr = event;
+                state.boxes = event.boxes || [];
+                state.frameSize = event.frame_size;
+            } else if (event.type === "subtitle") {
+                state.subtitle = event.text;
+                state.partial = event.partial;
+            }
+            draw();
+        };
+        ws.onclose = function () { setTimeout(connect, 2000); };
+    }
+    connect();
+})();
+</script>
+"""
+
+
+def control_page(ocr_paused, events_port=None):
+    """
+    Generate HTML control page.
+    events_port: WebSocket push port; the page then draws OCR text and
+    subtitles itself over a plain stream. None: burned-in overlay stream.
+    """
     button_label = "Resume OCR" if ocr_paused else "Pause OCR"
+
+    if events_port:
+        video = f"""
+        <div style="position:relative; display:inline-block; width:640px; height:480px;">
+            <img src="/stream?overlay=0" width="640" height="480" style="border:1px solid #ccc;" />
+            <canvas id="overlay" width="640" height="480" style="position:absolute; left:0; top:0;"></canvas>
+        </div>
+        {OVERLAY_SCRIPT.replace("EVENTS_PORT", str(int(events_port)))}"""
+    else:
+        video = """<img src="/stream" width="640" height="480" style="border:1px solid #ccc;" />"""
     
     html = f"""
     <html>
     <head><title>OCR Live Runner</title></head>
     <body style="font-family:sans-serif; text-align:center;">
         <h1>OCR Live Runner</h1>
-        <img src="/stream" width="640" height="480" style="border:1px solid #ccc;" />
+        {video}
         <div style="margin-top:20px;">
             <form action="/toggle" method="get" style="display:inline;">
                 <button type="submit">{button_label}</button>
@@ -19,4 +101,4 @@ def control_page(ocr_paused):
     </body>
     </html>
     """
-    return html
\ No newline at end of file
+    return html
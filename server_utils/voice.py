@@ -6,10 +6,14 @@ import threading
 import sounddevice as sd
 from vosk import Model, KaldiRecognizer
 import os
+from shared.log_utils import get_logger
+
+logger = get_logger(__name__)
 
 
 class VoiceRecognizer:
-    def __init__(self, model_path=None, samplerate=16000):
+    def __init__(self, model_path=None, samplerate=16000, on_text=None):
+        """on_text(text, partial): called from the recognizer thread for each line / partial."""
         # Default to resources/vosk_model relative to project root
         if model_path is None:
             base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -17,7 +21,7 @@ class VoiceRecognizer:
                 os.path.join(base_dir, "..", "resources", "vosk_model")
             )
 
-        print("Loading Vosk model from:", model_path)
+        logger.info("Loading Vosk model from: %s", model_path)
         self.model_path = model_path
         self.samplerate = samplerate
         self.model = Model(model_path)
@@ -29,10 +33,11 @@ class VoiceRecognizer:
         self.stream = None
         self._running = False
         self._last_partial = ""
+        self.on_text = on_text
 
     def _audio_callback(self, indata, frames, time, status):
         if status:
-            print(f"[audio] {status}")
+            logger.warning("[audio] %s", status)
         self.audio_q.put(bytes(indata))
 
     def start(self, device=None):
@@ -58,7 +63,7 @@ class VoiceRecognizer:
             self.stream.stop()
             self.stream.close()
             self.stream = None
-        print("🛑 Voice recognition stopped")
+        logger.info("🛑 Voice recognition stopped")
 
     def _recognize_loop(self):
         while self._running:
@@ -73,12 +78,22 @@ class VoiceRecognizer:
                         except queue.Empty:
                             pass
                     self.text_q.put_nowait(text)
+                    self._notify(text, partial=False)
                 self._last_partial = ""
             else:
                 partial = json.loads(self.rec.PartialResult()).get("partial", "").strip()
                 if partial and partial != self._last_partial:
-                    print("..", partial)
+                    logger.debug(".. %s", partial)
                     self._last_partial = partial
+                    self._notify(partial, partial=True)
+
+    def _notify(self, text, partial):
+        if self.on_text is None:
+            return
+        try:
+            self.on_text(text, partial)
+        except Exception as e:
+            logger.warning("⚠️ Voice listener error: %s", e)
 
     def latest_lines(self, n=1):
         items = list(self.text_q.queue)
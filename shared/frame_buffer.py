@@ -23,6 +23,11 @@ class FrameBuffer:
         with self.lock:
             return self.latest_frame.copy() if self.latest_frame is not None else None
 
+    def get_latest_with_id(self):
+        """Get (frame_id, frame) without copying; read-only, push_frame swaps in a new array."""
+        with self.lock:
+            return self.frame_id, self.latest_frame
+
     def set_ocr_result(self, frame_id, ocr_result):
         """Store OCR result for a frame."""
         with self.lock:
@@ -0,0 +1,151 @@
+# shared/log_utils.py
+
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextlib
+from logging.handlers import QueueHandler, QueueListener
+
+# Every project logger lives under this name, so levels can be set per
+# module ("ahg.ocr_modules.pipeline_utils.phase2") without touching the
+# third-party loggers that initialization.py silences.
+ROOT_LOGGER = "ahg"
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.setLevel(logging.WARNING)
+_root.propagate = False
+
+# Until configure_logging() runs, warnings and errors still reach stdout
+_default_handler = logging.StreamHandler(sys.stdout)
+_default_handler.setFormatter(logging.Formatter("%(message)s"))
+_root.addHandler(_default_handler)
+
+_listener = None
+_handler = None
+_lock = threading.Lock()
+
+
+def get_logger(name):
+    """Logger for a module; pass __name__."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Plain "%(message)s" lines (the console look of the old prints), or one
+    JSON object per record with any extra= fields as keys.
+    """
+
+    def __init__(self, json_output=False):
+        super().__init__("%(message)s")
+        self.json_output = json_output
+
+    def format(self, record):
+        if not self.json_output:
+            return super().format(record)
+
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name[len(ROOT_LOGGER) + 1:] or record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        payload.update({k: v for k, v in vars(record).items() if k not in _STANDARD_ATTRS})
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Non-blocking hand-off to the listener thread.
+    Handles:
+      - bounded queue: records are dropped (and counted) instead of blocking a worker
+      - message merge in the caller, formatting/serialization in the listener
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Merge args now (they may change later); leave formatting and
+        # traceback rendering to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(level="WARNING", module_levels=None, json_output=False,
+                      stream=None, queue_size=10000):
+    """
+    Route all project logging through a background writer.
+    level: default for every module ("WARNING" keeps per-frame logs off)
+    module_levels: {"ocr_modules.pipeline_utils.phase2": "INFO", ...}
+    """
+    global _listener, _handler
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+        for h in list(_root.handlers):
+            _root.removeHandler(h)
+
+        target = logging.StreamHandler(stream or sys.stdout)
+        target.setFormatter(StructuredFormatter(json_output))
+        log_queue = queue.Queue(maxsize=queue_size)
+        _handler = DroppingQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, target)
+        _listener.start()
+
+        _root.addHandler(_handler)
+        _root.setLevel(level)
+        for name, module_level in (module_levels or {}).items():
+            get_logger(name).setLevel(module_level)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records():
+    return _handler.dropped if _handler is not None else 0
+
+
+atexit.register(shutdown_logging)
+
+
+@contextlib.contextmanager
+def traced(logger, span, level=logging.DEBUG, **fields):
+    """
+    Time a block and log "⏱️ span: Ns" with fields as structured extras.
+    Costs one level check when the level is disabled.
+    """
+    if not logger.isEnabledFor(level):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = round(time.perf_counter() - start, 3)
+        logger.log(level, "⏱️ %s: %ss", span, seconds, extra={"span": span, "seconds": seconds, **fields})
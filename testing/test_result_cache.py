@@ -0,0 +1,60 @@
+import threading
+import time
+
+import numpy as np
+
+from ocr_modules.pipeline_utils.result_cache import FrameResultCache
+
+
+def test_failed_leader_is_not_shared():
+    cache = FrameResultCache()
+    frame = np.tile(np.arange(64, dtype=np.uint8), (48, 1))
+    calls = []
+    leader_started = threading.Event()
+
+    def failing():
+        calls.append("leader")
+        leader_started.set()
+        time.sleep(0.2)  # let the waiter join this flight
+        return {"final_result": {"text": "", "error": "boom"},
+                "case_triggered": "exception", "total_runtime": 1.0}
+
+    def succeeding():
+        calls.append("waiter")
+        return {"final_result": {"text": "ok"}, "case_triggered": "phase1", "total_runtime": 0.5}
+
+    results = {}
+    leader = threading.Thread(target=lambda: results.update(leader=cache.get_or_compute(frame, "fast", failing)))
+    leader.start()
+    leader_started.wait()
+    results["waiter"] = cache.get_or_compute(frame, "fast", succeeding)
+    leader.join()
+
+    assert results["leader"]["case_triggered"] == "exception"
+    assert results["waiter"]["final_result"]["text"] == "ok"
+    assert "cache_hit" not in results["waiter"]
+    assert calls == ["leader", "waiter"]
+
+    stats = cache.stats()
+    assert stats["coalesced"] == 0
+    assert stats["saved_seconds"] == 0.0
+    assert stats["entries"] == 0  # failures are never stored
+
+
+def test_saved_seconds_excludes_padding():
+    cache = FrameResultCache()
+    frame = np.tile(np.arange(64, dtype=np.uint8), (48, 1))
+    padded = {"final_result": {"text": "ok"}, "case_triggered": "phase1",
+              "total_runtime": 2.0, "inference_runtime": 0.4}
+
+    cache.get_or_compute(frame, "steady", lambda: padded)
+    hit = cache.get_or_compute(frame, "steady", lambda: padded)
+
+    assert hit["cache_hit"] is True
+    assert cache.stats()["saved_seconds"] == 0.4
+
+
+if __name__ == "__main__":
+    test_failed_leader_is_not_shared()
+    test_saved_seconds_excludes_padding()
+    print("result cache: ok")
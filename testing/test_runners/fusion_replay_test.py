@@ -0,0 +1,130 @@
+# testing/test_runners/fusion_replay_test.py
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import os
+import json
+import concurrent.futures
+import cv2
+import numpy as np
+from PIL import Image
+from tabulate import tabulate
+
+from ocr_modules.base_modules.initialization import initialize_models
+from ocr_modules.pipeline_utils.pipeline import run_pipeline, run_tesseract_pass
+from ocr_modules.pipeline_utils.temporal_fusion import TemporalFusion
+
+
+# ------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------
+
+# Pass a video file as argv[1]; otherwise a shaky clip is synthesized
+# from the sample image (small shifts, blur and sensor noise per frame).
+SAMPLE_IMAGE = PROJECT_ROOT / "testing" / "test_images" / "sample_text.png"
+OUTPUT_JSON = PROJECT_ROOT / "testing" / "test_results" / "fusion_replay.json"
+CLIP_FPS = 10.0
+SYNTH_FRAMES = 40
+MAX_FRAMES = 150
+
+
+def synth_clip(path, count, seed=0):
+    rng = np.random.default_rng(seed)
+    base = cv2.imread(str(path))
+    h, w = base.shape[:2]
+    frames = []
+    for _ in range(count):
+        dx, dy = rng.integers(-6, 7, size=2)
+        shift = np.float32([[1, 0, dx], [0, 1, dy]])
+        frame = cv2.warpAffine(base, shift, (w, h), borderMode=cv2.BORDER_REPLICATE)
+        k = int(rng.choice([1, 1, 3, 5]))
+        if k > 1:
+            frame = cv2.GaussianBlur(frame, (k, k), 0)
+        noise = rng.normal(0, 8, frame.shape)
+        frames.append(np.clip(frame + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def load_clip(path):
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while len(frames) < MAX_FRAMES:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def to_pil(frame):
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def main():
+    print("\n=== TEMPORAL FUSION REPLAY TEST ===\n")
+
+    if len(sys.argv) > 1:
+        source = sys.argv[1]
+        frames = load_clip(source)
+    else:
+        source = f"synthetic:{SAMPLE_IMAGE.name}"
+        frames = synth_clip(SAMPLE_IMAGE, SYNTH_FRAMES)
+    if not frames:
+        print(f"❌ No frames loaded from {source}")
+        return
+    print(f"Replaying {len(frames)} frames from {source} at {CLIP_FPS} fps.")
+
+    # Reference: one full cascade on the first frame
+    models = initialize_models()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+    full = run_pipeline(frames[0], to_pil(frames[0]), models, executor, mode="steady", pad_interval=False)
+    executor.shutdown(wait=False)
+    full_text = (full.get("final_result") or {}).get("text", "")
+
+    fusion = TemporalFusion()
+    rows, compute_seconds = [], 0.0
+    first_stable = None
+    for i, frame in enumerate(frames):
+        clip_time = i / CLIP_FPS
+        result = fusion.apply(run_tesseract_pass(to_pil(frame), mode="fast"), now=clip_time)
+        compute_seconds += result.get("total_runtime", 0.0)
+
+        fused_text = result["final_result"].get("text", "")
+        raw_text = (result.get("frame_result") or {}).get("text", "")
+        if fused_text and first_stable is None:
+            first_stable = {"frame": i + 1, "clip_seconds": clip_time, "compute_seconds": round(compute_seconds, 3)}
+        rows.append([i + 1, raw_text[:40], fused_text[:40]])
+
+    print(tabulate(rows, headers=["Frame", "Per-frame (Tesseract)", "Fused"]))
+
+    stats = fusion.stats()
+    summary = {
+        "source": source,
+        "frames": len(frames),
+        "clip_fps": CLIP_FPS,
+        "first_stable": first_stable,
+        "fused_text": fusion.current()["text"] if fusion.current() else "",
+        "fusion": stats,
+        "tesseract_pass_avg": round(compute_seconds / len(frames), 3),
+        "full_pipeline_runtime": full.get("total_runtime"),
+        "full_pipeline_text": full_text,
+    }
+
+    print("\n📈 Convergence")
+    print(f"   First stable reading: {first_stable}")
+    print(f"   Fused text: {summary['fused_text']!r}")
+    print(f"   Full pipeline (1 frame): {full_text!r} in {summary['full_pipeline_runtime']}s")
+    print(f"   Tesseract pass avg: {summary['tesseract_pass_avg']}s/frame")
+
+    os.makedirs(OUTPUT_JSON.parent, exist_ok=True)
+    with open(OUTPUT_JSON, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\n💾 Results saved to: {OUTPUT_JSON}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# testing/test_runners/lexicon_benchmark_test.py
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import os
+import json
+import time
+import subprocess
+import psutil
+from tabulate import tabulate
+
+
+# ------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------
+
+OUTPUT_JSON = PROJECT_ROOT / "testing" / "test_results" / "lexicon_benchmark.json"
+CORPUS_JSON = PROJECT_ROOT / "resources" / "corpus_freqs.json"
+RUNS = 3
+SAMPLE_TEXTS = ["the quick brown fox", "EXIT ONLY THIS WAY", "HELL0 W0RLD", "of the"] * 250
+
+
+def legacy_load():
+    """The previous corpus_score import + initialize_models JSON load."""
+    with open(CORPUS_JSON, "r", encoding="utf-8") as f:
+        raw_freqs = json.load(f)
+    freqs = {
+        word.lower(): float(freq) if isinstance(freq, (int, float)) else 0.0
+        for word, freq in raw_freqs.items()
+    }
+    sorted_words = sorted(freqs.items(), key=lambda x: x[1], reverse=True)
+    rank = {word: round(1 - (i / len(sorted_words)), 4) for i, (word, _) in enumerate(sorted_words)}
+    with open(CORPUS_JSON, "r") as f:
+        corpus_freqs = json.load(f)  # second copy held in models["corpus_freqs"]
+    return rank, corpus_freqs
+
+
+def child(variant):
+    """Runs in a fresh interpreter; prints one JSON line of measurements."""
+    import numpy  # shared dependency; keep it out of the measured delta
+    proc = psutil.Process()
+    rss_before = proc.memory_info().rss
+
+    start = time.perf_counter()
+    if variant == "json":
+        rank, corpus_freqs = legacy_load()
+        lookup = rank.get
+    else:
+        from ocr_modules.base_modules.corpus_score import LEXICON
+        lookup = LEXICON.get
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in SAMPLE_TEXTS:
+        for word in text.lower().split():
+            lookup(word)
+    lookup_seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        "load_seconds": round(load_seconds, 4),
+        "rss_mb": round((proc.memory_info().rss - rss_before) / 2**20, 1),
+        "lookup_us": round(lookup_seconds / (len(SAMPLE_TEXTS) * 3.5) * 1e6, 2),
+    }))
+
+
+def measure(variant):
+    runs = []
+    for _ in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", variant],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    return {
+        key: round(sum(r[key] for r in runs) / len(runs), 4)
+        for key in runs[0]
+    }
+
+
+def main():
+    print("\n=== LEXICON BENCHMARK (JSON dicts vs memory-mapped lexicon) ===\n")
+
+    # Make sure the binary exists so the first timed run does not include the build
+    from ocr_modules.base_modules.lexicon import load_lexicon
+    load_lexicon().close()
+
+    results = {variant: measure(variant) for variant in ("json", "lexicon")}
+
+    rows = [
+        [variant, r["load_seconds"], r["rss_mb"], r["lookup_us"]]
+        for variant, r in results.items()
+    ]
+    print(tabulate(rows, headers=["Variant", "Load (s)", "RSS delta (MB)", "Lookup (µs)"]))
+
+    os.makedirs(OUTPUT_JSON.parent, exist_ok=True)
+    with open(OUTPUT_JSON, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to: {OUTPUT_JSON}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        child(sys.argv[2])
+    else:
+        main()
@@ -17,6 +17,7 @@ from ocr_modules.pipeline_utils.pipeline import run_pipeline, print_pipeline_log
 from ocr_modules.base_modules.initialization import initialize_models
 from shared.pipeline_summary import run_summary
 from shared.loading_bar import real_loading_bar, start_spinner
+from shared.log_utils import configure_logging
 import threading
 import time
 
@@ -149,14 +150,15 @@ def main():
             print(f"\n📸 Processing: {fname}")
 
             try:
-                # Load images (use safe reads for Windows paths)
+                # Load image once (safe read for Windows paths), derive PIL from it
                 data = np.fromfile(img_path, dtype=np.uint8)
                 cv_img = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
-                pil_img = Image.open(open(img_path, "rb"))
 
                 if cv_img is None:
                     raise RuntimeError("cv2.imdecode returned None (failed to read image)")
 
+                pil_img = Image.fromarray(cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB))
+
                 # Run pipeline
                 pipeline_result = run_pipeline(
                     cv_img, pil_img, models, executor, mode="steady"
@@ -181,7 +183,8 @@ def main():
                 "winner": pipeline_result.get("case_triggered"),
                 "confidence": final.get("confidence", 0.0),
                 "reliable": final.get("reliable", False),
-                "runtime": pipeline_result.get("total_runtime", 0.0)
+                "runtime": pipeline_result.get("total_runtime", 0.0),
+                "engine_seconds_saved": pipeline_result.get("engine_seconds_saved", 0.0)
             }
 
     # --------------------------------------------------------
@@ -193,6 +196,9 @@ def main():
 
     print(f"\n💾 Results saved to: {OUTPUT_JSON}")
 
+    saved = sum(r.get("engine_seconds_saved", 0.0) for cat in results.values() for r in cat.values())
+    print(f"♻️ Inference skipped by re-filtering raw engine output: {saved:.2f}s total")
+
     # --------------------------------------------------------
     # 6. Run master summary
     # --------------------------------------------------------
@@ -206,4 +212,5 @@ def main():
 
 
 if __name__ == "__main__":
+    configure_logging("INFO")  # per-image phase logs + pipeline summaries
     main()
@@ -0,0 +1,72 @@
+# testing/test_runners/process_scaling_test.py
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import os
+import json
+import cv2
+import numpy as np
+from tabulate import tabulate
+
+from ocr_modules.base_modules.initialization import initialize_models
+from ocr_modules.pipeline_utils.process_pool import measure_scaling
+from shared.log_utils import configure_logging
+
+
+# ------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------
+
+BENCHMARK_DIR = PROJECT_ROOT / "testing" / "test_images" / "benchmark_images"
+OUTPUT_JSON = PROJECT_ROOT / "testing" / "test_results" / "process_scaling.json"
+MODE = "fast"  # no min_interval padding, so throughput is not sleep-bound
+ROUNDS = 2
+
+
+def load_frames():
+    frames = []
+    for path in sorted(BENCHMARK_DIR.glob("*_images/*.jpg")):
+        data = np.fromfile(str(path), dtype=np.uint8)
+        frame = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+        if frame is not None:
+            frames.append(frame)
+    return frames
+
+
+def main():
+    print("\n=== OCR PROCESS SCALING TEST ===\n")
+
+    frames = load_frames()
+    if not frames:
+        print(f"❌ No benchmark images found in {BENCHMARK_DIR}")
+        return
+    print(f"Loaded {len(frames)} frames ({ROUNDS} rounds per process count).")
+
+    cpu = os.cpu_count() or 1
+    counts = sorted({1, 2, max(1, cpu // 2), max(1, cpu - 1)})
+
+    print("🔧 Loading models once in the parent process...")
+    models = initialize_models()
+
+    curve = measure_scaling(frames, counts, mode=MODE, rounds=ROUNDS, models=models)
+
+    base = curve[0]["fps"] or 1.0
+    rows = [
+        [c["processes"], c["frames"], c["seconds"], c["fps"], round(c["fps"] / base, 2)]
+        for c in curve
+    ]
+    print("\n📈 Scaling curve")
+    print(tabulate(rows, headers=["Processes", "Frames", "Seconds", "Frames/s", "Speedup"]))
+
+    os.makedirs(OUTPUT_JSON.parent, exist_ok=True)
+    with open(OUTPUT_JSON, "w") as f:
+        json.dump({"mode": MODE, "cpu_count": cpu, "curve": curve}, f, indent=2)
+    print(f"\n💾 Results saved to: {OUTPUT_JSON}")
+
+
+if __name__ == "__main__":
+    configure_logging(module_levels={"ocr_modules.pipeline_utils.process_pool": "INFO"})
+    main()
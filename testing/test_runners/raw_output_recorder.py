@@ -0,0 +1,120 @@
+# testing/test_runners/raw_output_recorder.py
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import os
+import time
+import traceback
+import numpy as np
+import cv2
+from PIL import Image
+
+from ocr_modules.base_modules.initialization import initialize_models
+from ocr_modules.base_modules.ocr_engines import run_east, run_tesseract_raw, run_easyocr_raw
+from ocr_modules.base_modules.preprocess import PreprocessedFrame
+from shared.json_utils import save_json
+from testing.test_runners.ocr_image_test import collect_images, CATEGORY_MAP
+
+
+# ------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------
+
+# Raw per-engine outputs + timings for every benchmark image. Replay them
+# at any threshold with threshold_whatif_test.py (no inference).
+OUTPUT_JSON = PROJECT_ROOT / "testing" / "test_results" / "raw_outputs.json"
+MAX_CROPS = 5  # run_phase2_conditional default
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, round(time.perf_counter() - start, 3)
+
+
+def tokens_to_json(raw):
+    """EasyOCR [(box, text, conf)] tuples → JSON-friendly lists."""
+    return [
+        [[[float(v) for v in pt] for pt in box], text, float(conf)]
+        for box, text, conf in raw
+    ]
+
+
+def record_image(cv_img, pil_img, models):
+    reader = models["easyocr_en"]
+    frame = PreprocessedFrame(cv_img)  # shared by the EasyOCR passes, as in phase2
+
+    tess_raw, tess_seconds = timed(run_tesseract_raw, pil_img)
+    east, east_seconds = timed(run_east, cv_img, models)
+
+    # Guided pass only exists in the pipeline when EAST found a few regions.
+    # It runs first there too, so it pays for the shared preprocessing.
+    guided = None
+    if 0 < east.get("region_count", 0) < MAX_CROPS:
+        start = time.perf_counter()
+        crops = [
+            tokens_to_json(run_easyocr_raw(crop, reader, preprocessed=True))
+            for crop in frame.crops(east)
+        ]
+        guided = {"crops": crops, "seconds": round(time.perf_counter() - start, 3)}
+
+    full_raw, full_seconds = timed(run_easyocr_raw, frame, reader)
+
+    return {
+        "tesseract": {"raw": tess_raw, "seconds": tess_seconds},
+        "east": {
+            "regions": [{"box": r["box"], "confidence": r.get("confidence")} for r in east.get("regions", [])],
+            "region_count": east.get("region_count", 0),
+            "seconds": east_seconds,
+        },
+        "guided": guided,
+        "full": {"raw": tokens_to_json(full_raw), "seconds": full_seconds},
+    }
+
+
+def main():
+    print("\n=== RAW OUTPUT RECORDER ===\n")
+
+    selection = CATEGORY_MAP.get(sys.argv[1], sys.argv[1]) if len(sys.argv) > 1 else "all"
+    image_dict = collect_images(selection)
+    total_images = sum(len(v) for v in image_dict.values())
+    if total_images == 0:
+        print("❌ No images found for this selection.")
+        return
+
+    print("🔧 Initializing OCR models...")
+    models = initialize_models()
+    print(f"✅ Models ready. Recording {total_images} images ({selection}).\n")
+
+    records = []
+    for category, paths in image_dict.items():
+        for img_path in paths:
+            fname = os.path.basename(img_path)
+            try:
+                data = np.fromfile(img_path, dtype=np.uint8)
+                cv_img = cv2.imdecode(data, cv2.IMREAD_COLOR) if data.size else None
+                if cv_img is None:
+                    raise RuntimeError("cv2.imdecode returned None (failed to read image)")
+                pil_img = Image.fromarray(cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB))
+
+                record = record_image(cv_img, pil_img, models)
+            except Exception:
+                print(f"❌ Failed to record {fname}:")
+                traceback.print_exc()
+                continue
+
+            record.update({"category": category, "image": fname})
+            records.append(record)
+            print(f"📸 {fname}: tess {record['tesseract']['seconds']}s, "
+                  f"east {record['east']['seconds']}s ({record['east']['region_count']} regions), "
+                  f"easyocr {record['full']['seconds']}s")
+
+    save_json({"max_crops": MAX_CROPS, "records": records}, str(OUTPUT_JSON))
+    print(f"\n💾 {len(records)} recordings saved to: {OUTPUT_JSON}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# testing/test_runners/reliability_fit.py
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import os
+import re
+import json
+import argparse
+from difflib import SequenceMatcher
+import numpy as np
+from tabulate import tabulate
+
+from ocr_modules.base_modules.corpus_score import corpus_score
+from ocr_modules.base_modules.reliability import (
+    ReliabilityModel, RELIABILITY_PARAMS_PATH, DECISION_THRESHOLDS, fit_logistic, precision_curve
+)
+from ocr_modules.pipeline_utils.threshold_replay import ThresholdReplay
+
+
+# ------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------
+
+# raw_output_recorder.py output + ground truth {image file name: expected text}.
+# Dummy images with no label are expected to read nothing.
+INPUT_JSON = PROJECT_ROOT / "testing" / "test_results" / "raw_outputs.json"
+LABELS_JSON = PROJECT_ROOT / "testing" / "test_images" / "benchmark_images" / "labels.json"
+# Fallback without a raw recording: the parsed per-engine readings of
+# ocr_race_test.py plus EAST region counts of the same benchmark run
+READINGS_JSON = PROJECT_ROOT / "testing" / "test_results" / "ocr_race_outputs.json"
+EAST_JSON = PROJECT_ROOT / "testing" / "test_results" / "east_outputs.json"
+READING_ENGINES = {"tesseract": "tesseract", "easyocr": "easyocr-full"}  # full-image passes
+MATCH_RATIO = 0.8    # a reading is "correct" at this similarity to the label
+MIN_SAMPLES = 20     # engines with fewer rows use the pooled "default" model
+TARGETS = [0.8, 0.9, 0.95]
+
+
+def normalize(text):
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9 ]", " ", text.lower())).strip()
+
+
+def is_correct(text, label):
+    text, label = normalize(text), normalize(label)
+    if not label:
+        return not text
+    return SequenceMatcher(None, text, label).ratio() >= MATCH_RATIO
+
+
+def label_for(image, category, labels):
+    # Dummy images with no label are expected to read nothing
+    return labels.get(image, "" if category.startswith("dummy") else None)
+
+
+def rows_from_recording(path, labels):
+    """{engine: [(features, correct)]} from raw_output_recorder.py output, replayed."""
+    with open(path, "r", encoding="utf-8") as f:
+        recorded = json.load(f)
+    records = recorded["records"]
+    replay = ThresholdReplay(records, max_crops=recorded.get("max_crops", 5))
+
+    # One row per (image, engine) reading with text; empty readings are never accepted
+    rows, images, skipped = {}, 0, 0
+    for i, record in enumerate(records):
+        label = label_for(record["image"], record.get("category", ""), labels)
+        if label is None:
+            skipped += 1
+            continue
+        images += 1
+        region_count = record["east"].get("region_count", 0)
+        for engine, result in replay.candidates(i):
+            if not result.get("text"):
+                continue
+            features = ReliabilityModel.features(result, region_count)
+            rows.setdefault(engine, []).append((features, is_correct(result["text"], label)))
+    return rows, images, skipped
+
+
+def rows_from_readings(path, east_path, labels):
+    """
+    Same rows from recorded parsed readings (no raw tokens, so no replay):
+    only the full-image passes, corpus_score recomputed with the current scorer.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        readings = json.load(f)
+    east = {}
+    if os.path.exists(east_path):
+        with open(east_path, "r", encoding="utf-8") as f:
+            east = {name: r for images in json.load(f).values() for name, r in images.items()}
+
+    rows, images, skipped = {}, 0, 0
+    for category, results in readings.items():
+        for name, reading in results.items():
+            label = label_for(name, category, labels)
+            if label is None:
+                skipped += 1
+                continue
+            images += 1
+            region_count = east.get(name, {}).get("region_count", 0)
+            for source, engine in READING_ENGINES.items():
+                output = reading.get("all_outputs", {}).get(source) or {}
+                if output.get("skipped") or not output.get("text"):
+                    continue
+                result = {**output, "corpus_score": corpus_score(output["text"])}
+                features = ReliabilityModel.features(result, region_count)
+                rows.setdefault(engine, []).append((features, is_correct(result["text"], label)))
+    return rows, images, skipped
+
+
+def fit_engine(rows):
+    X = np.array([x for x, _ in rows])
+    y = np.array([label for _, label in rows], dtype=np.float64)
+    weights, bias = fit_logistic(X, y)
+    probs = 1.0 / (1.0 + np.exp(-(X @ np.array(weights) + bias)))
+    return {
+        "weights": [round(w, 6) for w in weights],
+        "bias": round(bias, 6),
+        "samples": len(rows),
+        "positives": int(y.sum()),
+        "precision_curve": precision_curve(probs, y),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the calibrated reliability model from labeled recordings.")
+    parser.add_argument("--input", default=str(INPUT_JSON), help="raw_output_recorder.py output")
+    parser.add_argument("--readings", default=str(READINGS_JSON),
+                        help="ocr_race_test.py output, used when --input does not exist")
+    parser.add_argument("--east", default=str(EAST_JSON), help="EAST outputs for --readings")
+    parser.add_argument("--labels", default=str(LABELS_JSON), help="JSON {image: expected text}")
+    parser.add_argument("--out", default=str(RELIABILITY_PARAMS_PATH), help="parameter file to write")
+    args = parser.parse_args()
+
+    print("\n=== RELIABILITY MODEL FIT ===\n")
+
+    source = args.input if os.path.exists(args.input) else args.readings
+    for path in (source, args.labels):
+        if not os.path.exists(path):
+            print(f"❌ Missing {path}")
+            return
+    with open(args.labels, "r", encoding="utf-8") as f:
+        labels = json.load(f)
+
+    if source == args.input:
+        rows, images, skipped = rows_from_recording(args.input, labels)
+    else:
+        print(f"⚠️ No raw recording at {args.input}; fitting on recorded readings: {source}\n")
+        rows, images, skipped = rows_from_readings(source, args.east, labels)
+
+    pooled = [row for engine_rows in rows.values() for row in engine_rows]
+    if not pooled or len({label for _, label in pooled}) < 2:
+        print("❌ Need both correct and incorrect readings to fit.")
+        return
+
+    engines = {"default": fit_engine(pooled)}
+    for engine, engine_rows in rows.items():
+        if len(engine_rows) >= MIN_SAMPLES and len({label for _, label in engine_rows}) == 2:
+            engines[engine] = fit_engine(engine_rows)
+
+    params = {
+        "features": list(ReliabilityModel.FEATURES),
+        "match_ratio": MATCH_RATIO,
+        "source": os.path.relpath(source, PROJECT_ROOT),
+        "images": images,
+        "engines": engines,
+    }
+    model = ReliabilityModel(params)
+
+    table = [
+        [engine, p["samples"], p["positives"]] + [model.cutoff(engine, t) for t in TARGETS]
+        for engine, p in engines.items()
+    ]
+    print(tabulate(table, headers=["Engine", "Rows", "Correct"] + [f"cutoff@{t}" for t in TARGETS]))
+    if skipped:
+        print(f"\n⚠️ {skipped} recorded images had no label and were skipped.")
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(params, f, indent=2)
+    print(f"\n💾 Parameters saved to: {args.out}")
+    print(f"   Stop/continue decisions now target precision {DECISION_THRESHOLDS['target_precision']} "
+          f"(reliability.DECISION_THRESHOLDS). Check the trade-off with threshold_whatif_test.py "
+          f"--grid target_precision=0.8,0.9,0.95")
+
+
+if __name__ == "__main__":
+    main()
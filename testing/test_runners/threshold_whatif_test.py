@@ -0,0 +1,111 @@
+# testing/test_runners/threshold_whatif_test.py
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import os
+import json
+import time
+import argparse
+from tabulate import tabulate
+
+from ocr_modules.base_modules.reliability import DECISION_THRESHOLDS, get_reliability_model
+from ocr_modules.pipeline_utils.modes import get_mode_budget
+from ocr_modules.pipeline_utils.threshold_replay import ThresholdReplay
+
+
+# ------------------------------------------------------------
+# CONFIGURATION
+# ------------------------------------------------------------
+
+INPUT_JSON = PROJECT_ROOT / "testing" / "test_results" / "raw_outputs.json"
+OUTPUT_JSON = PROJECT_ROOT / "testing" / "test_results" / "threshold_whatif.json"
+
+# Swept when not overridden on the command line (--grid key=v1,v2,...)
+DEFAULT_GRID = {
+    "phase1_conf": [0.5, 0.6, 0.7],
+    "min_conf": [0.5, 0.6, 0.7],
+    "min_corpus": [0.4, 0.5, 0.6],
+    "early_exit_conf": [0.7, 0.8, 0.9],
+    "final_conf": [0.4, 0.5, 0.6],
+}
+
+# With a fitted ReliabilityModel the confidence cut-offs above no longer
+# decide anything; sweep the precision target and token filters instead
+MODEL_GRID = {
+    "target_precision": [0.7, 0.8, 0.85, 0.9, 0.95, 0.99],
+    "token_conf": [0.5, 0.6, 0.7],
+    "loose_token_conf": [0.2, 0.3],
+}
+
+
+def parse_grid(items):
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if key not in DECISION_THRESHOLDS:
+            raise SystemExit(f"❌ Unknown threshold: {key} (known: {', '.join(DECISION_THRESHOLDS)})")
+        grid[key] = [float(v) for v in values.split(",") if v]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if sweep of pipeline thresholds over recorded raw outputs.")
+    parser.add_argument("--input", default=str(INPUT_JSON), help="raw_output_recorder.py output")
+    parser.add_argument("--mode", default="steady", help="mode whose budget is replayed")
+    parser.add_argument("--grid", nargs="*", default=None, help="threshold=v1,v2,... (replaces the default grid)")
+    parser.add_argument("--top", type=int, default=15, help="rows to print")
+    args = parser.parse_args()
+
+    print("\n=== THRESHOLD WHAT-IF ANALYZER ===\n")
+
+    if not os.path.exists(args.input):
+        print(f"❌ No recordings at {args.input}. Run raw_output_recorder.py first.")
+        return
+    with open(args.input, "r", encoding="utf-8") as f:
+        recorded = json.load(f)
+    records = recorded["records"]
+
+    if args.grid:
+        grid = parse_grid(args.grid)
+    else:
+        grid = MODEL_GRID if get_reliability_model() is not None else DEFAULT_GRID
+    replay = ThresholdReplay(records, budget=get_mode_budget(args.mode),
+                             max_crops=recorded.get("max_crops", 5))
+
+    baseline = replay.evaluate()
+    start = time.perf_counter()
+    results = replay.sweep(grid)
+    sweep_seconds = time.perf_counter() - start
+
+    print(f"Replayed {len(records)} images × {len(results)} settings in {sweep_seconds:.2f}s "
+          f"({sweep_seconds / max(len(results), 1) * 1000:.1f} ms/setting, mode={args.mode}).\n")
+
+    # Best acceptance first, then lowest latency
+    ranked = sorted(results, key=lambda r: (-r["acceptance_rate"], r["mean_latency"]))
+    keys = list(grid)
+    rows = [
+        [r["thresholds"][k] for k in keys] + [
+            r["acceptance_rate"], r["mean_latency"], r["p90_latency"],
+            ", ".join(f"{case}:{count}" for case, count in sorted(r["cases"].items())),
+        ]
+        for r in [baseline] + ranked[:args.top]
+    ]
+    print(tabulate(rows, headers=keys + ["Accept", "Mean (s)", "P90 (s)", "Cases"]))
+    print("   (first row = current DECISION_THRESHOLDS)")
+
+    os.makedirs(OUTPUT_JSON.parent, exist_ok=True)
+    with open(OUTPUT_JSON, "w") as f:
+        json.dump({
+            "mode": args.mode,
+            "images": [r["image"] for r in records],
+            "baseline": baseline,
+            "results": ranked,
+        }, f, indent=2)
+    print(f"\n💾 Results saved to: {OUTPUT_JSON}")
+
+
+if __name__ == "__main__":
+    main()